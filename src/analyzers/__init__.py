@@ -2,8 +2,12 @@
 
 from src.analyzers.base import BaseAnalyzer
 from src.analyzers.ai_analyzer import AIAnalyzer
+from src.analyzers.engine import ConcurrentAnalysisEngine
+from src.analyzers.summarizer import MapReduceSummarizer
 
 __all__ = [
     'BaseAnalyzer',
     'AIAnalyzer',
+    'ConcurrentAnalysisEngine',
+    'MapReduceSummarizer',
 ]
@@ -3,14 +3,77 @@ AI 分析器实现
 """
 import os
 import json
-from typing import List, Dict, Optional
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from loguru import logger
 from openai import OpenAI
 from anthropic import Anthropic
 
 from src.analyzers.base import BaseAnalyzer
+from src.analyzers.batch import BatchClient, create_batch_client
+from src.analyzers.cache import LLMResultCache
+from src.analyzers.json_stream import JsonArrayItemStream
+from src.analyzers.prompt_cache import PromptCacheStats, cache_usage, get_prompt_cache_stats
+from src.analyzers.prompts import (
+    DEFAULT_TOKEN_BUDGET,
+    PROMPT_VERSION,
+    Prompt,
+    anthropic_system,
+    openai_messages,
+    single_analysis_prompt,
+    packed_analysis_prompt,
+    batch_summary_prompt,
+    chunk_summary_prompt,
+    merge_summary_prompt,
+    translation_prompt,
+)
+from src.analyzers.latency import LatencyHistogram, get_latency_histogram
+from src.analyzers.rate_limit import (
+    get_rate_limiter,
+    call_with_retry,
+    error_status,
+    retry_after_seconds,
+)
+from src.analyzers.tokens import estimate_tokens
+from src.analyzers.usage import (
+    MODE_STREAM,
+    MODE_SYNC,
+    PriceTable,
+    UsageLedger,
+    completion_tokens,
+    usage_scope,
+)
 from src.core.exceptions import AnalysisException
 
+# 对冲请求尚未发出（排队或等待限流）时检查其是否已发出的间隔（秒）
+_HEDGE_START_POLL = 0.05
+
+
+class AIEndpoint:
+    """单个 AI 接口（提供商 + 模型），持有客户端、限流器、延迟和提示词缓存统计"""
+    
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        client,
+        rate_limiter,
+        latency: LatencyHistogram,
+        prompt_cache: PromptCacheStats
+    ):
+        self.provider = provider
+        self.model = model
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.latency = latency
+        self.prompt_cache = prompt_cache
+    
+    @property
+    def name(self) -> str:
+        return f"{self.provider}/{self.model}"
+
 
 class AIAnalyzer(BaseAnalyzer):
     """AI 分析器"""
@@ -34,34 +97,124 @@ class AIAnalyzer(BaseAnalyzer):
         if not self.ai_config.api_key:
             logger.warning("未配置 AI API Key，AI 分析功能将不可用")
         
-        # 初始化客户端
-        self._init_client()
-    
-    def _init_client(self):
-        """初始化 AI 客户端"""
-        api_key = self.ai_config.api_key
-        base_url = self.ai_config.base_url
+        # 初始化接口：主接口 + 按顺序故障转移的备用接口
+        self.endpoints = [self._create_endpoint(
+            self.provider,
+            self.model,
+            self.ai_config.api_key,
+            self.ai_config.base_url,
+            self.ai_config.requests_per_minute,
+            self.ai_config.tokens_per_minute
+        )]
+        for fallback in self.ai_config.fallbacks:
+            self.endpoints.append(self._create_endpoint(
+                fallback.provider,
+                fallback.model,
+                fallback.api_key,
+                fallback.base_url,
+                fallback.requests_per_minute,
+                fallback.tokens_per_minute
+            ))
+        self.client = self.endpoints[0].client
+        self.rate_limiter = self.endpoints[0].rate_limiter
         
-        if self.provider == 'openai':
-            self.client = OpenAI(
+        # 对冲请求在线程池中执行，落败的请求在后台完成后丢弃。
+        # 每个并发调用最多同时占用每个接口各一个线程，按并发数 × 接口数确定线程数
+        analysis_config = getattr(config, 'analysis', None)
+        self._hedge_executor = None
+        if self.ai_config.hedge_enabled:
+            max_concurrency = analysis_config.max_concurrency if analysis_config else 4
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=max(1, max_concurrency) * len(self.endpoints),
+                thread_name_prefix='ai-hedge'
+            )
+        
+        # 初始化结果缓存
+        cache_config = getattr(config, 'llm_cache', None)
+        self.cache = None
+        if cache_config and cache_config.enabled:
+            self.cache = LLMResultCache(
+                path=cache_config.path,
+                ttl_seconds=cache_config.ttl_seconds,
+                max_entries=cache_config.max_entries,
+                max_bytes=cache_config.max_mb * 1024 * 1024
+            )
+        
+        # 每次调用的用量先记录在内存中，由服务写入数据库
+        usage_config = getattr(config, 'usage', None)
+        self.usage = UsageLedger(
+            PriceTable(
+                usage_config.prices if usage_config else None,
+                usage_config.batch_discount if usage_config else 0.5
+            ),
+            enabled=usage_config.enabled if usage_config else True
+        )
+        self.prompt_token_budget = (
+            analysis_config.prompt_token_budget if analysis_config else DEFAULT_TOKEN_BUDGET
+        )
+    
+    def close(self):
+        """关闭 AI 客户端的连接池、对冲线程池和结果缓存"""
+        for endpoint in self.endpoints:
+            try:
+                endpoint.client.close()
+            except Exception as e:
+                logger.warning(f"关闭 AI 客户端失败 ({endpoint.name}): {e}")
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self.cache is not None:
+            self.cache.close()
+    
+    def _create_endpoint(
+        self,
+        provider: str,
+        model: str,
+        api_key: str,
+        base_url: str,
+        requests_per_minute: int,
+        tokens_per_minute: int
+    ) -> AIEndpoint:
+        """创建 AI 接口（同一提供商和模型在进程内共用限流器和统计）"""
+        return AIEndpoint(
+            provider=provider,
+            model=model,
+            client=self._create_client(provider, api_key, base_url),
+            rate_limiter=get_rate_limiter(
+                provider,
+                model,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute
+            ),
+            latency=get_latency_histogram(provider, model),
+            prompt_cache=get_prompt_cache_stats(provider, model)
+        )
+    
+    def _create_client(self, provider: str, api_key: str, base_url: str):
+        """创建 AI 客户端"""
+        # 重试由 _request_endpoint 统一处理（配合限流器），关闭 SDK 内置重试
+        if provider == 'openai':
+            return OpenAI(
                 api_key=api_key,
                 base_url=base_url if base_url else None,
-                timeout=self.timeout
+                timeout=self.timeout,
+                max_retries=0
             )
-        elif self.provider == 'anthropic':
-            self.client = Anthropic(api_key=api_key, timeout=self.timeout)
-        elif self.provider == 'deepseek':
-            self.client = OpenAI(
+        elif provider == 'anthropic':
+            return Anthropic(api_key=api_key, timeout=self.timeout, max_retries=0)
+        elif provider == 'deepseek':
+            return OpenAI(
                 api_key=api_key,
                 base_url=base_url or 'https://api.deepseek.com/v1',
-                timeout=self.timeout
+                timeout=self.timeout,
+                max_retries=0
             )
         else:
             # 自定义 OpenAI 兼容接口
-            self.client = OpenAI(
+            return OpenAI(
                 api_key=api_key,
                 base_url=base_url,
-                timeout=self.timeout
+                timeout=self.timeout,
+                max_retries=0
             )
     
     def analyze_single(self, article: Dict) -> Optional[Dict]:
@@ -75,47 +228,121 @@ class AIAnalyzer(BaseAnalyzer):
             分析结果字典，包含 analysis_content, sentiment, sentiment_score, key_points
         """
         try:
-            title = article.get('title', '')
-            summary = article.get('summary', '')
-            content = article.get('content', '')
-            
-            # 构建分析文本
-            text_to_analyze = f"标题: {title}\n"
-            if summary:
-                text_to_analyze += f"摘要: {summary}\n"
-            if content:
-                text_to_analyze += f"内容: {content[:1000]}\n"  # 限制内容长度
-            
-            # 构建提示词
-            prompt = f"""请对以下新闻进行分析，并提供：
-1. 简要分析（200字以内）
-2. 情感倾向（positive/negative/neutral）
-3. 关键要点（3-5个要点，JSON数组格式）
-4. 重要性评分（1-10分）
-
-新闻内容：
-{text_to_analyze}
-
-请以 JSON 格式返回，格式如下：
-{{
-    "analysis": "分析内容",
-    "sentiment": "positive/negative/neutral",
-    "sentiment_score": 0.0-1.0,
-    "key_points": ["要点1", "要点2", "要点3"],
-    "importance_score": 1-10
-}}
-"""
-            
             # 调用 AI API
-            result_text = self._call_api(prompt)
+            with usage_scope(operation='analyze_single', source=article.get('source')):
+                result_text = self._call_api(
+                    self.build_single_prompt(article),
+                    validate=lambda text: self._load_result(text) is not None
+                )
             
-            # 解析 JSON 响应
+            # 解析 JSON 响应（格式错误时抛出异常，文章留待重试）
             return self._parse_response(result_text)
         
         except Exception as e:
             logger.error(f"AI 分析失败: {e}")
             raise AnalysisException(f"AI 分析失败: {e}") from e
     
+    def build_single_prompt(self, article: Dict) -> Prompt:
+        """构建单篇文章分析提示词（同步分析和批处理任务共用）"""
+        return single_analysis_prompt(article, self.prompt_token_budget)
+    
+    def batch_client(self) -> BatchClient:
+        """创建主接口的批处理客户端"""
+        endpoint = self.endpoints[0]
+        return create_batch_client(
+            endpoint.provider,
+            endpoint.client,
+            endpoint.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            prompt_cache=self.ai_config.prompt_cache
+        )
+    
+    def parse_batch_result(self, result_text: Optional[str]) -> Optional[Dict]:
+        """解析批处理任务中单篇文章的响应，响应不可用或格式错误时返回 None"""
+        if not self._is_usable_response(result_text):
+            return None
+        try:
+            return self._parse_response(result_text)
+        except AnalysisException as e:
+            logger.warning(f"批处理结果格式错误: {e}")
+            return None
+    
+    def analyze_packed(
+        self,
+        articles: List[Dict],
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> Dict[int, Dict]:
+        """
+        单次请求分析多篇文章（打包模式）
+        
+        每篇文章以其 id 标注，要求模型返回按 id 对应的 JSON 数组；
+        逐项校验后拆分回各篇文章，缺失或格式错误的条目单独重试。
+        开启流式响应时，数组中的每个对象一闭合就交给 on_result，
+        响应中途断开时已收到的结果仍然有效，只重试缺失的文章。
+        
+        Args:
+            articles: 文章数据字典列表，每项需包含唯一的 id
+            on_result: 每得到一篇文章的结果时调用 on_result(文章 id, 结果)，每篇最多一次
+            
+        Returns:
+            {文章 id: 分析结果字典}，单独重试仍失败的文章不在结果中
+        """
+        if not articles:
+            return {}
+        
+        by_id = {article['id']: article for article in articles}
+        id_lookup = {str(article_id): article_id for article_id in by_id}
+        results: Dict[int, Dict] = {}
+        
+        def accept(article_id: int, result: Dict):
+            results[article_id] = result
+            if on_result is not None:
+                on_result(article_id, result)
+        
+        prompt = packed_analysis_prompt(articles, self.prompt_token_budget)
+        # 只缓存每篇文章都有有效结果的响应
+        validate = lambda text: len(self._parse_packed_response(text, set(by_id))) == len(by_id)
+        # 同一来源的打包请求记录来源，混合来源时留空
+        sources = {article.get('source') for article in articles}
+        scope = usage_scope(
+            operation='analyze_packed',
+            source=sources.pop() if len(sources) == 1 else None
+        )
+        try:
+            with scope:
+                if self.ai_config.stream:
+                    parser = JsonArrayItemStream()
+                    for chunk in self._call_api_stream(prompt, validate=validate):
+                        for item in parser.feed(chunk):
+                            article_id = self._packed_item_id(item, id_lookup)
+                            if article_id is not None and article_id not in results:
+                                accept(article_id, self._build_result(item))
+                else:
+                    result_text = self._call_api(prompt, validate=validate)
+                    for article_id, result in self._parse_packed_response(result_text, set(by_id)).items():
+                        accept(article_id, result)
+        
+        except Exception as e:
+            if not results:
+                logger.error(f"打包 AI 分析失败: {e}")
+                raise AnalysisException(f"打包 AI 分析失败: {e}") from e
+            logger.warning(f"打包 AI 分析响应中断（已收到 {len(results)} 条结果）: {e}")
+        
+        # 缺失或格式错误的条目单独重试
+        missing = [article_id for article_id in by_id if article_id not in results]
+        if missing:
+            logger.warning(f"打包分析缺少 {len(missing)} 条有效结果，单独重试")
+        for article_id in missing:
+            try:
+                result = self.analyze_single(by_id[article_id])
+                if result:
+                    accept(article_id, result)
+            except AnalysisException as e:
+                logger.error(f"单独重试分析失败 {article_id}: {e}")
+        
+        return results
+    
     def analyze_batch(self, articles: List[Dict]) -> Optional[Dict]:
         """
         批量分析多篇文章，生成综合摘要
@@ -130,34 +357,9 @@ class AIAnalyzer(BaseAnalyzer):
             if not articles:
                 return None
             
-            # 构建文章列表文本
-            articles_text = ""
-            for i, article in enumerate(articles[:20], 1):  # 最多20篇
-                articles_text += f"\n{i}. {article.get('title', '无标题')}\n"
-                if article.get('summary'):
-                    articles_text += f"   摘要: {article.get('summary', '')[:200]}\n"
-            
-            # 构建提示词
-            prompt = f"""请对以下 {len(articles)} 篇新闻进行综合分析，提供：
-1. 整体趋势分析（300字以内）
-2. 主要热点话题（3-5个）
-3. 重要事件总结
-4. 可能的影响和趋势预测
-
-新闻列表：
-{articles_text}
-
-请以 JSON 格式返回，格式如下：
-{{
-    "trend_analysis": "整体趋势分析",
-    "hot_topics": ["话题1", "话题2", "话题3"],
-    "key_events": "重要事件总结",
-    "impact_prediction": "影响和趋势预测"
-}}
-"""
-            
             # 调用 AI API
-            result_text = self._call_api(prompt)
+            with usage_scope(operation='analyze_batch'):
+                result_text = self._call_api(batch_summary_prompt(articles), validate=self._is_summary)
             
             # 解析 JSON 响应
             return self._parse_batch_response(result_text, len(articles))
@@ -166,58 +368,493 @@ class AIAnalyzer(BaseAnalyzer):
             logger.error(f"批量 AI 分析失败: {e}")
             raise AnalysisException(f"批量 AI 分析失败: {e}") from e
     
-    def _call_api(self, prompt: str) -> str:
-        """调用 AI API"""
-        if self.provider == 'anthropic':
-            response = self.client.messages.create(
-                model=self.model,
+    def summarize_chunk(self, articles: List[Dict]) -> Optional[Dict]:
+        """
+        汇总一组文章（map 阶段），不截断
+        
+        Args:
+            articles: 文章列表，包含 title, summary, source，可选 cluster_size
+            
+        Returns:
+            汇总结果字典，包含 trend_analysis, hot_topics, key_events, impact_prediction；
+            响应无法解析时返回 None
+        """
+        if not articles:
+            return None
+        
+        prompt = chunk_summary_prompt(articles)
+        try:
+            with usage_scope(operation='summarize_chunk'):
+                return self._parse_summary(self._call_api(prompt, validate=self._is_summary))
+        except Exception as e:
+            raise AnalysisException(f"分块汇总失败: {e}") from e
+    
+    def merge_summaries(self, partials: List[Dict], article_count: int) -> Optional[Dict]:
+        """
+        合并多个部分汇总（reduce 阶段）
+        
+        Args:
+            partials: 部分汇总结果列表（summarize_chunk / merge_summaries 的返回值）
+            article_count: 覆盖的文章总数
+            
+        Returns:
+            合并后的汇总结果字典，响应无法解析时返回 None
+        """
+        if not partials:
+            return None
+        
+        prompt = merge_summary_prompt(partials, article_count)
+        try:
+            with usage_scope(operation='merge_summaries'):
+                return self._parse_summary(self._call_api(prompt, validate=self._is_summary))
+        except Exception as e:
+            raise AnalysisException(f"合并汇总失败: {e}") from e
+    
+    def translate_batch(self, texts: List[str], language: str) -> Dict[int, str]:
+        """
+        单次请求翻译多条文本
+        
+        Args:
+            texts: 待翻译文本列表
+            language: 目标语言名称（写入提示词，如 "简体中文"）
+            
+        Returns:
+            {文本下标: 译文}，缺失或格式错误的条目不在结果中
+        """
+        if not texts:
+            return {}
+        
+        try:
+            with usage_scope(operation='translate'):
+                result_text = self._call_api(
+                    translation_prompt(texts, language),
+                    validate=lambda text: bool(self._parse_translations(text, len(texts)))
+                )
+        except Exception as e:
+            raise AnalysisException(f"翻译失败: {e}") from e
+        return self._parse_translations(result_text, len(texts))
+    
+    def _call_api(self, prompt: Prompt, validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        调用 AI API（优先读取缓存）
+        
+        缓存键对应主接口的模型，只缓存主接口的结果；故障转移或对冲由备用接口返回的结果不写入缓存。
+        
+        Args:
+            validate: 可选的响应校验，校验不通过的响应不写入缓存（重试时重新请求）
+        """
+        if self.cache is None:
+            return self._request(prompt)
+        
+        key = LLMResultCache.make_key(
+            prompt.text, self.model, self.provider, PROMPT_VERSION, self.temperature
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug("LLM 缓存命中")
+            return cached
+        
+        result_text, endpoint = self._request_with_endpoint(prompt)
+        if result_text and endpoint is self.endpoints[0] and (validate is None or validate(result_text)):
+            self.cache.put(key, result_text)
+        return result_text
+    
+    def _call_api_stream(
+        self,
+        prompt: Prompt,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[str]:
+        """
+        流式调用 AI API，逐段产出响应文本
+        
+        缓存命中时一次产出完整结果；流式请求在收到第一段文本前失败时，
+        改用非流式请求（带故障转移）。主接口返回且通过校验的完整响应写入结果缓存。
+        
+        Args:
+            validate: 可选的完整响应校验，校验不通过的响应不写入缓存
+        """
+        key = None
+        if self.cache is not None:
+            key = LLMResultCache.make_key(
+                prompt.text, self.model, self.provider, PROMPT_VERSION, self.temperature
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("LLM 缓存命中")
+                yield cached
+                return
+        
+        chunks = []
+        endpoint = self.endpoints[0]
+        try:
+            for chunk in self._stream(endpoint, prompt):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            if chunks:
+                raise
+            logger.warning(f"流式请求失败，改用普通请求: {e}")
+            text, endpoint = self._request_with_endpoint(prompt)
+            chunks.append(text)
+            yield text
+        
+        result_text = ''.join(chunks)
+        if (
+            key is not None and result_text and endpoint is self.endpoints[0]
+            and (validate is None or validate(result_text))
+        ):
+            self.cache.put(key, result_text)
+    
+    def _request(self, prompt: Prompt) -> str:
+        """发送请求到 AI API（出错时按顺序故障转移，可选对冲请求）"""
+        return self._request_with_endpoint(prompt)[0]
+    
+    def _request_with_endpoint(self, prompt: Prompt) -> Tuple[str, AIEndpoint]:
+        """发送请求，返回 (响应文本, 返回该结果的接口)"""
+        if self._hedge_executor is not None:
+            return self._hedged_request(prompt)
+        
+        last_error = None
+        for index, endpoint in enumerate(self.endpoints):
+            try:
+                text = self._request_endpoint(endpoint, prompt, self._retries_for(index))
+                if self._is_usable_response(text):
+                    return text, endpoint
+                last_error = AnalysisException(f"{endpoint.name} 返回空响应")
+            except Exception as e:
+                last_error = e
+            if index + 1 < len(self.endpoints):
+                logger.warning(
+                    f"AI 接口 {endpoint.name} 失败（{last_error}），"
+                    f"切换到 {self.endpoints[index + 1].name}"
+                )
+        raise last_error
+    
+    def _hedged_request(self, prompt: Prompt) -> Tuple[str, AIEndpoint]:
+        """
+        对冲请求
+        
+        主请求超过该接口历史延迟分位数仍未返回时，向下一个接口发送备用请求，
+        取先返回的有效结果；请求失败时立即切换到下一个接口。
+        只有慢于分位数的请求才会触发对冲，额外请求量约为 (100 - 分位数)%。
+        对冲计时从请求真正发出时开始，在线程池中排队和等待限流的时间不计入。
+        """
+        pending = {}
+        started_at = {}
+        next_index = 0
+        hedged = False
+        last_error = None
+        
+        def launch() -> bool:
+            nonlocal next_index
+            if next_index >= len(self.endpoints):
+                return False
+            index = next_index
+            endpoint = self.endpoints[index]
+            future = self._hedge_executor.submit(
+                contextvars.copy_context().run,
+                self._request_endpoint, endpoint, prompt, self._retries_for(index),
+                lambda: started_at.setdefault(index, time.monotonic())
+            )
+            pending[future] = endpoint
+            next_index += 1
+            return True
+        
+        launch()
+        while pending:
+            timeout = None
+            waiting_start = False
+            if not hedged and next_index < len(self.endpoints):
+                # 以最近发出的请求所在接口的延迟分布作为对冲阈值
+                started = started_at.get(next_index - 1)
+                if started is None:
+                    # 请求尚未发出（排队或等待限流），稍后再检查
+                    timeout, waiting_start = _HEDGE_START_POLL, True
+                else:
+                    delay = self._hedge_delay(self.endpoints[next_index - 1])
+                    timeout = max(0.0, started + delay - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            if not done:
+                if waiting_start:
+                    continue
+                hedged = True
+                endpoint = self.endpoints[next_index]
+                if launch():
+                    logger.debug(f"AI 请求超过对冲阈值，向 {endpoint.name} 发送对冲请求")
+                continue
+            
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"AI 接口 {endpoint.name} 失败: {e}")
+                    continue
+                if self._is_usable_response(text):
+                    return text, endpoint
+                last_error = AnalysisException(f"{endpoint.name} 返回空响应")
+            
+            if not pending:
+                launch()
+        
+        raise last_error
+    
+    def _hedge_delay(self, endpoint: AIEndpoint) -> float:
+        """对冲等待时间：历史延迟分位数，样本不足时使用默认值"""
+        delay = None
+        if endpoint.latency.count >= self.ai_config.hedge_min_samples:
+            delay = endpoint.latency.percentile(self.ai_config.hedge_percentile)
+        if delay is None:
+            delay = self.ai_config.hedge_default_delay
+        return max(self.ai_config.hedge_min_delay, delay)
+    
+    def _retries_for(self, index: int) -> int:
+        """还有备用接口时少重试，尽快故障转移；最后一个接口使用完整重试次数"""
+        if index + 1 < len(self.endpoints):
+            return min(self.ai_config.failover_retries, self.ai_config.max_retries)
+        return self.ai_config.max_retries
+    
+    @staticmethod
+    def _is_usable_response(text: Optional[str]) -> bool:
+        """响应是否可用（非空且包含 JSON）"""
+        return bool(text) and ('{' in text or '[' in text)
+    
+    def _request_endpoint(
+        self,
+        endpoint: AIEndpoint,
+        prompt: Prompt,
+        max_retries: int,
+        on_start: Optional[Callable[[], None]] = None
+    ) -> str:
+        """
+        向单个接口发送请求（限流 + 临时错误重试）
+        
+        Args:
+            on_start: 通过限流、即将发出请求时的回调（对冲计时用，重试时也会调用）
+        """
+        # OpenAI 等按 max_tokens 预占 token 配额，实际用量在响应后修正
+        estimated = estimate_tokens(prompt.text) + self.max_tokens
+        
+        def attempt() -> str:
+            endpoint.rate_limiter.acquire(estimated)
+            if on_start is not None:
+                on_start()
+            started = time.monotonic()
+            text, used_tokens, headers = self._send(endpoint, prompt)
+            endpoint.latency.record(time.monotonic() - started)
+            endpoint.rate_limiter.update_from_headers(headers)
+            endpoint.rate_limiter.settle(estimated, used_tokens)
+            return text
+        
+        def on_error(error: Exception):
+            # 请求失败时根据错误更新限流器
+            response = getattr(error, 'response', None)
+            endpoint.rate_limiter.update_from_headers(getattr(response, 'headers', None))
+            if error_status(error) == 429:
+                endpoint.rate_limiter.on_throttled(retry_after_seconds(error))
+        
+        return call_with_retry(
+            attempt,
+            max_retries=max_retries,
+            base_delay=self.ai_config.retry_base_delay,
+            max_delay=self.ai_config.retry_max_delay,
+            on_error=on_error
+        )
+    
+    def _send(self, endpoint: AIEndpoint, prompt: Prompt):
+        """
+        发送单次请求
+        
+        固定前缀作为 system 消息放在最前面：Anthropic 为其加 cache_control 标记，
+        OpenAI 兼容接口对相同前缀自动缓存。命中缓存的 token 数计入接口统计，
+        token 用量、耗时和估算费用记入用量记录。
+        
+        Returns:
+            (响应文本, 实际消耗 token 数, 响应头)
+        """
+        started = time.monotonic()
+        if endpoint.provider == 'anthropic':
+            raw = endpoint.client.messages.with_raw_response.create(
+                model=endpoint.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
+                system=anthropic_system(prompt, self.ai_config.prompt_cache),
                 messages=[{
                     "role": "user",
-                    "content": prompt
+                    "content": prompt.user
                 }]
             )
-            return response.content[0].text
+            response = raw.parse()
+            usage = response.usage
+            input_tokens, cached, written = cache_usage(endpoint.provider, usage)
+            endpoint.prompt_cache.record(input_tokens, cached, written)
+            self._record_usage(endpoint, usage, time.monotonic() - started, MODE_SYNC)
+            used_tokens = input_tokens + usage.output_tokens if usage else None
+            return response.content[0].text, used_tokens, raw.headers
         else:
             # OpenAI 兼容接口
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
+            raw = endpoint.client.chat.completions.with_raw_response.create(
+                model=endpoint.model,
+                messages=openai_messages(prompt),
                 temperature=self.temperature,
                 max_tokens=self.max_tokens
             )
-            return response.choices[0].message.content
+            response = raw.parse()
+            endpoint.prompt_cache.record(*cache_usage(endpoint.provider, response.usage))
+            self._record_usage(endpoint, response.usage, time.monotonic() - started, MODE_SYNC)
+            used_tokens = response.usage.total_tokens if response.usage else None
+            return response.choices[0].message.content, used_tokens, raw.headers
     
-    def _parse_response(self, result_text: str) -> Dict:
-        """解析单篇文章分析响应"""
+    def _stream(self, endpoint: AIEndpoint, prompt: Prompt) -> Iterator[str]:
+        """
+        向单个接口发送流式请求（限流，不重试：已产出的文本无法撤回）
+        
+        Yields:
+            响应文本片段
+        """
+        estimated = estimate_tokens(prompt.text) + self.max_tokens
+        endpoint.rate_limiter.acquire(estimated)
+        started = time.monotonic()
+        used_tokens = None
+        usage = None
         try:
-            # 尝试提取 JSON（可能包含 markdown 代码块）
-            result_text = self._extract_json(result_text)
-            result = json.loads(result_text)
-            
-            return {
-                'analysis_type': 'general',
-                'analysis_content': result.get('analysis', ''),
-                'sentiment': result.get('sentiment', 'neutral'),
-                'sentiment_score': result.get('sentiment_score', 0.5),
-                'key_points': json.dumps(result.get('key_points', []), ensure_ascii=False)
-            }
+            if endpoint.provider == 'anthropic':
+                with endpoint.client.messages.stream(
+                    model=endpoint.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=anthropic_system(prompt, self.ai_config.prompt_cache),
+                    messages=[{
+                        "role": "user",
+                        "content": prompt.user
+                    }]
+                ) as stream:
+                    for text in stream.text_stream:
+                        yield text
+                    usage = stream.get_final_message().usage
+                input_tokens, cached, written = cache_usage(endpoint.provider, usage)
+                endpoint.prompt_cache.record(input_tokens, cached, written)
+                used_tokens = input_tokens + usage.output_tokens if usage else None
+            else:
+                stream = endpoint.client.chat.completions.create(
+                    model=endpoint.model,
+                    messages=openai_messages(prompt),
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+                for chunk in stream:
+                    if chunk.usage is not None:
+                        usage = chunk.usage
+                        endpoint.prompt_cache.record(*cache_usage(endpoint.provider, usage))
+                        used_tokens = usage.total_tokens
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            elapsed = time.monotonic() - started
+            endpoint.latency.record(elapsed)
+            self._record_usage(endpoint, usage, elapsed, MODE_STREAM)
+            endpoint.rate_limiter.settle(estimated, used_tokens)
+        except Exception as e:
+            if error_status(e) == 429:
+                endpoint.rate_limiter.on_throttled(retry_after_seconds(e))
+            raise
+    
+    def _record_usage(self, endpoint: AIEndpoint, usage, latency: float, mode: str):
+        """记录单次调用的用量（响应不含 usage 时不记录）"""
+        if usage is None:
+            return
+        self.usage.record(
+            endpoint.provider,
+            endpoint.model,
+            cache_usage(endpoint.provider, usage),
+            completion_tokens(endpoint.provider, usage),
+            latency=latency,
+            mode=mode
+        )
+    
+    def _parse_response(self, result_text: str) -> Dict:
+        """
+        解析单篇文章分析响应
         
+        Raises:
+            AnalysisException: 响应不是合法 JSON 或字段不完整（不编造情感等字段，文章释放后重试）
+        """
+        result = self._load_result(result_text)
+        if result is None:
+            logger.debug(f"响应内容: {result_text}")
+            raise AnalysisException("AI 响应不是有效的分析结果 JSON")
+        return self._build_result(result)
+    
+    def _load_result(self, result_text: Optional[str]) -> Optional[Dict]:
+        """提取并校验单篇分析结果 JSON（可能包含 markdown 代码块），无效时返回 None"""
+        try:
+            result = json.loads(self._extract_json(result_text or ''))
         except json.JSONDecodeError as e:
             logger.error(f"解析 AI 响应 JSON 失败: {e}")
-            logger.debug(f"响应内容: {result_text}")
-            # 返回原始文本作为分析内容
-            return {
-                'analysis_type': 'general',
-                'analysis_content': result_text,
-                'sentiment': 'neutral',
-                'sentiment_score': 0.5,
-                'key_points': '[]'
-            }
+            return None
+        if not isinstance(result, dict) or not self._is_valid_result(result):
+            logger.error("AI 响应缺少有效的分析字段")
+            return None
+        return result
+    
+    def _parse_packed_response(self, result_text: str, expected_ids: set) -> Dict[int, Dict]:
+        """
+        解析打包分析响应，只保留 id 合法且字段完整的条目
+        
+        Returns:
+            {文章 id: 分析结果字典}
+        """
+        try:
+            data = json.loads(self._extract_json(result_text))
+        except json.JSONDecodeError as e:
+            logger.error(f"解析打包分析 JSON 失败: {e}")
+            return {}
+        
+        if isinstance(data, dict):
+            data = data.get('results', [])
+        if not isinstance(data, list):
+            return {}
+        
+        id_lookup = {str(article_id): article_id for article_id in expected_ids}
+        results = {}
+        for item in data:
+            article_id = self._packed_item_id(item, id_lookup)
+            if article_id is not None and article_id not in results:
+                results[article_id] = self._build_result(item)
+        return results
+    
+    def _packed_item_id(self, item, id_lookup: Dict[str, int]) -> Optional[int]:
+        """校验打包结果中的一项，返回对应的文章 id，无效时返回 None"""
+        if not isinstance(item, dict) or not self._is_valid_result(item):
+            return None
+        # 模型可能把编号返回为字符串
+        return id_lookup.get(str(item.get('id')))
+    
+    @staticmethod
+    def _is_valid_result(item: Dict) -> bool:
+        """校验单条分析结果的字段"""
+        if not isinstance(item.get('analysis'), str) or not item['analysis'].strip():
+            return False
+        if item.get('sentiment') not in ('positive', 'negative', 'neutral'):
+            return False
+        score = item.get('sentiment_score', 0.5)
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            return False
+        return isinstance(item.get('key_points', []), list)
+    
+    @staticmethod
+    def _build_result(result: Dict) -> Dict:
+        """将模型返回的 JSON 转换为分析结果字典"""
+        return {
+            'analysis_type': 'general',
+            'analysis_content': result.get('analysis', ''),
+            'sentiment': result.get('sentiment', 'neutral'),
+            'sentiment_score': result.get('sentiment_score', 0.5),
+            'key_points': json.dumps(result.get('key_points', []), ensure_ascii=False)
+        }
     
     def _parse_batch_response(self, result_text: str, article_count: int) -> Dict:
         """解析批量分析响应"""
@@ -237,6 +874,42 @@ class AIAnalyzer(BaseAnalyzer):
                 'article_count': article_count
             }
     
+    def _parse_translations(self, result_text: str, count: int) -> Dict[int, str]:
+        """解析批量翻译响应（[{"id": 序号, "text": 译文}]，序号从 1 开始）"""
+        try:
+            data = json.loads(self._extract_json(result_text))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            logger.warning("翻译响应无法解析为 JSON")
+            return {}
+        if isinstance(data, dict):
+            data = data.get('results') or data.get('translations') or []
+        
+        translations = {}
+        for item in data if isinstance(data, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.get('id')) - 1
+            except (TypeError, ValueError):
+                continue
+            text = item.get('text')
+            if 0 <= index < count and isinstance(text, str) and text.strip():
+                translations[index] = text.strip()
+        return translations
+    
+    def _is_summary(self, result_text: str) -> bool:
+        """汇总响应能否解析（用于缓存校验）"""
+        return self._parse_summary(result_text) is not None
+    
+    def _parse_summary(self, result_text: str) -> Optional[Dict]:
+        """解析汇总响应"""
+        try:
+            result = json.loads(self._extract_json(result_text))
+        except json.JSONDecodeError as e:
+            logger.error(f"解析汇总 JSON 失败: {e}")
+            return None
+        return result if isinstance(result, dict) else None
+    
     def _extract_json(self, text: str) -> str:
         """从文本中提取 JSON"""
         if '```json' in text:
@@ -0,0 +1,273 @@
+"""
+AI 提供商批处理接口（OpenAI Batch / Anthropic Message Batches）
+
+批处理请求异步执行（通常 24 小时内完成），价格约为同步接口的一半，
+适合清理积压的未分析文章。请求先写入本地 JSONL 任务文件，再提交给提供商。
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from src.analyzers.prompt_cache import cache_usage
+from src.analyzers.prompts import Prompt, anthropic_system, openai_messages
+from src.analyzers.usage import completion_tokens
+from src.core.exceptions import AnalysisException
+
+# 统一的批处理任务状态
+STATE_IN_PROGRESS = 'in_progress'
+STATE_COMPLETED = 'completed'
+STATE_FAILED = 'failed'
+
+# 任务结束后可以读取结果的状态（过期 / 取消的任务可能仍有部分结果）
+FINISHED_STATES = (STATE_COMPLETED, STATE_FAILED)
+
+
+@dataclass
+class BatchStatus:
+    """批处理任务状态"""
+    state: str
+    remote_status: str
+    counts: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """批处理任务中单个请求的结果"""
+    custom_id: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+    # (输入 token 总数, 命中缓存数, 写入缓存数, 输出 token 数)，响应不含 usage 时为 None
+    usage: Optional[Tuple[int, int, int, int]] = None
+
+
+def write_job_file(path: str, requests: Iterable[Dict]) -> int:
+    """
+    写入 JSONL 任务文件
+
+    Returns:
+        写入的请求数
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for request in requests:
+            f.write(json.dumps(request, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def read_job_file(path: str) -> Iterator[Dict]:
+    """逐行读取 JSONL 任务文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class BatchClient:
+    """批处理客户端基类"""
+
+    provider = ''
+
+    def __init__(self, client, model: str, max_tokens: int, temperature: float, prompt_cache: bool = True):
+        """
+        初始化批处理客户端
+
+        Args:
+            client: 提供商 SDK 客户端
+            model: 模型名称
+            max_tokens: 单个请求最大输出 token 数
+            temperature: 采样温度
+            prompt_cache: 是否标记提示词固定前缀可缓存（Anthropic）
+        """
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.prompt_cache = prompt_cache
+
+    def build_request(self, custom_id: str, prompt: Prompt) -> Dict:
+        """构建任务文件中的一行请求"""
+        raise NotImplementedError
+
+    def submit(self, path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        """
+        提交任务文件
+
+        Returns:
+            提供商侧的任务 ID
+        """
+        raise NotImplementedError
+
+    def status(self, remote_id: str) -> BatchStatus:
+        """查询任务状态"""
+        raise NotImplementedError
+
+    def results(self, remote_id: str) -> Iterator[BatchResult]:
+        """逐条读取已结束任务的结果"""
+        raise NotImplementedError
+
+
+class OpenAIBatchClient(BatchClient):
+    """OpenAI Batch 接口（兼容该接口的服务也可使用）"""
+
+    provider = 'openai'
+    endpoint = '/v1/chat/completions'
+
+    def __init__(self, client, model: str, max_tokens: int, temperature: float,
+                 prompt_cache: bool = True, completion_window: str = '24h'):
+        super().__init__(client, model, max_tokens, temperature, prompt_cache)
+        self.completion_window = completion_window
+
+    def build_request(self, custom_id: str, prompt: Prompt) -> Dict:
+        return {
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': self.endpoint,
+            'body': {
+                'model': self.model,
+                'messages': openai_messages(prompt),
+                'temperature': self.temperature,
+                'max_tokens': self.max_tokens,
+            },
+        }
+
+    def submit(self, path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        with open(path, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.endpoint,
+            completion_window=self.completion_window,
+            metadata=metadata
+        )
+        return batch.id
+
+    def status(self, remote_id: str) -> BatchStatus:
+        batch = self.client.batches.retrieve(remote_id)
+        counts = batch.request_counts
+        if batch.status in ('completed', 'expired', 'cancelled'):
+            state = STATE_COMPLETED
+        elif batch.status == 'failed':
+            state = STATE_FAILED
+        else:
+            state = STATE_IN_PROGRESS
+        error = None
+        if batch.errors and batch.errors.data:
+            error = '; '.join(e.message or e.code or '' for e in batch.errors.data)
+        return BatchStatus(
+            state=state,
+            remote_status=batch.status,
+            counts={
+                'total': counts.total,
+                'succeeded': counts.completed,
+                'failed': counts.failed,
+            } if counts else {},
+            error=error
+        )
+
+    def results(self, remote_id: str) -> Iterator[BatchResult]:
+        batch = self.client.batches.retrieve(remote_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = self.client.files.content(file_id).text
+            for line in content.splitlines():
+                if line.strip():
+                    yield self._parse_line(json.loads(line))
+
+    @staticmethod
+    def _parse_line(item: Dict) -> BatchResult:
+        custom_id = item.get('custom_id')
+        if item.get('error'):
+            return BatchResult(custom_id, error=json.dumps(item['error'], ensure_ascii=False))
+        response = item.get('response') or {}
+        if response.get('status_code') != 200:
+            return BatchResult(custom_id, error=f"HTTP {response.get('status_code')}")
+        body = response.get('body') or {}
+        usage = None
+        if body.get('usage'):
+            raw = body['usage']
+            cached = (raw.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+            usage = (raw.get('prompt_tokens') or 0, cached, 0, raw.get('completion_tokens') or 0)
+        try:
+            text = body['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            return BatchResult(custom_id, error='响应格式错误', usage=usage)
+        return BatchResult(custom_id, text=text, usage=usage)
+
+
+class AnthropicBatchClient(BatchClient):
+    """Anthropic Message Batches 接口（请求列表直接随创建请求提交）"""
+
+    provider = 'anthropic'
+
+    def build_request(self, custom_id: str, prompt: Prompt) -> Dict:
+        return {
+            'custom_id': custom_id,
+            'params': {
+                'model': self.model,
+                'max_tokens': self.max_tokens,
+                'temperature': self.temperature,
+                'system': anthropic_system(prompt, self.prompt_cache),
+                'messages': [{'role': 'user', 'content': prompt.user}],
+            },
+        }
+
+    def submit(self, path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        batch = self.client.messages.batches.create(requests=list(read_job_file(path)))
+        return batch.id
+
+    def status(self, remote_id: str) -> BatchStatus:
+        batch = self.client.messages.batches.retrieve(remote_id)
+        counts = batch.request_counts
+        return BatchStatus(
+            state=STATE_COMPLETED if batch.processing_status == 'ended' else STATE_IN_PROGRESS,
+            remote_status=batch.processing_status,
+            counts={
+                'total': counts.processing + counts.succeeded + counts.errored
+                + counts.canceled + counts.expired,
+                'succeeded': counts.succeeded,
+                'failed': counts.errored + counts.canceled + counts.expired,
+            }
+        )
+
+    def results(self, remote_id: str) -> Iterator[BatchResult]:
+        for item in self.client.messages.batches.results(remote_id):
+            result = item.result
+            if result.type != 'succeeded':
+                error = getattr(result, 'error', None)
+                yield BatchResult(item.custom_id, error=str(error) if error else result.type)
+                continue
+            text = ''.join(
+                block.text for block in result.message.content if getattr(block, 'type', '') == 'text'
+            )
+            usage = result.message.usage
+            yield BatchResult(
+                item.custom_id,
+                text=text,
+                usage=(*cache_usage(self.provider, usage), completion_tokens(self.provider, usage))
+                if usage else None
+            )
+
+
+def create_batch_client(
+    provider: str,
+    client,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    prompt_cache: bool = True
+) -> BatchClient:
+    """
+    按提供商创建批处理客户端
+
+    Raises:
+        AnalysisException: 提供商不支持批处理接口
+    """
+    if provider == 'anthropic':
+        return AnthropicBatchClient(client, model, max_tokens, temperature, prompt_cache)
+    if provider in ('openai', 'custom'):
+        return OpenAIBatchClient(client, model, max_tokens, temperature, prompt_cache)
+    raise AnalysisException(f"AI 提供商 {provider} 不支持批处理接口")
@@ -0,0 +1,241 @@
+"""
+LLM 结果缓存（内容寻址，持久化到本地 SQLite 文件）
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+
+from loguru import logger
+
+
+class LLMResultCache:
+    """
+    LLM 响应缓存
+
+    键为 (规范化输入文本, 模型, 提供商, 提示词版本, temperature) 的 SHA-256，
+    相同标题在不同 URL / 平台出现、或失败后重新分析时直接命中，不再请求 API。
+    支持 TTL 过期和按条目数 / 总字节数的 LRU 淘汰。
+    命中 / 未命中 / 节省字节数持久化保存，多个进程共享同一份统计。
+    条目数和总字节数作为计数器随写入和删除在同一事务中更新，写入时不扫描全表；
+    过期条目每 SWEEP_EVERY 次写入清理一次，同时按实际数据校正计数器。
+    读取只查询不写入：命中 / 未命中统计和访问时间先记在内存中，随下一次写入、
+    每 FLUSH_EVERY 次读取、stats() 或 close() 一并写入，命中时不产生写事务。
+    """
+
+    SWEEP_EVERY = 100
+    FLUSH_EVERY = 100
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 50000,
+        max_bytes: int = 200 * 1024 * 1024
+    ):
+        """
+        初始化缓存
+
+        Args:
+            path: 缓存文件路径
+            ttl_seconds: 条目有效期（秒），0 表示不过期
+            max_entries: 最大条目数
+            max_bytes: 最大总字节数
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+        self._puts = 0
+        self._lookups = 0
+        # 尚未写入的统计和访问时间
+        self._pending: Dict[str, int] = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+        self._touched: Dict[str, float] = {}
+        with self._lock:
+            self._sweep(time.time())
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        model: str,
+        provider: str,
+        prompt_version: str,
+        temperature: float
+    ) -> str:
+        """生成缓存键：规范化文本（NFKC + 合并空白）与调用参数的哈希"""
+        normalized = ' '.join(unicodedata.normalize('NFKC', text).split())
+        payload = json.dumps(
+            [normalized, model, provider, prompt_version, temperature],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存，过期或不存在返回 None（过期条目由定期清理删除）"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds and row[2] + self.ttl_seconds < now:
+                row = None
+
+            if row is None:
+                self._pending['misses'] += 1
+            else:
+                self._pending['hits'] += 1
+                self._pending['bytes_saved'] += row[1]
+                self._touched[key] = now
+            self._lookups += 1
+            if self._lookups % self.FLUSH_EVERY == 0:
+                self._flush()
+                self._conn.commit()
+            return row[0] if row else None
+
+    def peek(self, key: str) -> Optional[str]:
+        """只读读取缓存（不更新访问时间和命中统计，不写数据库），过期或不存在返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (self.ttl_seconds and row[1] + self.ttl_seconds < time.time()):
+            return None
+        return row[0]
+
+    def put(self, key: str, value: str):
+        """写入缓存，超出容量时淘汰最久未访问的条目"""
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._incr('entry_count', 0 if old else 1)
+            self._incr('entry_bytes', size - (old[0] if old else 0))
+            self._touched.pop(key, None)
+            self._flush()
+            self._puts += 1
+            if self._puts % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """获取缓存统计"""
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        lookups = hits + misses
+        return {
+            'entries': entries,
+            'bytes': total_bytes,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'bytes_saved': counters.get('bytes_saved', 0),
+        }
+
+    def close(self):
+        """关闭缓存文件"""
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+            self._conn.close()
+
+    def _incr(self, name: str, amount: int):
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def _flush(self):
+        """写入内存中累计的统计和访问时间（调用方持有锁并提交）"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+        for name, amount in self._pending.items():
+            if amount:
+                self._incr(name, amount)
+                self._pending[name] = 0
+
+    def _sweep(self, now: float):
+        """删除过期条目，并按实际数据重置条目数和总字节数计数器（调用方持有锁）"""
+        if self.ttl_seconds:
+            self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        entries, total_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)",
+            [('entry_count', entries), ('entry_bytes', total_bytes)]
+        )
+
+    def _evict(self):
+        """按 LRU 淘汰到容量以内（条目数和字节数读取计数器，调用方持有锁）"""
+        counters = dict(self._conn.execute(
+            "SELECT name, value FROM counters WHERE name IN ('entry_count', 'entry_bytes')"
+        ).fetchall())
+        entries = counters.get('entry_count', 0)
+        total_bytes = counters.get('entry_bytes', 0)
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # 按最久未访问顺序删除，直到条目数和字节数都回到上限以内
+        excess_entries = max(0, entries - self.max_entries)
+        excess_bytes = max(0, total_bytes - self.max_bytes)
+        evict_keys = []
+        freed = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access"
+        ):
+            if len(evict_keys) >= excess_entries and freed >= excess_bytes:
+                break
+            evict_keys.append(key)
+            freed += size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in evict_keys])
+        self._incr('entry_count', -len(evict_keys))
+        self._incr('entry_bytes', -freed)
+        logger.debug(f"LLM 缓存淘汰 {len(evict_keys)} 条，释放 {freed} 字节")
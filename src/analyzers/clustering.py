@@ -0,0 +1,303 @@
+"""
+本地话题聚类（字符 n-gram TF-IDF + 小批量球面 k-means，纯 NumPy）
+"""
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = (2, 3)) -> List[str]:
+    """
+    提取字符 n-gram（不依赖分词，中英文通用）
+
+    文本先做 NFKC 规范化、转小写并把标点合并为空格，n-gram 不跨越空格。
+    """
+    text = _NON_WORD.sub(' ', unicodedata.normalize('NFKC', text or '').lower())
+    grams = []
+    low, high = ngram_range
+    for token in text.split():
+        if len(token) < low:
+            grams.append(token)
+            continue
+        for n in range(low, high + 1):
+            grams.extend(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+class SparseRows:
+    """CSR 格式的稀疏行矩阵（只实现聚类需要的运算）"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_features: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_features = n_features
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def take(self, rows: np.ndarray) -> 'SparseRows':
+        """按行号取子矩阵"""
+        starts = self.indptr[rows]
+        ends = self.indptr[rows + 1]
+        lengths = ends - starts
+        positions = np.concatenate(
+            [np.arange(s, e) for s, e in zip(starts, ends)]
+        ) if len(rows) else np.zeros(0, dtype=np.int64)
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        return SparseRows(indptr, self.indices[positions], self.data[positions], self.n_features)
+
+    def row_ids(self) -> np.ndarray:
+        """每个非零元素所在的行号"""
+        return np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+
+    def dot(self, dense: np.ndarray) -> np.ndarray:
+        """计算 self @ dense.T（dense 为 k x n_features 稠密矩阵）"""
+        result = np.zeros((self.n_rows, dense.shape[0]), dtype=np.float32)
+        if len(self.data):
+            np.add.at(result, self.row_ids(), self.data[:, None] * dense[:, self.indices].T)
+        return result
+
+    def sum_by(self, labels: np.ndarray, k: int) -> np.ndarray:
+        """按行标签求和，返回 k x n_features 稠密矩阵"""
+        result = np.zeros((k, self.n_features), dtype=np.float32)
+        if len(self.data):
+            np.add.at(result, (labels[self.row_ids()], self.indices), self.data)
+        return result
+
+
+class CharNgramTfidf:
+    """字符 n-gram TF-IDF 向量化（次线性 TF，行向量 L2 归一化）"""
+
+    def __init__(
+        self,
+        ngram_range: Tuple[int, int] = (2, 3),
+        max_features: int = 50000,
+        min_df: int = 1
+    ):
+        """
+        初始化向量化器
+
+        Args:
+            ngram_range: n-gram 长度范围
+            max_features: 最多保留的特征数（按文档频率）
+            min_df: 最小文档频率
+        """
+        self.ngram_range = ngram_range
+        self.max_features = max_features
+        self.min_df = min_df
+        self.vocabulary: Dict[str, int] = {}
+        self.features: List[str] = []
+
+    def fit_transform(self, texts: Sequence[str]) -> SparseRows:
+        """拟合词表并返回 TF-IDF 稀疏矩阵"""
+        counts = [Counter(char_ngrams(text, self.ngram_range)) for text in texts]
+        df = Counter()
+        for c in counts:
+            df.update(c.keys())
+
+        kept = [g for g, d in df.most_common(self.max_features) if d >= self.min_df]
+        self.features = sorted(kept)
+        self.vocabulary = {g: i for i, g in enumerate(self.features)}
+        n_docs = len(texts)
+        df_array = np.array([df[g] for g in self.features], dtype=np.float32)
+        idf = np.log((1 + n_docs) / (1 + df_array)) + 1
+
+        indptr = [0]
+        indices = []
+        data = []
+        for c in counts:
+            row = [(self.vocabulary[g], tf) for g, tf in c.items() if g in self.vocabulary]
+            row.sort()
+            indices.extend(i for i, _ in row)
+            data.extend(tf for _, tf in row)
+            indptr.append(len(indices))
+
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int64)
+        data = np.array(data, dtype=np.float32)
+        if len(data):
+            data = (1 + np.log(data)) * idf[indices]
+            row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+            norms = np.sqrt(np.bincount(row_ids, weights=data ** 2, minlength=n_docs))
+            norms[norms == 0] = 1
+            data = (data / norms[row_ids]).astype(np.float32)
+        return SparseRows(indptr, indices, data, len(self.features))
+
+
+def spherical_kmeans(
+    matrix: SparseRows,
+    k: int,
+    batch_size: int = 256,
+    iterations: int = 30,
+    refine_passes: int = 3,
+    n_init: int = 3,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    小批量球面 k-means（余弦相似度）
+
+    使用 k-means++ 初始化，每轮抽取一个小批量按中心累计样本数的学习率更新中心，
+    最后对全部行分批指派并重算中心若干轮。独立初始化 n_init 次，
+    取与所属中心相似度之和最大的结果。
+
+    Args:
+        matrix: L2 归一化的稀疏行矩阵
+        k: 簇数
+        batch_size: 小批量大小
+        iterations: 小批量迭代轮数
+        refine_passes: 全量修正轮数
+        n_init: 独立初始化次数
+        seed: 随机种子（相同输入得到相同结果）
+
+    Returns:
+        (每行的簇标签, 每行与所属中心的余弦相似度)
+    """
+    rng = np.random.default_rng(seed)
+    best_result = None
+    for _ in range(max(1, n_init)):
+        labels, similarity = _kmeans_once(matrix, k, batch_size, iterations, refine_passes, rng)
+        if best_result is None or similarity.sum() > best_result[1].sum():
+            best_result = (labels, similarity)
+    return best_result
+
+
+def _kmeans_once(
+    matrix: SparseRows,
+    k: int,
+    batch_size: int,
+    iterations: int,
+    refine_passes: int,
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    n = matrix.n_rows
+    k = max(1, min(k, n))
+
+    # k-means++ 初始化（在样本上进行，控制大数据量时的开销）
+    sample = rng.choice(n, size=min(n, max(batch_size, 20 * k)), replace=False)
+    sample_rows = matrix.take(sample)
+    centers = np.zeros((k, matrix.n_features), dtype=np.float32)
+    first = rng.integers(len(sample))
+    centers[0] = sample_rows.take(np.array([first])).sum_by(np.zeros(1, dtype=np.int64), 1)[0]
+    best = sample_rows.dot(centers[:1])[:, 0]
+    for c in range(1, k):
+        distance = np.clip(1 - best, 0, None)
+        total = distance.sum()
+        pick = rng.integers(len(sample)) if total <= 0 else rng.choice(len(sample), p=distance / total)
+        centers[c] = sample_rows.take(np.array([pick])).sum_by(np.zeros(1, dtype=np.int64), 1)[0]
+        best = np.maximum(best, sample_rows.dot(centers[c:c + 1])[:, 0])
+
+    counts = np.zeros(k, dtype=np.float32)
+    for _ in range(iterations):
+        rows = rng.choice(n, size=min(n, batch_size), replace=False)
+        batch = matrix.take(rows)
+        labels = batch.dot(centers).argmax(axis=1)
+        sums = batch.sum_by(labels, k)
+        batch_counts = np.bincount(labels, minlength=k).astype(np.float32)
+        updated = batch_counts > 0
+        centers[updated] = (
+            centers[updated] * counts[updated, None] + sums[updated]
+        ) / (counts[updated] + batch_counts[updated])[:, None]
+        counts += batch_counts
+        norms = np.linalg.norm(centers, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        centers /= norms
+
+    # 最后做几轮全量指派 + 重算中心，修正小批量更新残留的早期偏差
+    for refine in range(refine_passes + 1):
+        labels, similarity = _assign(matrix, centers)
+        if refine == refine_passes:
+            break
+        sums = np.zeros_like(centers)
+        for start in range(0, n, 1024):
+            rows = np.arange(start, min(n, start + 1024))
+            sums += matrix.take(rows).sum_by(labels[rows], k)
+        norms = np.linalg.norm(sums, axis=1)
+        nonempty = norms > 0
+        centers[nonempty] = sums[nonempty] / norms[nonempty, None]
+    return labels, similarity
+
+
+def _assign(matrix: SparseRows, centers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """分批把每行指派到最相似的中心"""
+    n = matrix.n_rows
+    labels = np.zeros(n, dtype=np.int64)
+    similarity = np.zeros(n, dtype=np.float32)
+    for start in range(0, n, 1024):
+        rows = np.arange(start, min(n, start + 1024))
+        scores = matrix.take(rows).dot(centers)
+        labels[rows] = scores.argmax(axis=1)
+        similarity[rows] = scores.max(axis=1)
+    return labels, similarity
+
+
+def cluster_topics(
+    articles: List[Dict],
+    max_clusters: int = 50,
+    keywords_per_topic: int = 5,
+    seed: int = 0
+) -> List[Dict]:
+    """
+    将文章聚类为话题
+
+    Args:
+        articles: 文章列表（至少包含 id, title，可选 summary）
+        max_clusters: 最大话题数
+        keywords_per_topic: 每个话题返回的关键 n-gram 数
+        seed: 随机种子
+
+    Returns:
+        按规模降序的话题列表，每项包含 size, representative（最接近中心的文章）,
+        keywords, article_ids
+    """
+    if not articles:
+        return []
+
+    texts = [f"{a.get('title') or ''} {(a.get('summary') or '')[:200]}" for a in articles]
+    vectorizer = CharNgramTfidf()
+    matrix = vectorizer.fit_transform(texts)
+    if matrix.n_features == 0:
+        return [_topic(articles, np.arange(len(articles)), 0, [])]
+
+    labels, similarity = spherical_kmeans(matrix, max_clusters, seed=seed)
+
+    topics = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        representative = members[similarity[members].argmax()]
+        weights = matrix.take(members).sum_by(np.zeros(len(members), dtype=np.int64), 1)[0]
+        top = np.argsort(weights)[::-1][:keywords_per_topic]
+        keywords = [vectorizer.features[i] for i in top if weights[i] > 0]
+        topics.append(_topic(articles, members, representative, keywords))
+
+    topics.sort(key=lambda t: (-t['size'], t['article_ids'][0]))
+    return topics
+
+
+def _topic(articles: List[Dict], members: np.ndarray, representative: int, keywords: List[str]) -> Dict:
+    return {
+        'size': int(len(members)),
+        'representative': articles[int(representative)],
+        'keywords': keywords,
+        'article_ids': [articles[int(i)].get('id') for i in members],
+    }
+
+
+def representatives(articles: List[Dict], max_clusters: int, seed: int = 0) -> Optional[List[Dict]]:
+    """
+    返回各话题的代表文章（附带 cluster_size），文章数不超过 max_clusters 时返回 None
+
+    代表文章按其 id 排序，使相同输入得到稳定的顺序。
+    """
+    if len(articles) <= max_clusters:
+        return None
+    topics = cluster_topics(articles, max_clusters=max_clusters, seed=seed)
+    items = [dict(t['representative'], cluster_size=t['size']) for t in topics]
+    items.sort(key=lambda a: a.get('id') or 0)
+    return items
@@ -0,0 +1,144 @@
+"""
+文章向量化后端
+
+- HashingEmbedder：字符 n-gram 哈希向量（纯 NumPy，离线可用，不需要拟合词表）
+- OpenAIEmbedder：OpenAI 兼容的 embeddings 接口
+
+所有后端返回 L2 归一化的 float32 矩阵，向量内积即余弦相似度。
+"""
+import math
+import zlib
+from collections import Counter
+from typing import Dict, Sequence
+
+import numpy as np
+from loguru import logger
+
+from src.analyzers.clustering import char_ngrams
+from src.analyzers.rate_limit import call_with_retry
+from src.core.exceptions import AnalysisException
+
+
+def article_text(article: Dict, summary_chars: int = 500) -> str:
+    """用于向量化的文章文本（标题 + 摘要开头）"""
+    title = article.get('title') or ''
+    summary = (article.get('summary') or '')[:summary_chars]
+    return f"{title}\n{summary}" if summary else title
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """行向量 L2 归一化（全零行保持为零）"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32)
+
+
+class EmbeddingBackend:
+    """向量化后端基类"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    @property
+    def name(self) -> str:
+        """后端标识（写入向量存储，后端或维度变化时需要重建索引）"""
+        raise NotImplementedError
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        计算文本向量
+
+        Returns:
+            len(texts) x dim 的 L2 归一化 float32 矩阵
+        """
+        raise NotImplementedError
+
+
+class HashingEmbedder(EmbeddingBackend):
+    """
+    字符 n-gram 哈希向量
+
+    每个 n-gram 用 CRC32 映射到一个维度和正负号（减少哈希冲突带来的偏差），
+    词频取次线性 1 + log(tf)。不同进程、不同批次的结果一致。
+    """
+
+    def __init__(self, dim: int = 256, ngram_range=(2, 3)):
+        super().__init__(dim)
+        self.ngram_range = tuple(ngram_range)
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.ngram_range[0]}-{self.ngram_range[1]}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for gram, tf in Counter(char_ngrams(text, self.ngram_range)).items():
+                h = zlib.crc32(gram.encode('utf-8'))
+                sign = 1.0 if (h // self.dim) & 1 else -1.0
+                matrix[row, h % self.dim] += sign * (1 + math.log(tf))
+        return normalize_rows(matrix)
+
+
+class OpenAIEmbedder(EmbeddingBackend):
+    """OpenAI 兼容的 embeddings 接口（text-embedding-3 系列支持指定维度）"""
+
+    def __init__(self, client, model: str, dim: int, batch_size: int = 256, max_retries: int = 4):
+        super().__init__(dim)
+        self.client = client
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+
+    @property
+    def name(self) -> str:
+        return f"openai-{self.model}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = [text or ' ' for text in texts[start:start + self.batch_size]]
+            response = call_with_retry(
+                lambda: self.client.embeddings.create(
+                    model=self.model,
+                    input=batch,
+                    dimensions=self.dim,
+                    encoding_format='float'
+                ),
+                max_retries=self.max_retries
+            )
+            for item in response.data:
+                vector = np.asarray(item.embedding, dtype=np.float32)
+                if len(vector) != self.dim:
+                    raise AnalysisException(
+                        f"embedding 维度 {len(vector)} 与配置的 {self.dim} 不一致"
+                    )
+                matrix[start + item.index] = vector
+        return normalize_rows(matrix)
+
+
+def create_embedder(embedding_config, ai_config=None) -> EmbeddingBackend:
+    """
+    按配置创建向量化后端
+
+    openai 后端未单独配置 api_key / base_url 时使用 AI 配置中的主接口（仅限 OpenAI 兼容接口）；
+    没有可用的 API Key 时回退为本地哈希向量。
+    """
+    if embedding_config.backend == 'openai':
+        shared = ai_config if ai_config is not None and ai_config.provider in ('openai', 'custom') else None
+        api_key = embedding_config.api_key or (shared.api_key if shared else '')
+        base_url = embedding_config.base_url or (shared.base_url if shared else '')
+        if api_key:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, base_url=base_url or None, max_retries=0)
+            return OpenAIEmbedder(
+                client,
+                embedding_config.model,
+                embedding_config.dim,
+                batch_size=embedding_config.batch_size
+            )
+        logger.warning("embeddings 接口未配置 API Key，使用本地哈希向量")
+    elif embedding_config.backend != 'hashing':
+        raise AnalysisException(f"不支持的向量化后端: {embedding_config.backend}")
+    return HashingEmbedder(embedding_config.dim)
+
@@ -0,0 +1,129 @@
+"""
+并发分析引擎
+"""
+import contextvars
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+# imap_streaming 产出的事件类型
+EVENT_PARTIAL = 'partial'
+EVENT_DONE = 'done'
+EVENT_ERROR = 'error'
+
+
+class ConcurrentAnalysisEngine:
+    """
+    并发分析引擎
+
+    用线程池包装同步的 LLM 客户端（OpenAI / Anthropic 客户端线程安全），
+    同时在途的请求数不超过 max_in_flight，结果按完成顺序返回。
+    任务在提交时的上下文副本中执行（继承 usage_scope 等上下文变量），
+    数据库写入仍由调用方在当前线程完成。
+    """
+
+    def __init__(self, max_in_flight: int = 4):
+        """
+        初始化并发分析引擎
+
+        Args:
+            max_in_flight: 最大并发请求数
+        """
+        self.max_in_flight = max(1, max_in_flight)
+
+    def imap_unordered(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any]
+    ) -> Iterator[Tuple[Any, Optional[Any], Optional[Exception]]]:
+        """
+        并发执行 func(item)，按完成顺序产出结果
+
+        Args:
+            func: 处理函数
+            items: 待处理项（惰性消费，在途数量满时不会继续读取）
+
+        Yields:
+            (item, 结果, 异常) 元组，成功时异常为 None，失败时结果为 None
+        """
+        iterator = iter(items)
+        with ThreadPoolExecutor(
+            max_workers=self.max_in_flight,
+            thread_name_prefix='analysis'
+        ) as executor:
+            in_flight = {}
+
+            def submit_next() -> bool:
+                for item in iterator:
+                    in_flight[executor.submit(contextvars.copy_context().run, func, item)] = item
+                    return True
+                return False
+
+            for _ in range(self.max_in_flight):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    submit_next()
+                    try:
+                        yield item, future.result(), None
+                    except Exception as e:
+                        yield item, None, e
+
+    def imap_streaming(
+        self,
+        func: Callable[[Any, Callable[[Any], None]], Any],
+        items: Iterable[Any]
+    ) -> Iterator[Tuple[Any, str, Any]]:
+        """
+        并发执行 func(item, emit)，func 执行过程中可多次调用 emit 提前交出部分结果
+
+        部分结果经队列转交到调用方线程，调用方可以在请求完成前就写入数据库。
+
+        Args:
+            func: 处理函数，第二个参数为 emit 回调（线程安全）
+            items: 待处理项（惰性消费，在途数量满时不会继续读取）
+
+        Yields:
+            (item, 事件类型, 值)：EVENT_PARTIAL 的值为 emit 的参数，
+            EVENT_DONE 的值为 func 的返回值，EVENT_ERROR 的值为异常；
+            每个 item 最后产出一次 EVENT_DONE 或 EVENT_ERROR
+        """
+        iterator = iter(items)
+        events: queue.Queue = queue.Queue()
+
+        def run(item):
+            try:
+                result = func(item, lambda value: events.put((item, EVENT_PARTIAL, value)))
+            except Exception as e:
+                events.put((item, EVENT_ERROR, e))
+            else:
+                events.put((item, EVENT_DONE, result))
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_in_flight,
+            thread_name_prefix='analysis'
+        ) as executor:
+            in_flight = 0
+
+            def submit_next() -> bool:
+                for item in iterator:
+                    executor.submit(contextvars.copy_context().run, run, item)
+                    return True
+                return False
+
+            for _ in range(self.max_in_flight):
+                if not submit_next():
+                    break
+                in_flight += 1
+
+            while in_flight:
+                event = events.get()
+                if event[1] != EVENT_PARTIAL:
+                    in_flight -= 1
+                    if submit_next():
+                        in_flight += 1
+                yield event
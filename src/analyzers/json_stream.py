@@ -0,0 +1,76 @@
+"""
+流式 JSON 解析：从逐块到达的模型输出中尽早取出完整的数组元素
+"""
+import json
+from typing import Any, List
+
+
+class JsonArrayItemStream:
+    """
+    增量提取 JSON 数组中的对象元素
+
+    按字符跟踪括号栈和字符串状态，数组中的对象一闭合就解析并返回，
+    不需要等待整个响应结束。兼容 markdown 代码块包裹、{"results": [...]} 外层对象，
+    以及数组前后的说明文字；被截断的最后一个对象不会返回。
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        # 正在收集的对象：开始时的栈深度和已读取的字符
+        self._item_depth = None
+        self._item_chars: List[str] = []
+        self.items_parsed = 0
+        self.items_invalid = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        输入一段文本
+
+        Returns:
+            本段文本中闭合的对象列表（按出现顺序）
+        """
+        completed = []
+        for ch in chunk:
+            if self._item_depth is not None:
+                self._item_chars.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                # 容器外的引号属于说明文字
+                if self._stack:
+                    self._in_string = True
+            elif ch in '[{':
+                if ch == '{' and self._item_depth is None and self._stack and self._stack[-1] == '[':
+                    self._item_depth = len(self._stack)
+                    self._item_chars = ['{']
+                self._stack.append(ch)
+            elif ch in ']}':
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if self._item_depth is not None and len(self._stack) == self._item_depth:
+                    item = self._parse(''.join(self._item_chars))
+                    if item is not None:
+                        completed.append(item)
+                    self._item_depth = None
+                    self._item_chars = []
+        return completed
+
+    def _parse(self, text: str):
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            self.items_invalid += 1
+            return None
+        self.items_parsed += 1
+        return item
@@ -0,0 +1,104 @@
+"""
+AI 接口延迟统计
+"""
+import bisect
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class LatencyHistogram:
+    """
+    对数分桶的延迟直方图
+
+    桶边界从 min_seconds 开始按 growth 倍数递增，分位数误差不超过一个桶宽。
+    样本总数超过 window 时所有计数减半，使统计偏向最近的延迟分布。
+    """
+
+    def __init__(
+        self,
+        min_seconds: float = 0.05,
+        max_seconds: float = 600.0,
+        growth: float = 1.2,
+        window: int = 2000
+    ):
+        """
+        初始化延迟直方图
+
+        Args:
+            min_seconds: 最小桶边界（秒）
+            max_seconds: 最大桶边界（秒）
+            growth: 相邻桶边界倍数
+            window: 衰减窗口（样本数）
+        """
+        size = int(math.ceil(math.log(max_seconds / min_seconds, growth))) + 1
+        self._bounds: List[float] = [min_seconds * growth ** i for i in range(size)]
+        self._counts: List[float] = [0.0] * (size + 1)
+        self._total = 0.0
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """记录一次请求耗时"""
+        index = bisect.bisect_left(self._bounds, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._total += 1
+            if self._total > self._window:
+                self._counts = [c / 2 for c in self._counts]
+                self._total /= 2
+
+    @property
+    def count(self) -> int:
+        """当前有效样本数（衰减后）"""
+        return int(self._total)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        估算延迟分位数
+
+        Args:
+            p: 百分位（0-100）
+
+        Returns:
+            分位数对应的桶上边界（秒），无样本时返回 None
+        """
+        with self._lock:
+            if self._total <= 0:
+                return None
+            target = self._total * min(max(p, 0.0), 100.0) / 100.0
+            cumulative = 0.0
+            for index, count in enumerate(self._counts):
+                cumulative += count
+                if count and cumulative >= target:
+                    return self._bounds[min(index, len(self._bounds) - 1)]
+            return self._bounds[-1]
+
+    def snapshot(self) -> Dict:
+        """获取统计摘要"""
+        return {
+            'samples': self.count,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+_histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_latency_histogram(provider: str, model: str) -> LatencyHistogram:
+    """获取进程内共享的延迟直方图（按提供商和模型区分）"""
+    key = (provider, model)
+    with _histograms_lock:
+        if key not in _histograms:
+            _histograms[key] = LatencyHistogram()
+        return _histograms[key]
+
+
+def latency_snapshot() -> Dict[str, Dict]:
+    """获取所有接口的延迟统计"""
+    with _histograms_lock:
+        items = list(_histograms.items())
+    return {f"{provider}/{model}": h.snapshot() for (provider, model), h in items}
@@ -0,0 +1,176 @@
+"""
+AI 分析前的本地预筛（关键词 + 新闻源权重 + 热榜排名的线性打分）
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+# 线性模型特征顺序
+FEATURES = ('keyword', 'source', 'rank', 'content', 'duplicate')
+
+DEFAULT_WEIGHTS = {
+    'bias': 0.3,
+    'keyword': 0.4,
+    'source': 0.5,
+    'rank': 0.3,
+    'content': 0.1,
+    'duplicate': -0.5,
+}
+
+# 关键词特征最多累计的组数，避免长标题堆砌关键词
+MAX_KEYWORD_GROUPS = 3
+# 热榜排名特征归零的名次
+RANK_HORIZON = 50
+
+
+@dataclass
+class KeywordGroup:
+    """关键词组：命中任一普通词且包含全部必须词时匹配"""
+    words: List[str] = field(default_factory=list)
+    required: List[str] = field(default_factory=list)
+    weight: float = 1.0
+
+    def matches(self, text: str) -> bool:
+        if self.words and not any(w in text for w in self.words):
+            return False
+        return all(w in text for w in self.required)
+
+
+def load_keyword_file(path: str):
+    """
+    读取 frequency_words 格式的关键词文件
+
+    空行分隔关键词组；普通行为关键词，"+" 开头为必须词，"!" 开头为过滤词
+    （命中即视为噪音）；普通词可用 "词@权重" 指定组权重（取组内最大值）。
+
+    Returns:
+        (关键词组列表, 过滤词列表)，文件不存在时返回空列表
+    """
+    groups: List[KeywordGroup] = []
+    filters: List[str] = []
+    if not path or not os.path.exists(path):
+        logger.info(f"未找到关键词文件 {path}，预筛不使用关键词特征")
+        return groups, filters
+
+    current = KeywordGroup(weight=0.0)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines() + ['']
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            if current.words or current.required:
+                current.weight = current.weight or 1.0
+                groups.append(current)
+            if not line:
+                current = KeywordGroup(weight=0.0)
+            continue
+        if line.startswith('!'):
+            filters.append(line[1:].strip().lower())
+        elif line.startswith('+'):
+            current.required.append(line[1:].strip().lower())
+        else:
+            word, _, weight = line.partition('@')
+            current.words.append(word.strip().lower())
+            try:
+                current.weight = max(current.weight, float(weight)) if weight else current.weight
+            except ValueError:
+                pass
+    return groups, filters
+
+
+class ArticleScorer:
+    """
+    文章重要度打分
+
+    特征：命中关键词组权重和、新闻源权重偏移、热榜排名、是否有摘要/正文、
+    是否为近期重复标题；重要度为特征的线性组合。命中过滤词的文章重要度为 0。
+    """
+
+    def __init__(
+        self,
+        keyword_groups: Sequence[KeywordGroup] = (),
+        filter_words: Sequence[str] = (),
+        source_weights: Optional[Dict[str, float]] = None,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        初始化打分器
+
+        Args:
+            keyword_groups: 关键词组
+            filter_words: 过滤词
+            source_weights: 新闻源权重（默认 1.0）
+            weights: 线性模型权重，缺省项使用 DEFAULT_WEIGHTS
+        """
+        self.keyword_groups = list(keyword_groups)
+        self.filter_words = list(filter_words)
+        self.source_weights = source_weights or {}
+        merged = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.bias = merged['bias']
+        self.weights = np.array([merged[name] for name in FEATURES], dtype=np.float64)
+
+    @classmethod
+    def from_config(cls, prefilter_config) -> 'ArticleScorer':
+        """根据 PrefilterConfig 创建打分器"""
+        groups, filters = load_keyword_file(prefilter_config.keywords_file)
+        return cls(
+            keyword_groups=groups,
+            filter_words=filters,
+            source_weights=prefilter_config.source_weights,
+            weights=prefilter_config.weights
+        )
+
+    def features(self, articles: Sequence[Dict], duplicates: Sequence[bool] = ()) -> np.ndarray:
+        """构建特征矩阵（文章数 x 特征数）"""
+        matrix = np.zeros((len(articles), len(FEATURES)), dtype=np.float64)
+        for i, article in enumerate(articles):
+            text = f"{article.get('title') or ''} {article.get('summary') or ''}".lower()
+            weights = sorted(
+                (g.weight for g in self.keyword_groups if g.matches(text)),
+                reverse=True
+            )
+            matrix[i, 0] = sum(weights[:MAX_KEYWORD_GROUPS])
+            matrix[i, 1] = self.source_weights.get(article.get('source'), 1.0) - 1.0
+            rank = article.get('hot_rank')
+            matrix[i, 2] = max(0.0, 1 - (rank - 1) / RANK_HORIZON) if rank else 0.0
+            matrix[i, 3] = 1.0 if (article.get('summary') or article.get('content')) else 0.0
+            matrix[i, 4] = 1.0 if i < len(duplicates) and duplicates[i] else 0.0
+        return matrix
+
+    def score_batch(self, articles: Sequence[Dict], duplicates: Sequence[bool] = ()) -> np.ndarray:
+        """
+        批量计算重要度
+
+        Args:
+            articles: 文章字典列表（title, summary, content, source, hot_rank）
+            duplicates: 每篇文章是否为近期重复标题
+
+        Returns:
+            重要度数组（不小于 0）
+        """
+        if not articles:
+            return np.zeros(0)
+        scores = self.bias + self.features(articles, duplicates) @ self.weights
+        if self.filter_words:
+            for i, article in enumerate(articles):
+                title = (article.get('title') or '').lower()
+                if any(w in title for w in self.filter_words):
+                    scores[i] = 0.0
+        return np.clip(scores, 0.0, None)
+
+    @staticmethod
+    def local_label(importance: Optional[float], min_score: float) -> Dict:
+        """未交给 AI 分析的文章的本地标签（与 AI 分析结果字段一致）"""
+        return {
+            'analysis_type': 'local',
+            'analysis_content': (
+                f"本地预筛：重要度 {importance or 0:.2f} 低于阈值 {min_score:.2f}，"
+                "判定为重复或低价值内容，未进行 AI 分析"
+            ),
+            'sentiment': None,
+            'sentiment_score': None,
+            'key_points': '[]',
+        }
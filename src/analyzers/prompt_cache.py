@@ -0,0 +1,79 @@
+"""
+提供商提示词缓存（前缀缓存）命中统计
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+
+def cache_usage(provider: str, usage) -> Tuple[int, int, int]:
+    """
+    从响应的 usage 中提取输入 token 数
+
+    Returns:
+        (输入 token 总数, 命中缓存的 token 数, 写入缓存的 token 数)
+    """
+    if usage is None:
+        return 0, 0, 0
+    if provider == 'anthropic':
+        # input_tokens 不含缓存读写部分
+        cached = getattr(usage, 'cache_read_input_tokens', None) or 0
+        written = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        return (usage.input_tokens or 0) + cached + written, cached, written
+
+    # OpenAI 兼容接口：prompt_tokens 包含命中缓存的部分
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached = getattr(details, 'cached_tokens', None) or 0
+    # DeepSeek 在 usage 中单独返回缓存命中数
+    cached = cached or getattr(usage, 'prompt_cache_hit_tokens', None) or 0
+    return usage.prompt_tokens or 0, cached, 0
+
+
+class PromptCacheStats:
+    """单个接口的提示词缓存统计（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.cache_write_tokens = 0
+
+    def record(self, input_tokens: int, cached_tokens: int, cache_write_tokens: int = 0):
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += input_tokens
+            self.cached_tokens += cached_tokens
+            self.cache_write_tokens += cache_write_tokens
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            hit_rate: Optional[float] = None
+            if self.input_tokens:
+                hit_rate = round(self.cached_tokens / self.input_tokens, 4)
+            return {
+                'requests': self.requests,
+                'input_tokens': self.input_tokens,
+                'cached_tokens': self.cached_tokens,
+                'cache_write_tokens': self.cache_write_tokens,
+                'cached_ratio': hit_rate,
+            }
+
+
+_stats: Dict[Tuple[str, str], PromptCacheStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_prompt_cache_stats(provider: str, model: str) -> PromptCacheStats:
+    """获取进程内共享的提示词缓存统计（按提供商和模型区分）"""
+    key = (provider, model)
+    with _stats_lock:
+        if key not in _stats:
+            _stats[key] = PromptCacheStats()
+        return _stats[key]
+
+
+def prompt_cache_snapshot() -> Dict[str, Dict]:
+    """获取所有接口的提示词缓存统计"""
+    with _stats_lock:
+        items = list(_stats.items())
+    return {f"{provider}/{model}": s.snapshot() for (provider, model), s in items}
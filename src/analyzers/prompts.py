@@ -0,0 +1,214 @@
+"""
+AI 分析提示词模板
+
+每个提示词拆分为固定的系统前缀（任务说明和返回格式，同一模板的所有请求完全相同）
+和每次请求变化的用户内容（文章文本）。提供商可以复用相同前缀的计算结果：
+Anthropic 通过 cache_control 标记缓存前缀，OpenAI 等自动缓存相同的前缀。
+提供商只缓存足够长（通常至少 1024 token）的前缀，较短的前缀请求照常处理，只是不命中缓存；
+前缀不为凑长度而填充内容，缓存只在打包分析、摘要等前缀本身足够长的请求上生效。
+修改任何模板后需递增 PROMPT_VERSION，使旧的结果缓存失效。
+"""
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from src.analyzers.tokens import estimate_tokens, truncate_to_tokens
+
+# 提示词模板版本，修改提示词后需递增，使旧的缓存结果失效
+PROMPT_VERSION = "5"
+
+# 单篇文章分析提示词的默认估算 token 上限（见 AnalysisConfig.prompt_token_budget）
+DEFAULT_TOKEN_BUDGET = 1500
+# 每篇文章至少保留的 token 数（预算过小时仍保留标题）
+MIN_ARTICLE_TOKENS = 64
+# 标题 / 摘要 / 内容等标签占用的 token 数
+ARTICLE_LABEL_TOKENS = 16
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """提示词：固定前缀（system）+ 每次请求变化的内容（user）"""
+    system: str
+    user: str
+
+    @property
+    def text(self) -> str:
+        """完整文本（用于结果缓存键和 token 估算）"""
+        return f"{self.system}\n\n{self.user}"
+
+
+def openai_messages(prompt: Prompt) -> List[Dict]:
+    """OpenAI 兼容接口的消息列表（固定前缀在前，便于自动前缀缓存）"""
+    return [
+        {'role': 'system', 'content': prompt.system},
+        {'role': 'user', 'content': prompt.user},
+    ]
+
+
+def anthropic_system(prompt: Prompt, cache: bool = True) -> List[Dict]:
+    """Anthropic system 参数，cache 为 True 时标记固定前缀可缓存"""
+    block = {'type': 'text', 'text': prompt.system}
+    if cache:
+        block['cache_control'] = {'type': 'ephemeral'}
+    return [block]
+
+
+SUMMARY_JSON_FORMAT = """请以 JSON 格式返回，格式如下：
+{
+    "trend_analysis": "整体趋势分析",
+    "hot_topics": ["话题1", "话题2", "话题3"],
+    "key_events": "重要事件总结",
+    "impact_prediction": "影响和趋势预测"
+}"""
+
+SINGLE_ANALYSIS_SYSTEM = """你是新闻分析助手。请对用户提供的新闻进行分析，并提供：
+1. 简要分析（200字以内）
+2. 情感倾向（positive/negative/neutral）
+3. 关键要点（3-5个要点，JSON数组格式）
+4. 重要性评分（1-10分）
+
+请以 JSON 格式返回，格式如下：
+{
+    "analysis": "分析内容",
+    "sentiment": "positive/negative/neutral",
+    "sentiment_score": 0.0-1.0,
+    "key_points": ["要点1", "要点2", "要点3"],
+    "importance_score": 1-10
+}"""
+
+PACKED_ANALYSIS_SYSTEM = """你是新闻分析助手。请逐条分析用户提供的新闻（每条以 [编号] 开头），对每条新闻提供：
+1. 简要分析（100字以内）
+2. 情感倾向（positive/negative/neutral）
+3. 关键要点（1-3个要点，JSON数组格式）
+4. 重要性评分（1-10分）
+
+请只返回一个 JSON 数组，每条新闻对应一个对象，id 必须与新闻前的编号一致：
+[
+    {
+        "id": 编号,
+        "analysis": "分析内容",
+        "sentiment": "positive/negative/neutral",
+        "sentiment_score": 0.0-1.0,
+        "key_points": ["要点1", "要点2"],
+        "importance_score": 1-10
+    }
+]"""
+
+BATCH_SUMMARY_SYSTEM = f"""你是新闻分析助手。请对用户提供的新闻列表进行综合分析，提供：
+1. 整体趋势分析（300字以内）
+2. 主要热点话题（3-5个）
+3. 重要事件总结
+4. 可能的影响和趋势预测
+
+{SUMMARY_JSON_FORMAT}"""
+
+CHUNK_SUMMARY_SYSTEM = f"""你是新闻分析助手。请对用户提供的新闻列表进行综合分析（同话题报道数越多越重要），提供：
+1. 整体趋势分析（200字以内）
+2. 主要热点话题（3-5个）
+3. 重要事件总结
+4. 可能的影响和趋势预测
+
+{SUMMARY_JSON_FORMAT}"""
+
+MERGE_SUMMARY_SYSTEM = f"""你是新闻分析助手。用户会提供同一时间段内的新闻分为若干部分得到的分析结果，
+请将它们合并为一份整体分析：合并重复的话题和事件，按重要性保留 3-5 个热点话题，
+整体趋势分析控制在 300 字以内。
+
+{SUMMARY_JSON_FORMAT}"""
+
+TRANSLATION_SYSTEM = """你是新闻翻译助手。请把用户提供的每条文本（以 [编号] 开头）翻译为{language}：
+准确、简洁，保留人名、机构名和数字，不要添加解释。
+
+请只返回一个 JSON 数组，每条文本对应一个对象，id 必须与文本前的编号一致：
+[
+    {{"id": 编号, "text": "译文"}}
+]"""
+
+
+def _fit_article(article: Dict, budget: int) -> Tuple[str, str, str]:
+    """
+    按 token 预算截断文章的标题、摘要和正文
+
+    优先保留标题；有正文时摘要最多占剩余预算的一半，其余留给正文。
+    """
+    title = truncate_to_tokens(article.get('title') or '', budget)
+    remaining = budget - estimate_tokens(title)
+    summary = article.get('summary') or ''
+    content = article.get('content') or ''
+    if content:
+        summary = truncate_to_tokens(summary, remaining // 2)
+    else:
+        summary = truncate_to_tokens(summary, remaining)
+    content = truncate_to_tokens(content, remaining - estimate_tokens(summary))
+    return title, summary, content
+
+
+def single_analysis_prompt(article: Dict, token_budget: int = DEFAULT_TOKEN_BUDGET) -> Prompt:
+    """单篇文章分析，文章文本按 token_budget（整个提示词的估算 token 上限）截断"""
+    fixed = estimate_tokens(SINGLE_ANALYSIS_SYSTEM) + ARTICLE_LABEL_TOKENS
+    title, summary, content = _fit_article(article, max(MIN_ARTICLE_TOKENS, token_budget - fixed))
+    text = f"标题: {title}\n"
+    if summary:
+        text += f"摘要: {summary}\n"
+    if content:
+        text += f"内容: {content}\n"
+    return Prompt(SINGLE_ANALYSIS_SYSTEM, f"新闻内容：\n{text}")
+
+
+def packed_analysis_prompt(articles: List[Dict], token_budget: int = DEFAULT_TOKEN_BUDGET) -> Prompt:
+    """多篇文章打包分析（每篇以 [id] 标注），扣除固定前缀后的预算按篇均分"""
+    fixed = estimate_tokens(PACKED_ANALYSIS_SYSTEM)
+    per_article = (token_budget - fixed) // max(1, len(articles)) - ARTICLE_LABEL_TOKENS
+    per_article = max(MIN_ARTICLE_TOKENS, per_article)
+    text = ""
+    for article in articles:
+        title, summary, content = _fit_article(article, per_article)
+        text += f"\n[{article['id']}] 标题: {title}\n"
+        if summary:
+            text += f"    摘要: {summary}\n"
+        if content:
+            text += f"    内容: {content}\n"
+    return Prompt(PACKED_ANALYSIS_SYSTEM, f"新闻列表（共 {len(articles)} 条）：\n{text}")
+
+
+def batch_summary_prompt(articles: List[Dict]) -> Prompt:
+    """多篇文章综合分析（最多列出 20 篇）"""
+    text = ""
+    for i, article in enumerate(articles[:20], 1):
+        text += f"\n{i}. {article.get('title', '无标题')}\n"
+        if article.get('summary'):
+            text += f"   摘要: {article.get('summary', '')[:200]}\n"
+    return Prompt(BATCH_SUMMARY_SYSTEM, f"新闻列表（共 {len(articles)} 篇）：\n{text}")
+
+
+def chunk_summary_prompt(articles: List[Dict]) -> Prompt:
+    """分块汇总（map 阶段），代表文章的 cluster_size 表示同话题报道数"""
+    text = ""
+    article_count = 0
+    for i, article in enumerate(articles, 1):
+        cluster_size = article.get('cluster_size', 1)
+        article_count += cluster_size
+        text += f"\n{i}. [{article.get('source') or '未知来源'}] {article.get('title', '无标题')}"
+        if cluster_size > 1:
+            text += f"（同话题报道 {cluster_size} 篇）"
+        text += "\n"
+        if article.get('summary'):
+            text += f"   摘要: {article['summary'][:200]}\n"
+    return Prompt(CHUNK_SUMMARY_SYSTEM, f"新闻列表（共 {article_count} 篇）：\n{text}")
+
+
+def merge_summary_prompt(partials: List[Dict], article_count: int) -> Prompt:
+    """合并部分汇总（reduce 阶段）"""
+    text = ""
+    for i, partial in enumerate(partials, 1):
+        text += f"\n### 第 {i} 部分\n{json.dumps(partial, ensure_ascii=False)}\n"
+    return Prompt(
+        MERGE_SUMMARY_SYSTEM,
+        f"以下是 {article_count} 篇新闻分 {len(partials)} 部分得到的分析结果：\n{text}"
+    )
+
+
+def translation_prompt(texts: List[str], language: str) -> Prompt:
+    """批量翻译（每条以 [序号] 标注，序号从 1 开始），同一目标语言的前缀相同"""
+    text = "".join(f"\n[{i}] {item}\n" for i, item in enumerate(texts, 1))
+    return Prompt(TRANSLATION_SYSTEM.format(language=language), f"待翻译文本（共 {len(texts)} 条）：\n{text}")
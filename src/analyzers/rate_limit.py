@@ -0,0 +1,265 @@
+"""
+LLM 请求限流与重试
+"""
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+T = TypeVar('T')
+
+# 可重试的 HTTP 状态码
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    解析限流重置时间，返回距现在的秒数
+
+    支持 OpenAI / DeepSeek 的时长格式（"1s"、"6m0s"、"20ms"）、
+    Anthropic 的 RFC 3339 时间戳以及纯数字秒数。
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    matches = _DURATION_PATTERN.findall(value)
+    if matches and ''.join(n + u for n, u in matches) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in matches)
+    try:
+        reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+    except ValueError:
+        return None
+
+
+def _header(headers, *names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class _Bucket:
+    """令牌桶（容量为每分钟配额）"""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float, factor: float):
+        rate = self.per_minute * factor / 60.0
+        self.level = min(float(self.per_minute), self.level + (now - self.updated) * rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, factor: float) -> float:
+        # 单次请求超过整桶容量时，等到桶满即可放行，避免永久阻塞
+        amount = min(amount, self.per_minute)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / (self.per_minute * factor / 60.0)
+
+
+class RateLimiter:
+    """
+    单个 (提供商, 模型) 的自适应限流器
+
+    按每分钟请求数和每分钟 token 数两个令牌桶放行请求；
+    根据响应中的限流头同步剩余配额，收到 429 / retry-after 时暂停并降低速率
+    （乘性减），之后每次成功逐步恢复（加性增），使吞吐稳定在配额附近。
+    配额为 0 表示不限制该维度。
+    """
+
+    MIN_FACTOR = 0.1
+    DECREASE = 0.5
+    INCREASE = 0.05
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self._lock = threading.Lock()
+        self._requests = _Bucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute) if tokens_per_minute else None
+        self._factor = 1.0
+        self._blocked_until = 0.0
+
+    def acquire(self, tokens: int = 0):
+        """阻塞直到可以发送一个预计消耗 tokens 的请求，并扣除配额"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(0.0, self._blocked_until - now)
+                for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                    if bucket is not None:
+                        bucket.refill(now, self._factor)
+                        wait = max(wait, bucket.wait_time(amount, self._factor))
+                if wait <= 0:
+                    if self._requests is not None:
+                        self._requests.level -= 1
+                    if self._tokens is not None:
+                        self._tokens.level -= tokens
+                    return
+            time.sleep(min(wait, 5.0))
+
+    def settle(self, estimated: int, actual: Optional[int]):
+        """用实际消耗修正预估扣除的 token，并在成功后逐步恢复速率"""
+        with self._lock:
+            if self._tokens is not None and actual is not None:
+                self._tokens.level = min(
+                    float(self._tokens.per_minute),
+                    self._tokens.level + estimated - actual
+                )
+            self._factor = min(1.0, self._factor + self.INCREASE)
+
+    def update_from_headers(self, headers):
+        """根据 OpenAI / DeepSeek / Anthropic 的限流响应头同步剩余配额"""
+        if not headers:
+            return
+        remaining_requests = _header(
+            headers, 'x-ratelimit-remaining-requests', 'anthropic-ratelimit-requests-remaining'
+        )
+        reset_requests = _header(
+            headers, 'x-ratelimit-reset-requests', 'anthropic-ratelimit-requests-reset'
+        )
+        remaining_tokens = _header(
+            headers, 'x-ratelimit-remaining-tokens', 'anthropic-ratelimit-tokens-remaining'
+        )
+        reset_tokens = _header(
+            headers, 'x-ratelimit-reset-tokens', 'anthropic-ratelimit-tokens-reset'
+        )
+
+        with self._lock:
+            now = time.monotonic()
+            for bucket, remaining, reset in (
+                (self._requests, remaining_requests, reset_requests),
+                (self._tokens, remaining_tokens, reset_tokens),
+            ):
+                try:
+                    remaining = float(remaining) if remaining is not None else None
+                except ValueError:
+                    remaining = None
+                if remaining is None:
+                    continue
+                if bucket is not None:
+                    bucket.refill(now, self._factor)
+                    bucket.level = min(bucket.level, remaining)
+                if remaining <= 0:
+                    # 配额耗尽：暂停到重置时间
+                    delay = parse_reset(reset) or 1.0
+                    self._blocked_until = max(self._blocked_until, now + delay)
+
+    def on_throttled(self, retry_after: Optional[float]):
+        """收到限流错误：暂停 retry_after 秒并降低速率"""
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._factor = max(self.MIN_FACTOR, self._factor * self.DECREASE)
+            logger.warning(
+                f"触发 AI 接口限流，速率降至 {self._factor:.0%}"
+                + (f"，暂停 {retry_after:.1f} 秒" if retry_after else "")
+            )
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    provider: str,
+    model: str,
+    requests_per_minute: int = 0,
+    tokens_per_minute: int = 0
+) -> RateLimiter:
+    """获取进程内共享的限流器（同一提供商和模型的所有分析器共用配额）"""
+    key = (provider, model)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+        return _limiters[key]
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """提取 SDK 异常中的 HTTP 状态码"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    return status
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """提取 SDK 异常响应中的 retry-after（秒）"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    return parse_reset(headers.get('retry-after'))
+
+
+def is_transient(error: Exception) -> bool:
+    """判断是否为可重试的临时错误（超时、连接失败、429、5xx）"""
+    status = error_status(error)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES
+    # OpenAI / Anthropic SDK 的 APIConnectionError、APITimeoutError 没有状态码
+    name = type(error).__name__
+    return name in ('APIConnectionError', 'APITimeoutError') or isinstance(
+        error, (TimeoutError, ConnectionError)
+    )
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    max_retries: int = 4,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    on_error: Optional[Callable[[Exception], None]] = None
+) -> T:
+    """
+    执行 func，临时错误时按带抖动的指数退避重试
+
+    等待时间为 [0, min(max_delay, base_delay * 2^n)] 内的随机值（full jitter），
+    如果响应给出了 retry-after 则至少等待该时长。
+
+    Args:
+        func: 待执行函数
+        max_retries: 最大重试次数
+        base_delay: 退避基数（秒）
+        max_delay: 单次最大等待（秒）
+        on_error: 每次失败时的回调（用于更新限流器）
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if on_error is not None:
+                on_error(e)
+            if attempt >= max_retries or not is_transient(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            retry_after = retry_after_seconds(e)
+            if retry_after:
+                delay = max(delay, min(retry_after, max_delay))
+            attempt += 1
+            logger.warning(f"AI 请求失败（{e}），{delay:.1f} 秒后第 {attempt} 次重试")
+            time.sleep(delay)
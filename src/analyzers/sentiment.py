@@ -0,0 +1,166 @@
+"""
+基于情感词典的本地情感打分（中英文，NumPy 批量计算）
+"""
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+# 内置情感词典：词 -> 极性权重（正为积极，负为消极）
+POSITIVE_WORDS = {
+    # 中文
+    '增长': 1.0, '上涨': 1.0, '大涨': 1.5, '突破': 1.0, '创新高': 1.5, '利好': 1.5,
+    '成功': 1.0, '获胜': 1.0, '夺冠': 1.5, '胜利': 1.0, '提升': 0.8, '改善': 0.8,
+    '复苏': 1.0, '回暖': 1.0, '繁荣': 1.0, '盈利': 1.0, '扭亏': 1.0,
+    '合作': 0.6, '签约': 0.6, '支持': 0.6, '优化': 0.6, '稳定': 0.5, '稳健': 0.6,
+    '领先': 0.8, '喜讯': 1.5, '好评': 1.0, '点赞': 1.0, '庆祝': 1.0, '获奖': 1.0,
+    '脱险': 1.0, '康复': 1.0, '和平': 0.8, '达成': 0.8, '降价': 0.5,
+    '减税': 0.8, '惠民': 1.0, '降准': 0.6, '升级': 0.6, '创新': 0.6,
+    # 英文
+    'growth': 1.0, 'gain': 0.8, 'gains': 0.8, 'surge': 1.2, 'surges': 1.2, 'rally': 1.0,
+    'record high': 1.5, 'success': 1.0, 'successful': 1.0, 'win': 1.0, 'wins': 1.0,
+    'victory': 1.0, 'improve': 0.8, 'improves': 0.8, 'recovery': 1.0, 'boost': 1.0,
+    'profit': 1.0, 'breakthrough': 1.2, 'agreement': 0.6, 'deal': 0.5, 'peace': 0.8,
+    'rescued': 1.2, 'approve': 0.6, 'approved': 0.6, 'beat': 0.6, 'strong': 0.6,
+    'optimistic': 1.0, 'upgrade': 0.6, 'celebrate': 1.0,
+}
+
+NEGATIVE_WORDS = {
+    # 中文
+    '下跌': 1.0, '大跌': 1.5, '暴跌': 2.0, '跌破': 1.2, '亏损': 1.2, '下滑': 1.0,
+    '衰退': 1.2, '危机': 1.5, '风险': 0.6, '失败': 1.0, '事故': 1.5, '爆炸': 1.8,
+    '火灾': 1.5, '地震': 1.5, '台风': 1.0, '洪水': 1.5, '死亡': 2.0, '遇难': 2.0,
+    '身亡': 2.0, '受伤': 1.2, '伤亡': 2.0, '冲突': 1.2, '战争': 1.8, '袭击': 1.8,
+    '制裁': 1.0, '违规': 1.0, '违法': 1.2, '诈骗': 1.5, '被捕': 1.0, '调查': 0.5,
+    '处罚': 1.0, '罚款': 1.0, '裁员': 1.2, '破产': 1.8, '倒闭': 1.5, '暴雷': 1.8,
+    '通胀': 0.8, '停产': 1.0, '召回': 0.8, '污染': 1.0, '疫情': 1.0, '抗议': 1.0,
+    '争议': 0.6, '质疑': 0.6, '谴责': 1.0, '下调': 0.5, '警告': 1.0, '崩盘': 2.0,
+    # 英文
+    'decline': 1.0, 'declines': 1.0, 'fall': 0.8, 'falls': 0.8, 'plunge': 1.5,
+    'plunges': 1.5, 'crash': 1.8, 'loss': 1.0, 'losses': 1.0, 'recession': 1.5,
+    'crisis': 1.5, 'risk': 0.6, 'fail': 1.0, 'failed': 1.0, 'failure': 1.0,
+    'accident': 1.5, 'explosion': 1.8, 'fire': 1.0, 'earthquake': 1.5, 'flood': 1.5,
+    'dead': 2.0, 'death': 2.0, 'deaths': 2.0, 'killed': 2.0, 'injured': 1.2,
+    'war': 1.8, 'attack': 1.8, 'conflict': 1.2, 'sanction': 1.0, 'sanctions': 1.0,
+    'fraud': 1.5, 'arrested': 1.0, 'lawsuit': 1.0, 'fined': 1.0,
+    'layoffs': 1.2, 'bankruptcy': 1.8, 'inflation': 0.8, 'recall': 0.8,
+    'protest': 1.0, 'warning': 1.0, 'warns': 1.0, 'slump': 1.2, 'weak': 0.6,
+}
+
+# 否定词：紧邻情感词之前时反转极性
+CJK_NEGATORS = ('不', '未', '没有', '无', '非')
+ENGLISH_NEGATORS = ('not', 'no', 'never')
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+# 情感标签阈值（分数范围 0-1，0.5 为中性，与 AI 分析结果一致）
+POSITIVE_THRESHOLD = 0.6
+NEGATIVE_THRESHOLD = 0.4
+
+
+def load_lexicon_file(path: str) -> Dict[str, float]:
+    """
+    读取自定义情感词典（每行 "词<TAB>权重"，权重为正表示积极、为负表示消极）
+    """
+    lexicon: Dict[str, float] = {}
+    if not path:
+        return lexicon
+    if not os.path.exists(path):
+        logger.warning(f"情感词典文件不存在: {path}")
+        return lexicon
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            word, _, weight = line.partition('\t')
+            try:
+                lexicon[word.strip().lower()] = float(weight)
+            except ValueError:
+                continue
+    return lexicon
+
+
+class LexiconSentimentScorer:
+    """
+    词典情感打分器
+
+    对一批文本用 np.char.count 逐词统计出现次数，得到 (文本数 x 词数) 计数矩阵，
+    与极性向量相乘得到原始分；紧跟否定词的情感词计为相反极性。
+    中文词直接子串匹配，英文词按整词匹配。
+    原始分经 tanh 压缩到 0-1（0.5 为中性）。
+    """
+
+    def __init__(self, extra_lexicon: Optional[Dict[str, float]] = None):
+        """
+        初始化打分器
+
+        Args:
+            extra_lexicon: 追加 / 覆盖内置词典的词及权重
+        """
+        lexicon = dict(POSITIVE_WORDS)
+        lexicon.update({word: -weight for word, weight in NEGATIVE_WORDS.items()})
+        lexicon.update(extra_lexicon or {})
+        words = sorted(lexicon)
+        self.polarity = np.array([lexicon[w] for w in words], dtype=np.float64)
+        # 英文词按整词匹配（文本规范化后前后补空格），避免 "win" 命中 "window"
+        self.patterns = [self._pattern(w) for w in words]
+        self.negated_patterns = [
+            [f" {n}{p}" for n in ENGLISH_NEGATORS] if p.startswith(' ')
+            else [n + p for n in CJK_NEGATORS]
+            for p in self.patterns
+        ]
+
+    @staticmethod
+    def _pattern(word: str) -> str:
+        return f" {word} " if word.isascii() else word
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """转小写、展开 n't、标点合并为空格并在首尾补空格"""
+        text = (text or '').lower().replace("n't", " not")
+        return f" {_NON_WORD.sub(' ', text).strip()} "
+
+    @classmethod
+    def from_config(cls, sentiment_config) -> 'LexiconSentimentScorer':
+        """根据 SentimentConfig 创建打分器"""
+        return cls(load_lexicon_file(sentiment_config.lexicon_file))
+
+    def raw_scores(self, texts: Sequence[str]) -> np.ndarray:
+        """计算原始情感分（积极词权重和 - 消极词权重和，否定词反转）"""
+        if not len(texts):
+            return np.zeros(0)
+        array = np.array([self.normalize(t) for t in texts], dtype=str)
+        counts = np.empty((len(array), len(self.patterns)), dtype=np.float64)
+        negated = np.zeros_like(counts)
+        for j, pattern in enumerate(self.patterns):
+            counts[:, j] = np.char.count(array, pattern)
+            for negated_pattern in self.negated_patterns[j]:
+                negated[:, j] += np.char.count(array, negated_pattern)
+        # 否定形式先从正常计数中扣除，再按相反极性计入
+        return (counts - 2 * np.minimum(negated, counts)) @ self.polarity
+
+    def score_batch(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """
+        批量计算情感
+
+        Args:
+            texts: 文本列表（通常为标题 + 摘要）
+
+        Returns:
+            (情感标签, 情感分数) 列表，标签为 positive / negative / neutral，分数范围 0-1
+        """
+        scores = 0.5 + 0.5 * np.tanh(self.raw_scores(texts) / 2)
+        labels = np.where(
+            scores >= POSITIVE_THRESHOLD, 'positive',
+            np.where(scores <= NEGATIVE_THRESHOLD, 'negative', 'neutral')
+        )
+        return [(str(label), round(float(score), 4)) for label, score in zip(labels, scores)]
+
+    def score_articles(self, articles: Sequence[Dict]) -> List[Tuple[str, float]]:
+        """对文章字典批量打分（使用标题和摘要）"""
+        return self.score_batch([
+            f"{a.get('title') or ''} {(a.get('summary') or '')[:500]}" for a in articles
+        ])
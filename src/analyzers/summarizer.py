@@ -0,0 +1,205 @@
+"""
+分层汇总（map-reduce）
+"""
+import hashlib
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.analyzers.clustering import representatives
+from src.analyzers.engine import ConcurrentAnalysisEngine
+from src.analyzers.prompts import PROMPT_VERSION
+from src.core.exceptions import AnalysisException
+
+
+class ChunkStore:
+    """分块汇总结果的持久化接口（由服务层实现），键为块内容的哈希"""
+
+    def load(self, keys: List[str]) -> Dict[str, Tuple[int, Dict]]:
+        """批量读取，返回 {键: (覆盖文章数, 部分汇总)}，不存在的键不在结果中"""
+        raise NotImplementedError
+
+    def save(self, entries: Dict[str, Tuple[int, Dict]]):
+        """批量保存 {键: (覆盖文章数, 部分汇总)}"""
+        raise NotImplementedError
+
+
+class MapReduceSummarizer:
+    """
+    分层汇总器
+
+    文章按传入顺序切成固定大小的块并行汇总（map），再按 fan_in 个一组逐层合并（reduce），
+    LLM 调用轮数为 1 + log_{fan_in}(块数)，不随文章量线性增长。
+    提供 chunk_store 时，每块的汇总结果按块内容（文章和报道数）的哈希保存，
+    内容相同的块（重新汇总同一天、失败后重试）直接复用，不再请求模型；
+    聚类后代表文章随新增文章变化，变化的块会重新汇总。
+    任一块或合并失败时抛出 AnalysisException（已成功的块先保存），不生成缺少部分文章的汇总。
+    """
+
+    def __init__(
+        self,
+        analyzer,
+        engine: ConcurrentAnalysisEngine,
+        chunk_size: int = 40,
+        fan_in: int = 8,
+        max_topics: int = 0,
+        chunk_store: Optional[ChunkStore] = None
+    ):
+        """
+        初始化分层汇总器
+
+        Args:
+            analyzer: AI 分析器（需提供 summarize_chunk / merge_summaries）
+            engine: 并发分析引擎
+            chunk_size: 每块文章数
+            fan_in: 每次合并的部分汇总数
+            max_topics: 文章数超过该值时先本地聚类，只汇总各话题代表文章，0 表示不聚类
+            chunk_store: 分块汇总结果的持久化存储，None 表示不复用
+        """
+        self.analyzer = analyzer
+        self.engine = engine
+        self.chunk_size = max(1, chunk_size)
+        self.fan_in = max(2, fan_in)
+        self.max_topics = max_topics
+        self.chunk_store = chunk_store
+
+    def summarize(self, articles: List[Dict]) -> Optional[Dict]:
+        """
+        汇总全部文章
+
+        Args:
+            articles: 文章列表（id, title, summary, source），应按稳定顺序排列
+
+        Returns:
+            {'summary_content': JSON 字符串, 'article_count': 文章数}，没有文章时返回 None
+
+        Raises:
+            AnalysisException: 任一块或合并失败
+        """
+        if not articles:
+            return None
+
+        if self.max_topics:
+            items = representatives(articles, self.max_topics)
+            if items:
+                logger.info(f"{len(articles)} 篇文章聚类为 {len(items)} 个话题")
+                articles = items
+
+        chunks = [
+            articles[i:i + self.chunk_size]
+            for i in range(0, len(articles), self.chunk_size)
+        ]
+        keys = [self.chunk_key(chunk) for chunk in chunks]
+        stored = self.chunk_store.load(keys) if self.chunk_store is not None else {}
+        todo = [i for i, key in enumerate(keys) if key not in stored]
+        if stored:
+            logger.info(f"复用 {len(chunks) - len(todo)}/{len(chunks)} 个已保存的分块汇总")
+
+        # 部分汇总带上覆盖的文章数；成功的块即使其他块失败也先保存，重试时复用
+        computed = {}
+        try:
+            self._run(
+                lambda chunk: (
+                    sum(a.get('cluster_size', 1) for a in chunk),
+                    self.analyzer.summarize_chunk(chunk)
+                ),
+                [chunks[i] for i in todo],
+                on_result=lambda position, result: computed.__setitem__(keys[todo[position]], result)
+            )
+        finally:
+            if computed and self.chunk_store is not None:
+                self.chunk_store.save(computed)
+        stored.update(computed)
+        return self.reduce([stored[key] for key in keys])
+
+    def chunk_key(self, chunk: List[Dict]) -> str:
+        """块内容的哈希（文章 id、标题、摘要、来源、报道数，以及提示词版本和模型）"""
+        payload = json.dumps(
+            [
+                PROMPT_VERSION,
+                getattr(self.analyzer, 'model', ''),
+                [
+                    [a.get('id'), a.get('title'), a.get('summary'), a.get('source'), a.get('cluster_size', 1)]
+                    for a in chunk
+                ],
+            ],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def reduce(self, partials: List[Tuple[int, Dict]]) -> Optional[Dict]:
+        """
+        逐层合并部分汇总
+
+        Args:
+            partials: (覆盖文章数, 部分汇总) 列表，按稳定顺序排列
+
+        Returns:
+            {'summary_content': JSON 字符串, 'article_count': 文章数}，没有部分汇总时返回 None
+
+        Raises:
+            AnalysisException: 任一合并失败
+        """
+        if not partials:
+            return None
+
+        level = 0
+        while len(partials) > 1:
+            level += 1
+            groups = [
+                partials[i:i + self.fan_in]
+                for i in range(0, len(partials), self.fan_in)
+            ]
+            logger.debug(f"汇总第 {level} 层合并：{len(partials)} 个部分 -> {len(groups)} 组")
+            partials = self._run(self.merge, groups)
+
+        article_count, summary = partials[0]
+        return {
+            'summary_content': json.dumps(summary, ensure_ascii=False),
+            'article_count': article_count
+        }
+
+    def merge(self, group: List[Tuple[int, Dict]]) -> Tuple[int, Optional[Dict]]:
+        """合并一组 (文章数, 部分汇总)，只有一个时直接返回"""
+        if len(group) == 1:
+            return group[0]
+        article_count = sum(count for count, _ in group)
+        return article_count, self.analyzer.merge_summaries(
+            [partial for _, partial in group], article_count
+        )
+
+    def _run(
+        self,
+        func: Callable,
+        items: List,
+        on_result: Optional[Callable[[int, Tuple[int, Dict]], None]] = None
+    ) -> List[Tuple[int, Dict]]:
+        """
+        并发执行并按输入顺序返回结果
+
+        Args:
+            on_result: 每个成功的部分完成时调用 on_result(下标, 结果)
+
+        Raises:
+            AnalysisException: 任一部分失败或响应无法解析（其余部分仍会执行完）
+        """
+        results = {}
+        failed = 0
+        for (position, _), result, error in self.engine.imap_unordered(
+            lambda pair: func(pair[1]),
+            list(enumerate(items))
+        ):
+            if error is None and not result[1]:
+                error = "响应无法解析"
+            if error is not None:
+                logger.warning(f"汇总第 {position + 1} 部分失败: {error}")
+                failed += 1
+                continue
+            results[position] = result
+            if on_result is not None:
+                on_result(position, result)
+
+        if failed:
+            raise AnalysisException(f"{failed}/{len(items)} 个部分汇总失败")
+        return [results[i] for i in range(len(items))]
@@ -0,0 +1,43 @@
+"""
+Token 估算工具（不依赖分词器的近似估算）
+"""
+import re
+
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的 token 数
+
+    中日韩字符约 1 个字符 1 个 token，其他字符约 4 个字符 1 个 token，
+    结果偏保守，用于限流预估和提示词预算。
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    other = len(text) - cjk
+    return cjk + (other + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    按估算 token 数截断文本（与 estimate_tokens 使用相同的估算规则）
+
+    Args:
+        text: 原文本
+        max_tokens: 最多保留的估算 token 数
+
+    Returns:
+        截断后的文本，未超出预算时原样返回
+    """
+    if not text or max_tokens <= 0:
+        return ''
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cost = 0.0
+    for i, ch in enumerate(text):
+        cost += 1.0 if _CJK_PATTERN.match(ch) else 0.25
+        if cost > max_tokens:
+            return text[:i]
+    return text
@@ -0,0 +1,195 @@
+"""
+LLM 调用用量记录（token、延迟、估算费用）
+
+每次调用的用量先写入进程内的 UsageLedger，由服务在一次运行结束时批量写入数据库。
+调用所属的运行、操作和来源通过 usage_scope 设置在上下文中，
+提交到线程池的任务需要在 contextvars.copy_context() 中执行才能继承。
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# 调用模式
+MODE_SYNC = 'sync'
+MODE_STREAM = 'stream'
+MODE_BATCH = 'batch'
+
+_SCOPE_FIELDS = ('run_id', 'operation', 'source')
+
+_scope: ContextVar[Dict[str, str]] = ContextVar('llm_usage_scope', default={})
+
+
+@contextmanager
+def usage_scope(**fields):
+    """
+    设置当前上下文中调用的归属（run_id / operation / source），嵌套时内层覆盖外层
+
+    值为 None 的字段沿用外层设置。
+    """
+    unknown = set(fields) - set(_SCOPE_FIELDS)
+    if unknown:
+        raise ValueError(f"未知的用量归属字段: {', '.join(sorted(unknown))}")
+    merged = dict(_scope.get())
+    merged.update({k: v for k, v in fields.items() if v is not None})
+    token = _scope.set(merged)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def current_scope() -> Dict[str, str]:
+    """当前上下文中调用的归属"""
+    return dict(_scope.get())
+
+
+def completion_tokens(provider: str, usage) -> int:
+    """从响应的 usage 中提取输出 token 数"""
+    if usage is None:
+        return 0
+    if provider == 'anthropic':
+        return getattr(usage, 'output_tokens', None) or 0
+    return getattr(usage, 'completion_tokens', None) or 0
+
+
+@dataclass
+class UsageRecord:
+    """单次 LLM 调用的用量"""
+    provider: str
+    model: str
+    mode: str = MODE_SYNC
+    run_id: Optional[str] = None
+    operation: Optional[str] = None
+    source: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    latency_ms: Optional[int] = None
+    estimated_cost: Optional[float] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class PriceTable:
+    """
+    模型价格表（每百万 token 的价格）
+
+    prices 的键为模型名前缀，按最长前缀匹配；每项可包含 input、output、
+    cached_input（命中缓存的输入，缺省按 input）和 cache_write（写入缓存的输入，缺省按 input）。
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Dict[str, float]]] = None, batch_discount: float = 0.5):
+        self.prices = prices or {}
+        self.batch_discount = batch_discount
+
+    def lookup(self, model: str) -> Optional[Dict[str, float]]:
+        """按最长前缀查找模型价格，未配置时返回 None"""
+        matches = [key for key in self.prices if model and model.startswith(key)]
+        if not matches:
+            return None
+        return self.prices[max(matches, key=len)]
+
+    def cost(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        batch: bool = False
+    ) -> Optional[float]:
+        """
+        估算单次调用费用
+
+        Args:
+            prompt_tokens: 输入 token 总数（含命中和写入缓存的部分）
+            batch: 是否为批处理接口调用（按 batch_discount 折算）
+
+        Returns:
+            估算费用，模型未配置价格时返回 None
+        """
+        price = self.lookup(model)
+        if price is None:
+            return None
+        input_price = price.get('input', 0.0)
+        uncached = max(0, prompt_tokens - cached_tokens - cache_write_tokens)
+        total = (
+            uncached * input_price
+            + cached_tokens * price.get('cached_input', input_price)
+            + cache_write_tokens * price.get('cache_write', input_price)
+            + completion_tokens * price.get('output', 0.0)
+        ) / 1_000_000
+        if batch:
+            total *= self.batch_discount
+        return round(total, 8)
+
+
+class UsageLedger:
+    """进程内的用量缓冲（线程安全），由服务定期取出写入数据库"""
+
+    def __init__(self, prices: Optional[PriceTable] = None, enabled: bool = True):
+        self.prices = prices or PriceTable()
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._records: List[UsageRecord] = []
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        tokens: Tuple[int, int, int],
+        completion: int,
+        latency: Optional[float] = None,
+        mode: str = MODE_SYNC,
+        **scope
+    ) -> Optional[UsageRecord]:
+        """
+        记录一次调用
+
+        Args:
+            tokens: cache_usage 的返回值 (输入 token 总数, 命中缓存数, 写入缓存数)
+            completion: 输出 token 数
+            latency: 调用耗时（秒）
+            mode: 调用模式（sync / stream / batch）
+            **scope: 覆盖上下文中的归属字段
+
+        Returns:
+            记录的用量，未启用时返回 None
+        """
+        if not self.enabled:
+            return None
+        prompt_tokens, cached, written = tokens
+        fields = current_scope()
+        fields.update({k: v for k, v in scope.items() if v is not None})
+        record = UsageRecord(
+            provider=provider,
+            model=model,
+            mode=mode,
+            run_id=fields.get('run_id'),
+            operation=fields.get('operation'),
+            source=fields.get('source'),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion,
+            cached_tokens=cached,
+            cache_write_tokens=written,
+            latency_ms=int(latency * 1000) if latency is not None else None,
+            estimated_cost=self.prices.cost(
+                model, prompt_tokens, completion, cached, written, batch=mode == MODE_BATCH
+            )
+        )
+        with self._lock:
+            self._records.append(record)
+        return record
+
+    def drain(self) -> List[UsageRecord]:
+        """取出并清空已记录的用量"""
+        with self._lock:
+            records, self._records = self._records, []
+        return records
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
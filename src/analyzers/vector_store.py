@@ -0,0 +1,414 @@
+"""
+文章向量存储与相似度检索
+
+向量以 float16 写入内存映射文件（每篇文章 dim * 2 字节，百万篇 256 维约 512MB），
+查询时由操作系统按需换页，不需要把全部向量读入内存。检索方式：
+
+- 暴力检索：分块把向量转为 float32 后与查询向量做矩阵乘法，结果精确
+- IVF 索引：向量数达到阈值后用球面 k-means 训练 nlist 个中心，每个向量归入最近的中心；
+  查询时只计算与查询最接近的 nprobe 个中心下的向量，百万级向量可在毫秒级返回
+
+目录结构：
+    vectors.f16    容量 x dim 的 float16 向量
+    ids.i64        每行对应的文章 ID（严格递增，按二分查找定位）
+    lists-N.i32    每行所属的 IVF 中心编号（训练后才有，N 为索引版本）
+    centroids-N.npy  IVF 中心
+    meta.json      已提交的行数、维度、后端、当前索引文件名等
+
+同一目录只允许一个写入进程（定时任务）。写入时先追加数据行，再原子替换 meta.json，
+读取方（Web 服务）只读取 meta.json 中已提交的行，meta.json 变化时重新映射文件。
+每次训练写入一对新版本的索引文件，由 meta.json 的替换同时切换中心和归属。
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.analyzers.embeddings import normalize_rows
+
+# 暴力检索时每块处理的行数
+SEARCH_CHUNK_ROWS = 65536
+# IVF 训练最多使用的样本数
+TRAIN_SAMPLE_ROWS = 100000
+# 文件扩容时的最小行数
+MIN_CAPACITY = 4096
+
+
+class VectorStore:
+    """文章向量存储（float16 内存映射文件 + 可选 IVF 索引）"""
+
+    def __init__(
+        self,
+        path: str,
+        dim: int,
+        backend: str,
+        ivf_min_rows: int = 50000,
+        nlist: int = 0,
+        nprobe: int = 16
+    ):
+        """
+        初始化向量存储
+
+        Args:
+            path: 存储目录
+            dim: 向量维度
+            backend: 向量化后端标识，与已有数据不一致时需要 reset 后重建
+            ivf_min_rows: 向量数达到该值后训练 IVF 索引并用于检索（0 为始终暴力检索）
+            nlist: IVF 中心数，0 表示按 sqrt(向量数) 自动选择
+            nprobe: 每次查询检索的中心数
+        """
+        self.path = path
+        self.dim = dim
+        self.backend = backend
+        self.ivf_min_rows = ivf_min_rows
+        self.nlist = nlist
+        self.nprobe = max(1, nprobe)
+        self._lock = threading.RLock()
+        self._meta_version = None
+        self._reset_state()
+        self.refresh()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _reset_state(self):
+        self.meta: Dict = {'dim': self.dim, 'backend': self.backend, 'count': 0, 'trained_count': 0}
+        self._vectors = None
+        self._ids = None
+        self._lists = None
+        self._centroids = None
+        self._list_order = None
+        self._list_offsets = None
+
+    # ---------- 读取 ----------
+
+    def refresh(self) -> bool:
+        """meta.json 变化时重新映射文件，返回是否重新加载"""
+        meta_path = self._file('meta.json')
+        try:
+            # meta.json 每次都原子替换，inode 变化即表示有新数据
+            stat = os.stat(meta_path)
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            if self._meta_version is not None:
+                with self._lock:
+                    self._meta_version = None
+                    self._reset_state()
+                return True
+            return False
+        if version == self._meta_version:
+            return False
+
+        with self._lock:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self._reset_state()
+            self.meta = meta
+            self._meta_version = version
+            count = meta['count']
+            if count:
+                self._vectors = self._map('vectors.f16', np.float16, (count, meta['dim']))
+                self._ids = self._map('ids.i64', np.int64, (count,))
+            if meta.get('trained_count'):
+                centroids_file, lists_file = self._index_files()
+                try:
+                    self._centroids = np.load(self._file(centroids_file))
+                    self._lists = self._map(lists_file, np.int32, (count,))
+                except FileNotFoundError:
+                    # 读取 meta.json 后写入方已切换到新索引并删除旧文件：暂用暴力检索，下次重新加载
+                    self._centroids = self._lists = None
+                    self._meta_version = None
+                    return True
+                self._build_inverted_lists()
+        return True
+
+    def _index_files(self) -> Tuple[str, str]:
+        """当前 IVF 索引的 (中心, 归属) 文件名，旧版本目录未记录时使用固定文件名"""
+        return self.meta.get('centroids_file', 'centroids.npy'), self.meta.get('lists_file', 'lists.i32')
+
+    def _map(self, name: str, dtype, shape, mode: str = 'r') -> np.memmap:
+        return np.memmap(self._file(name), dtype=dtype, mode=mode, shape=shape)
+
+    def _build_inverted_lists(self):
+        """按中心编号排序行号，得到每个中心下的行（倒排表）"""
+        lists = np.asarray(self._lists)
+        self._list_order = np.argsort(lists, kind='stable').astype(np.int64)
+        self._list_offsets = np.searchsorted(
+            lists[self._list_order], np.arange(len(self._centroids) + 1)
+        )
+
+    @property
+    def compatible(self) -> bool:
+        """已有数据是否与当前的后端和维度一致"""
+        return self.meta.get('backend') == self.backend and self.meta.get('dim') == self.dim
+
+    @property
+    def count(self) -> int:
+        return self.meta['count']
+
+    @property
+    def last_id(self) -> int:
+        """已写入的最大文章 ID（新文章从其后继续写入）"""
+        return int(self._ids[-1]) if self.count else 0
+
+    @property
+    def uses_ivf(self) -> bool:
+        return self._centroids is not None and 0 < self.ivf_min_rows <= self.count
+
+    def _row(self, article_id: int) -> Optional[int]:
+        if not self.count:
+            return None
+        row = int(np.searchsorted(self._ids, article_id))
+        if row < self.count and self._ids[row] == article_id:
+            return row
+        return None
+
+    def get(self, article_id: int) -> Optional[np.ndarray]:
+        """获取文章向量（float32），未写入时返回 None"""
+        with self._lock:
+            row = self._row(article_id)
+            if row is None:
+                return None
+            return np.asarray(self._vectors[row], dtype=np.float32)
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        exclude: Iterable[int] = ()
+    ) -> List[Tuple[int, float]]:
+        """
+        检索与查询向量最相似的文章
+
+        Args:
+            query: 查询向量（L2 归一化）
+            k: 返回数量
+            exclude: 排除的文章 ID（如查询文章本身）
+
+        Returns:
+            [(文章 ID, 余弦相似度)]，按相似度降序
+        """
+        with self._lock:
+            if not self.count or k <= 0:
+                return []
+            query = np.asarray(query, dtype=np.float32).reshape(-1)
+            exclude = set(exclude)
+            want = k + len(exclude)
+            if self.uses_ivf:
+                rows, scores = self._ivf_search(query, want)
+            else:
+                rows, scores = self._flat_search(query, want)
+            results = []
+            for row, score in zip(rows, scores):
+                article_id = int(self._ids[row])
+                if article_id in exclude:
+                    continue
+                results.append((article_id, round(float(score), 6)))
+                if len(results) >= k:
+                    break
+            return results
+
+    def _flat_search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """暴力检索：分块计算全部向量的相似度，保留每块的前 k 个"""
+        best_rows = []
+        best_scores = []
+        for start in range(0, self.count, SEARCH_CHUNK_ROWS):
+            block = np.asarray(self._vectors[start:start + SEARCH_CHUNK_ROWS], dtype=np.float32)
+            scores = block @ query
+            top = _top_k(scores, k)
+            best_rows.append(top + start)
+            best_scores.append(scores[top])
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        top = _top_k(scores, k)
+        return rows[top], scores[top]
+
+    def _ivf_search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """IVF 检索：只计算最接近的 nprobe 个中心下的向量"""
+        probes = _top_k(self._centroids @ query, self.nprobe)
+        rows = np.concatenate([
+            self._list_order[self._list_offsets[c]:self._list_offsets[c + 1]] for c in probes
+        ])
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float32)
+        rows.sort()  # 按行号顺序读取内存映射文件
+        scores = np.asarray(self._vectors[rows], dtype=np.float32) @ query
+        top = _top_k(scores, k)
+        return rows[top], scores[top]
+
+    # ---------- 写入 ----------
+
+    def reset(self):
+        """删除已有数据（后端或维度变化时重建索引）"""
+        with self._lock:
+            names = ['meta.json', 'vectors.f16', 'ids.i64']
+            if os.path.isdir(self.path):
+                names += [name for name in os.listdir(self.path) if name.startswith(('lists', 'centroids'))]
+            for name in names:
+                try:
+                    os.remove(self._file(name))
+                except FileNotFoundError:
+                    pass
+            self._meta_version = None
+            self._reset_state()
+
+    def add(self, article_ids: List[int], vectors: np.ndarray) -> int:
+        """
+        追加文章向量（文章 ID 需大于已写入的最大 ID，其余跳过）
+
+        Args:
+            article_ids: 文章 ID 列表（升序）
+            vectors: 对应的 L2 归一化向量
+
+        Returns:
+            写入的向量数
+        """
+        with self._lock:
+            if self.count and not self.compatible:
+                raise ValueError("向量存储的后端或维度与配置不一致，需要先 reset")
+            ids = np.asarray(article_ids, dtype=np.int64)
+            # 只保留大于之前所有 ID 的行，保证 ids.i64 严格递增
+            previous = np.maximum.accumulate(np.concatenate([[self.last_id], ids[:-1]]))
+            keep = ids > previous
+            ids = ids[keep]
+            vectors = np.asarray(vectors, dtype=np.float32)[keep]
+            if not len(ids):
+                return 0
+
+            os.makedirs(self.path, exist_ok=True)
+            start = self.count
+            end = start + len(ids)
+            self._ensure_capacity('vectors.f16', self.dim * 2, end)
+            self._ensure_capacity('ids.i64', 8, end)
+            for name, dtype, shape, values in (
+                ('vectors.f16', np.float16, (end, self.dim), vectors),
+                ('ids.i64', np.int64, (end,), ids),
+            ):
+                mapped = self._map(name, dtype, shape, 'r+')
+                mapped[start:end] = values
+                mapped.flush()
+            if self._centroids is not None:
+                lists_file = self._index_files()[1]
+                self._ensure_capacity(lists_file, 4, end)
+                lists = self._map(lists_file, np.int32, (end,), 'r+')
+                lists[start:end] = (vectors @ self._centroids.T).argmax(axis=1)
+                lists.flush()
+
+            meta = dict(self.meta, dim=self.dim, backend=self.backend, count=end)
+            self._write_meta(meta)
+            if self.ivf_min_rows and end >= self.ivf_min_rows and end >= 2 * meta.get('trained_count', 0):
+                self.train()
+            return len(ids)
+
+    def _ensure_capacity(self, name: str, row_bytes: int, rows: int):
+        """文件容量不足时扩容（至少翻倍，已映射的读取方不受影响）"""
+        path = self._file(name)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size >= rows * row_bytes:
+            return
+        capacity = max(rows, MIN_CAPACITY, 2 * (size // row_bytes))
+        with open(path, 'ab') as f:
+            f.truncate(capacity * row_bytes)
+
+    def _write_meta(self, meta: Dict):
+        """原子替换 meta.json 并重新加载"""
+        tmp_path = self._file('meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._file('meta.json'))
+        self.refresh()
+
+    def train(self, iterations: int = 10, seed: int = 0):
+        """
+        训练 IVF 索引并把全部向量归入最近的中心
+
+        新的中心和归属写入下一版本的文件，替换 meta.json 时一次切换两者，
+        读取方继续使用旧索引直到 meta.json 更新，之后删除旧版本文件。
+        """
+        with self._lock:
+            count = self.count
+            nlist = self.nlist or int(np.sqrt(count))
+            nlist = max(1, min(nlist, count))
+            logger.info(f"训练向量 IVF 索引：{count} 个向量，{nlist} 个中心")
+
+            rng = np.random.default_rng(seed)
+            sample_rows = np.sort(rng.choice(count, size=min(count, TRAIN_SAMPLE_ROWS), replace=False))
+            sample = np.asarray(self._vectors[sample_rows], dtype=np.float32)
+            centroids = _spherical_kmeans(sample, nlist, iterations, rng)
+
+            old_files = self._index_files() if self.meta.get('trained_count') else ()
+            generation = self.meta.get('index_generation', 0) + 1
+            centroids_file = f'centroids-{generation}.npy'
+            lists_file = f'lists-{generation}.i32'
+
+            lists = np.memmap(self._file(lists_file), dtype=np.int32, mode='w+', shape=(max(count, MIN_CAPACITY),))
+            for start in range(0, count, SEARCH_CHUNK_ROWS):
+                block = np.asarray(self._vectors[start:start + SEARCH_CHUNK_ROWS], dtype=np.float32)
+                lists[start:start + len(block)] = (block @ centroids.T).argmax(axis=1)
+            lists.flush()
+            del lists
+
+            np.save(self._file(centroids_file), centroids)
+            self._write_meta(dict(
+                self.meta,
+                trained_count=count,
+                nlist=nlist,
+                index_generation=generation,
+                centroids_file=centroids_file,
+                lists_file=lists_file
+            ))
+            # 已映射旧文件的读取方不受删除影响
+            for name in old_files:
+                try:
+                    os.remove(self._file(name))
+                except FileNotFoundError:
+                    pass
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """相似度最高的 k 个下标（降序）"""
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def _spherical_kmeans(
+    vectors: np.ndarray,
+    k: int,
+    iterations: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """稠密向量的球面 k-means（随机样本初始化，空簇保留原中心）"""
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), SEARCH_CHUNK_ROWS):
+            block = vectors[start:start + SEARCH_CHUNK_ROWS]
+            labels[start:start + len(block)] = (block @ centroids.T).argmax(axis=1)
+        order = np.argsort(labels, kind='stable')
+        present, starts = np.unique(labels[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(vectors[order], starts, axis=0)
+        nonempty = np.linalg.norm(sums, axis=1) > 0
+        centroids[nonempty] = normalize_rows(sums[nonempty])
+    return centroids
+
+
+_stores: Dict[str, VectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(path: str, dim: int, backend: str, **options) -> VectorStore:
+    """获取进程内共享的向量存储（按目录区分）"""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store.dim != dim or store.backend != backend:
+            store = VectorStore(path, dim, backend, **options)
+            _stores[key] = store
+        return store
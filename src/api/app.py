@@ -1,27 +1,26 @@
 """
 Web 服务应用（重构版）
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from loguru import logger
 
 from src.config import get_settings
 from src.core.logging import setup_logging
-from src.db import init_db
-from src.api.routes import articles_router, analysis_router, stats_router, tasks_router
+from src.db import init_db, get_db_manager
+from src.api.routes import articles_router, analysis_router, stats_router, tasks_router, feed_router
+from src.api.cache import ResponseCacheMiddleware, create_response_cache
+from src.api.feed import create_live_feed
 from src.api.views import get_home_page, get_news_list_page
+from src.services import ServiceContainer
+from src.tasks.jobs import get_job_manager, shutdown_job_manager
 
-# 创建 FastAPI 应用
-app = FastAPI(
-    title="新闻分析服务 API",
-    description="新闻抓取、存储和 AI 分析服务",
-    version="2.0.0"
-)
-
-
-@app.on_event("startup")
-async def startup_event():
-    """启动时初始化"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时初始化数据库和共享服务，关闭时释放连接"""
     config = get_settings()
     
     # 配置日志
@@ -34,7 +33,40 @@ async def startup_event():
     database_url = config.database.get_url()
     init_db(database_url)
     
+    # 抓取器、分析器和服务只创建一次，所有请求和后台作业共用
+    app.state.services = ServiceContainer(config, get_db_manager())
+    
+    # 读接口响应缓存（ETag / 304），抓取、分析写入新数据后失效
+    app.state.response_cache = create_response_cache(config.response_cache)
+    
+    # 手动触发的抓取、分析在后台作业线程池中执行
+    get_job_manager(max_workers=config.web.job_workers)
+    
+    # 新文章和分析结果的实时推送（SSE），有连接时才轮询数据库
+    app.state.live_feed = create_live_feed(config, get_db_manager())
+    feed_task = asyncio.create_task(app.state.live_feed.run()) if app.state.live_feed else None
+    
     logger.info("Web 服务启动完成")
+    try:
+        yield
+    finally:
+        if feed_task is not None:
+            feed_task.cancel()
+        shutdown_job_manager()
+        app.state.services.close()
+        if app.state.response_cache is not None:
+            app.state.response_cache.close()
+        logger.info("Web 服务已关闭")
+
+
+# 创建 FastAPI 应用
+app = FastAPI(
+    title="新闻分析服务 API",
+    description="新闻抓取、存储和 AI 分析服务",
+    version="2.0.0",
+    lifespan=lifespan
+)
+app.add_middleware(ResponseCacheMiddleware)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -74,3 +106,4 @@ app.include_router(articles_router)
 app.include_router(analysis_router)
 app.include_router(stats_router)
 app.include_router(tasks_router)
+app.include_router(feed_router)
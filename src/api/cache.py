@@ -0,0 +1,234 @@
+"""
+读接口响应缓存（ETag / 304）
+
+响应按 (路由, 规范化查询参数, 数据版本号) 缓存，抓取、分析写入新数据后版本号变化，
+旧条目不再命中并随 LRU 淘汰。客户端带 If-None-Match 请求且 ETag 相同时直接返回 304，
+缓存命中时不访问数据库。
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.analyzers.cache import LLMResultCache
+from src.core.generation import DataGeneration, get_data_generation
+
+# 缓存的读接口（精确匹配路径）
+CACHED_PATHS = frozenset({
+    '/api/articles',
+    '/api/articles/sources/list',
+    '/api/articles/categories/list',
+    '/api/stats',
+    '/api/analyses',
+})
+
+
+class ResponseCacheBackend:
+    """缓存后端接口：按键存取条目字典（etag / body / media_type）"""
+
+    # 读写是否会阻塞（文件 IO），为 True 时中间件在线程池中调用，不占用事件循环
+    blocking = False
+
+    def get(self, key: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def put(self, key: str, entry: Dict):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryResponseBackend(ResponseCacheBackend):
+    """进程内 LRU（线程安全）"""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: int = 300):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            created_at, entry = item
+            if self.ttl_seconds and created_at + self.ttl_seconds < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteResponseBackend(ResponseCacheBackend):
+    """
+    本地 SQLite 文件（同一台机器上的多个 Web 进程共享），复用 LLM 结果缓存的存储
+
+    读取只查询不写入（不更新访问时间和命中统计），缓存命中不产生写事务；
+    条目按写入先后淘汰，有效期很短，效果与 LRU 接近。
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = 1000, ttl_seconds: int = 300):
+        self._store = LLMResultCache(path, ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self._store.peek(key)
+        return json.loads(value) if value is not None else None
+
+    def put(self, key: str, entry: Dict):
+        self._store.put(key, json.dumps(entry, ensure_ascii=False))
+
+    def close(self):
+        self._store.close()
+
+
+class ResponseCache:
+    """响应缓存：生成缓存键、ETag 和缓存相关响应头"""
+
+    def __init__(self, backend: ResponseCacheBackend, generation: DataGeneration, max_age: int = 0):
+        self.backend = backend
+        self.generation = generation
+        self.max_age = max_age
+
+    @property
+    def cache_control(self) -> str:
+        return f"public, max-age={self.max_age}, must-revalidate"
+
+    def make_key(self, path: str, query_items: Iterable[Tuple[str, str]]) -> str:
+        """缓存键：路由 + 排序去空后的查询参数 + 当前数据版本号"""
+        params = sorted((k, v.strip()) for k, v in query_items if v is not None and v.strip() != '')
+        payload = json.dumps([path, params, self.generation.current()], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        """强 ETag：响应体的 SHA-256"""
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """If-None-Match 是否包含该 ETag（弱比较，忽略 W/ 前缀）"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return etag in candidates
+
+    def close(self):
+        self.backend.close()
+
+
+def create_response_cache(cache_config) -> Optional[ResponseCache]:
+    """按配置创建响应缓存，未启用时返回 None"""
+    if not cache_config.enabled:
+        return None
+    if cache_config.backend == 'sqlite':
+        backend = SQLiteResponseBackend(
+            cache_config.path,
+            max_entries=cache_config.max_entries,
+            ttl_seconds=cache_config.ttl_seconds
+        )
+    elif cache_config.backend == 'memory':
+        backend = MemoryResponseBackend(
+            max_entries=cache_config.max_entries,
+            ttl_seconds=cache_config.ttl_seconds
+        )
+    else:
+        raise ValueError(f"不支持的响应缓存后端: {cache_config.backend}")
+    return ResponseCache(backend, get_data_generation(cache_config.generation_path), cache_config.max_age)
+
+
+class ResponseCacheMiddleware:
+    """
+    响应缓存中间件（ASGI）
+
+    只处理 CACHED_PATHS 中的 GET 请求，其他请求（包括流式响应）原样透传。
+    缓存实例从 app.state.response_cache 读取，为 None 时不缓存。
+    """
+
+    def __init__(self, app, paths: Iterable[str] = CACHED_PATHS):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET' or scope['path'] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        cache: Optional[ResponseCache] = getattr(scope['app'].state, 'response_cache', None)
+        if cache is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        key = cache.make_key(scope['path'], request.query_params.multi_items())
+        if_none_match = request.headers.get('if-none-match')
+
+        entry = await self._call(cache.backend.get, key)
+        if entry is not None:
+            response = self._respond(cache, entry, if_none_match, hit=True)
+            await response(scope, receive, send)
+            return
+
+        # 未命中：执行路由并收集完整响应
+        start, chunks = None, []
+
+        async def capture(message):
+            nonlocal start
+            if message['type'] == 'http.response.start':
+                start = message
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.app(scope, receive, capture)
+
+        body = b''.join(chunks)
+        headers = Headers(raw=start['headers'])
+        if start['status'] != 200:
+            await send(start)
+            await send({'type': 'http.response.body', 'body': body})
+            return
+
+        entry = {
+            'etag': cache.make_etag(body),
+            'body': body.decode('utf-8'),
+            'media_type': headers.get('content-type', 'application/json'),
+        }
+        await self._call(cache.backend.put, key, entry)
+        response = self._respond(cache, entry, if_none_match, hit=False)
+        await response(scope, receive, send)
+
+    @staticmethod
+    async def _call(method, *args):
+        """调用缓存后端，阻塞型后端放到线程池中执行"""
+        if getattr(method.__self__, 'blocking', False):
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    @staticmethod
+    def _respond(cache: ResponseCache, entry: Dict, if_none_match: Optional[str], hit: bool) -> Response:
+        headers = {
+            'ETag': entry['etag'],
+            'Cache-Control': cache.cache_control,
+            'X-Cache': 'HIT' if hit else 'MISS',
+        }
+        if cache.etag_matches(if_none_match, entry['etag']):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry['body'].encode('utf-8'), headers=headers, media_type=entry['media_type'])
@@ -2,10 +2,26 @@
 API 依赖注入
 """
 from typing import Generator
+from fastapi import HTTPException, Request
 from sqlalchemy.orm import Session
 
 from src.db import get_db
 from src.db.repositories import ArticleRepository, AnalysisRepository, SummaryRepository
+from src.api.feed import LiveFeed
+from src.services import ServiceContainer
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """获取应用启动时创建的服务容器"""
+    return request.app.state.services
+
+
+def get_live_feed(request: Request) -> LiveFeed:
+    """获取应用启动时创建的实时推送中心（未启用时返回 503）"""
+    feed = getattr(request.app.state, 'live_feed', None)
+    if feed is None:
+        raise HTTPException(status_code=503, detail="实时推送未启用")
+    return feed
 
 
 def get_article_repository(db: Session = None) -> ArticleRepository:
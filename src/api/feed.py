@@ -0,0 +1,324 @@
+"""
+实时推送 - 新文章和分析完成事件（Server-Sent Events）
+
+Web 进程内只有一个轮询任务：数据版本号变化时（抓取、分析提交后）按 id 游标查询一次新增的
+文章和分析结果，再按各连接的来源 / 分类过滤分发。数据库查询次数与连接数无关。
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from src.core.generation import DataGeneration, get_data_generation
+from src.db.repositories import AnalysisRepository, ArticleRepository
+
+# 事件类型
+EVENT_ARTICLE = 'article'
+EVENT_ANALYSIS = 'analysis'
+EVENT_RESET = 'reset'
+
+EVENT_TYPES = (EVENT_ARTICLE, EVENT_ANALYSIS)
+
+# 并发事务的提交顺序可能与 id 顺序不同，每次轮询回看游标之前的一段 id
+_ID_OVERLAP = 100
+_SEEN_LIMIT = 5000
+
+
+@dataclass
+class FeedCursor:
+    """推送位置：已推送的最大文章 ID 和分析结果 ID，序列化为 SSE 事件 ID "文章ID-分析ID\""""
+    article_id: int = 0
+    analysis_id: int = 0
+
+    @property
+    def event_id(self) -> str:
+        return f"{self.article_id}-{self.analysis_id}"
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> Optional['FeedCursor']:
+        """解析 Last-Event-ID，格式不正确时返回 None"""
+        try:
+            article_id, analysis_id = (int(part) for part in (value or '').split('-'))
+        except ValueError:
+            return None
+        if article_id < 0 or analysis_id < 0:
+            return None
+        return cls(article_id, analysis_id)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class FeedSubscription:
+    """一个推送连接：过滤条件、待发送事件队列和该连接的推送位置"""
+
+    def __init__(
+        self,
+        cursor: FeedCursor,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        types: Tuple[str, ...] = EVENT_TYPES,
+        queue_size: int = 1000
+    ):
+        self.cursor = cursor
+        self.source = source
+        self.category = category
+        self.types = types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # 补发过的事件（实时分发时跳过）
+        self.sent: Set[Tuple[str, int]] = set()
+
+    def matches(self, event_type: str, payload: Dict) -> bool:
+        return (
+            event_type in self.types
+            and (not self.source or payload.get('source') == self.source)
+            and (not self.category or payload.get('category') == self.category)
+        )
+
+    def offer(self, event_type: str, payload: Dict):
+        """放入一个事件；客户端读取过慢导致队列已满时丢弃积压并通知客户端重新加载"""
+        try:
+            self.queue.put_nowait((event_type, payload))
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((EVENT_RESET, {'reason': 'overflow'}))
+
+    async def next_event(self, timeout: float) -> Optional[Tuple[str, Dict]]:
+        """等待下一个事件（跳过已补发的），超时返回 None"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                event_type, payload = await asyncio.wait_for(self.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if (event_type, payload.get('id')) not in self.sent:
+                return event_type, payload
+
+    def format(self, event_type: str, payload: Dict) -> str:
+        """格式化为 SSE 消息并推进推送位置"""
+        if event_type == EVENT_ARTICLE:
+            self.cursor.article_id = max(self.cursor.article_id, payload['id'])
+        elif event_type == EVENT_ANALYSIS:
+            self.cursor.analysis_id = max(self.cursor.analysis_id, payload['id'])
+        data = json.dumps(payload, ensure_ascii=False, default=_json_default)
+        return f"id: {self.cursor.event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+class LiveFeed:
+    """
+    实时推送中心（在 Web 进程的事件循环中运行）
+
+    有连接时才轮询数据库：配置了数据版本号则仅在版本号变化（或超过 max_idle_interval）时查询，
+    否则每 poll_interval 秒查询一次。没有连接时游标失效，下次有连接时从当前最新位置开始。
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        generation: Optional[DataGeneration] = None,
+        poll_interval: float = 1.0,
+        max_idle_interval: float = 30.0,
+        heartbeat_interval: float = 15.0,
+        backlog_limit: int = 500,
+        queue_size: int = 1000
+    ):
+        """
+        初始化推送中心
+
+        Args:
+            db_manager: 数据库管理器
+            generation: 数据版本号（None 则按固定间隔查询）
+            poll_interval: 检查间隔（秒）
+            max_idle_interval: 版本号未变化时的最长查询间隔（秒）
+            heartbeat_interval: 连接空闲时发送心跳的间隔（秒）
+            backlog_limit: 断点续传时每类事件最多补发的条数
+            queue_size: 每个连接的待发送事件上限
+        """
+        self.db_manager = db_manager
+        self.generation = generation
+        self.poll_interval = poll_interval
+        self.max_idle_interval = max_idle_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.backlog_limit = backlog_limit
+        self.queue_size = queue_size
+        self._subscriptions: Set[FeedSubscription] = set()
+        self._cursor: Optional[FeedCursor] = None
+        self._seen: Dict[str, Deque[int]] = {EVENT_ARTICLE: deque(), EVENT_ANALYSIS: deque()}
+        self._seen_ids: Dict[str, Set[int]] = {EVENT_ARTICLE: set(), EVENT_ANALYSIS: set()}
+        self._last_generation: Optional[str] = None
+        self._last_poll = 0.0
+        self._activate_lock = asyncio.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    async def subscribe(
+        self,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        types: Tuple[str, ...] = EVENT_TYPES,
+        since_article_id: Optional[int] = None,
+        since_analysis_id: Optional[int] = None
+    ) -> Tuple[FeedSubscription, List[Tuple[str, Dict]]]:
+        """
+        新建连接
+
+        Args:
+            since_article_id / since_analysis_id: 断点续传位置，None 表示从当前最新位置开始
+
+        Returns:
+            (连接, 需要先补发的事件列表)
+        """
+        async with self._activate_lock:
+            if self._cursor is None:
+                await asyncio.to_thread(self._activate)
+                self._last_generation = self.generation.current() if self.generation else None
+                self._last_poll = time.monotonic()
+
+        cursor = FeedCursor(
+            self._cursor.article_id if since_article_id is None else since_article_id,
+            self._cursor.analysis_id if since_analysis_id is None else since_analysis_id
+        )
+        subscription = FeedSubscription(cursor, source, category, types, self.queue_size)
+        # 先加入分发再读取补发事件，两者之间提交的数据不会遗漏（重复的由 sent 去重）
+        self._subscriptions.add(subscription)
+
+        backlog = []
+        if since_article_id is not None or since_analysis_id is not None:
+            backlog = await asyncio.to_thread(self._load_backlog, subscription)
+            subscription.sent.update(
+                (event_type, payload['id']) for event_type, payload in backlog if event_type != EVENT_RESET
+            )
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: FeedSubscription):
+        self._subscriptions.discard(subscription)
+        if not self._subscriptions:
+            self._cursor = None
+
+    async def run(self):
+        """轮询循环（作为后台任务运行，取消即停止）"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._subscriptions or self._cursor is None or not self._should_poll():
+                continue
+            try:
+                events = await asyncio.to_thread(self._poll)
+            except Exception as e:
+                logger.warning(f"实时推送查询失败: {e}")
+                continue
+            for event_type, payload in events:
+                for subscription in list(self._subscriptions):
+                    if subscription.matches(event_type, payload):
+                        subscription.offer(event_type, payload)
+
+    def _should_poll(self) -> bool:
+        now = time.monotonic()
+        if self.generation is not None:
+            current = self.generation.current()
+            if current == self._last_generation and now - self._last_poll < self.max_idle_interval:
+                return False
+            self._last_generation = current
+        self._last_poll = now
+        return True
+
+    def _activate(self) -> FeedCursor:
+        """第一个连接到来时从当前最新位置开始，回看范围内已有的数据记为已分发"""
+        for event_type in EVENT_TYPES:
+            self._seen[event_type].clear()
+            self._seen_ids[event_type].clear()
+        with self.db_manager.session_scope() as session:
+            cursor = FeedCursor(
+                ArticleRepository(session).get_max_id(),
+                AnalysisRepository(session).get_max_id()
+            )
+        self._query(cursor)
+        self._cursor = cursor
+        return cursor
+
+    def _query(self, cursor: FeedCursor) -> List[Tuple[str, Dict]]:
+        """查询游标之后（回看一段 id）尚未分发的文章和分析结果，并推进游标"""
+        limit = self.backlog_limit + _ID_OVERLAP
+        with self.db_manager.session_scope() as session:
+            articles = ArticleRepository(session).get_feed(max(0, cursor.article_id - _ID_OVERLAP), limit=limit)
+            analyses = AnalysisRepository(session).get_feed(max(0, cursor.analysis_id - _ID_OVERLAP), limit=limit)
+
+        events = []
+        for event_type, rows in ((EVENT_ARTICLE, articles), (EVENT_ANALYSIS, analyses)):
+            events.extend((event_type, row) for row in rows if self._mark_seen(event_type, row['id']))
+        if articles:
+            cursor.article_id = max(cursor.article_id, articles[-1]['id'])
+        if analyses:
+            cursor.analysis_id = max(cursor.analysis_id, analyses[-1]['id'])
+        if len(articles) >= limit or len(analyses) >= limit:
+            # 一次没有取完，下一轮继续查询
+            self._last_generation = None
+            self._last_poll = 0.0
+        return events
+
+    def _poll(self) -> List[Tuple[str, Dict]]:
+        return self._query(self._cursor)
+
+    def _mark_seen(self, event_type: str, row_id: int) -> bool:
+        """记录已分发的 ID，已分发过的返回 False"""
+        ids = self._seen_ids[event_type]
+        if row_id in ids:
+            return False
+        order = self._seen[event_type]
+        ids.add(row_id)
+        order.append(row_id)
+        if len(order) > _SEEN_LIMIT:
+            ids.discard(order.popleft())
+        return True
+
+    def _load_backlog(self, subscription: FeedSubscription) -> List[Tuple[str, Dict]]:
+        """断点续传：读取连接推送位置之后符合过滤条件的事件，超过上限时追加 reset 事件"""
+        cursor = subscription.cursor
+        events, truncated = [], False
+        with self.db_manager.session_scope() as session:
+            if EVENT_ARTICLE in subscription.types:
+                rows = ArticleRepository(session).get_feed(
+                    cursor.article_id, subscription.source, subscription.category, limit=self.backlog_limit
+                )
+                events.extend((EVENT_ARTICLE, row) for row in rows)
+                truncated = truncated or len(rows) >= self.backlog_limit
+            if EVENT_ANALYSIS in subscription.types:
+                rows = AnalysisRepository(session).get_feed(
+                    cursor.analysis_id, subscription.source, subscription.category, limit=self.backlog_limit
+                )
+                events.extend((EVENT_ANALYSIS, row) for row in rows)
+                truncated = truncated or len(rows) >= self.backlog_limit
+        if truncated:
+            events.append((EVENT_RESET, {'reason': 'backlog_limit'}))
+        return events
+
+
+def create_live_feed(config, db_manager) -> Optional[LiveFeed]:
+    """按配置创建实时推送中心，未启用时返回 None（启用响应缓存时按数据版本号触发查询）"""
+    feed_config = config.live_feed
+    if not feed_config.enabled:
+        return None
+    cache_config = config.response_cache
+    generation = get_data_generation(cache_config.generation_path) if cache_config.enabled else None
+    return LiveFeed(
+        db_manager,
+        generation=generation,
+        poll_interval=feed_config.poll_interval,
+        max_idle_interval=feed_config.max_idle_interval,
+        heartbeat_interval=feed_config.heartbeat_interval,
+        backlog_limit=feed_config.backlog_limit,
+        queue_size=feed_config.queue_size
+    )
@@ -6,8 +6,8 @@ from sqlalchemy.orm import Session
 from loguru import logger
 
 from src.db import get_db
-from src.db.repositories import AnalysisRepository, ArticleRepository
-from src.api.schemas.analysis import AnalysisResponse, AnalysisListResponse
+from src.db.repositories import AnalysisRepository, ArticleRepository, SummaryRepository
+from src.api.schemas.analysis import AnalysisResponse, AnalysisListResponse, SummaryResponse
 
 router = APIRouter(prefix="/api/analyses", tags=["analysis"])
 
@@ -49,3 +49,15 @@ async def get_analyses(
     except Exception as e:
         logger.error(f"获取分析结果失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/summaries/latest", response_model=SummaryResponse)
+async def get_latest_summary(
+    summary_type: str = Query("daily", pattern="^(hourly|daily|weekly)$"),
+    db: Session = Depends(get_db)
+):
+    """获取最新的摘要（每日摘要随增量摘要滚动更新）"""
+    summary = SummaryRepository(db).get_latest(summary_type)
+    if not summary:
+        raise HTTPException(status_code=404, detail="暂无摘要")
+    return summary
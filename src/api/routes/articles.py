@@ -1,13 +1,21 @@
 """
 文章相关路由
 """
+import json
+from datetime import datetime, timedelta
 from typing import Optional
+import pytz
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from loguru import logger
 
-from src.db import get_db
-from src.db.repositories import ArticleRepository, AnalysisRepository
+from src.db import get_db, get_db_manager
+from src.db.models import NewsArticle
+from src.db.repositories import ArticleRepository, AnalysisRepository, DimensionRepository
+from src.analyzers.clustering import cluster_topics
+from src.services import ServiceContainer
+from src.api.dependencies import get_services
 from src.api.schemas.article import ArticleResponse, ArticleListResponse, ArticleWithAnalysis
 
 router = APIRouter(prefix="/api/articles", tags=["articles"])
@@ -20,6 +28,7 @@ async def get_articles(
     source: Optional[str] = None,
     source_type: Optional[str] = None,
     category: Optional[str] = None,
+    tag: Optional[str] = None,
     analyzed: Optional[bool] = None,
     search: Optional[str] = None,
     sort_by: str = Query("published_at", regex="^(published_at|crawled_at|title)$"),
@@ -39,6 +48,7 @@ async def get_articles(
             source=source,
             source_type=source_type,
             category=category,
+            tag=tag,
             analyzed=analyzed,
             limit=limit,
             offset=offset,
@@ -64,7 +74,10 @@ async def get_articles(
                     language=a.language,
                     category=a.category,
                     tags=a.tags,
-                    is_analyzed=a.is_analyzed
+                    is_analyzed=a.is_analyzed,
+                    title_translated=a.title_translated,
+                    summary_translated=a.summary_translated,
+                    translation_language=a.translation_language
                 )
                 for a in articles
             ]
@@ -74,6 +87,98 @@ async def get_articles(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _json_default(value):
+    """NDJSON 序列化：datetime 转 ISO 字符串"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"无法序列化类型: {type(value)}")
+
+
+@router.get("/stream")
+async def stream_articles(
+    since: Optional[datetime] = Query(None, description="只返回抓取时间不早于该时间的文章"),
+    since_id: Optional[int] = Query(None, ge=0, description="只返回 id 大于该值的文章（断点续传）"),
+    fields: Optional[str] = Query(None, description="逗号分隔的字段列表，默认全部字段"),
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    batch_size: int = Query(1000, ge=1, le=10000)
+):
+    """
+    以 NDJSON 流式返回文章（每行一个 JSON 对象，按 id 升序）
+    
+    结果始终包含 id 字段，客户端可用最后一行的 id 作为下次请求的 since_id。
+    """
+    columns = NewsArticle.__table__.columns
+    if fields:
+        selected = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in selected if f not in columns]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"未知字段: {', '.join(unknown)}")
+        if 'id' not in selected:
+            selected.insert(0, 'id')
+    else:
+        selected = None
+    # crawled_at 以不带时区的 UTC 存储，带时区偏移的参数先转换为 UTC
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(pytz.UTC).replace(tzinfo=None)
+    
+    db_manager = get_db_manager()
+    
+    def generate():
+        # 流式响应在路由返回后才迭代，需要独立管理会话生命周期
+        with db_manager.session_scope() as session:
+            article_repo = ArticleRepository(session)
+            for batch in article_repo.iter_batches_since(
+                since=since,
+                after_id=since_id,
+                fields=selected,
+                source=source,
+                category=category,
+                batch_size=batch_size
+            ):
+                lines = [
+                    json.dumps(row, ensure_ascii=False, default=_json_default)
+                    for row in batch
+                ]
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/topics")
+def get_topics(
+    hours: int = Query(24, ge=1, le=24 * 7, description="统计最近多少小时抓取的文章"),
+    max_topics: int = Query(20, ge=1, le=200),
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    本地话题聚类（不调用 AI）
+    
+    聚类是 CPU 计算，使用同步路由在线程池中执行，避免阻塞事件循环。
+    """
+    try:
+        article_repo = ArticleRepository(db)
+        articles = []
+        for batch in article_repo.iter_batches_since(
+            since=datetime.utcnow() - timedelta(hours=hours),
+            fields=['id', 'title', 'summary', 'source', 'url'],
+            source=source,
+            category=category,
+            batch_size=2000
+        ):
+            articles.extend(batch)
+        
+        return {
+            "article_count": len(articles),
+            "topics": cluster_topics(articles, max_clusters=max_topics)
+        }
+    except Exception as e:
+        logger.error(f"话题聚类失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{article_id}", response_model=ArticleWithAnalysis)
 async def get_article(
     article_id: int,
@@ -104,7 +209,10 @@ async def get_article(
             language=article.language,
             category=article.category,
             tags=article.tags,
-            is_analyzed=article.is_analyzed
+            is_analyzed=article.is_analyzed,
+            title_translated=article.title_translated,
+            summary_translated=article.summary_translated,
+            translation_language=article.translation_language
         )
         
         if analysis:
@@ -123,29 +231,39 @@ async def get_article(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{article_id}/related")
+def get_related_articles(
+    article_id: int,
+    k: int = Query(10, ge=1, le=100, description="返回的相关文章数"),
+    services: ServiceContainer = Depends(get_services)
+):
+    """按向量相似度获取相关文章"""
+    if services.embedding_service is None:
+        raise HTTPException(status_code=503, detail="向量索引未启用")
+    try:
+        related = services.embedding_service.related(article_id, k)
+    except Exception as e:
+        logger.error(f"获取相关文章失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if related is None:
+        raise HTTPException(status_code=404, detail="文章不存在")
+    return {"article_id": article_id, "count": len(related), "articles": related}
+
+
 @router.get("/sources/list")
 async def get_sources(db: Session = Depends(get_db)):
     """获取所有新闻源列表（去重）"""
     try:
-        from src.db.models import NewsArticle
-        from sqlalchemy import distinct, func
+        # 直接扫描新闻源维度表，无需对文章表 GROUP BY
+        sources = DimensionRepository(db).list_sources()
         
-        # 使用 group_by 确保去重，并获取每个源的类型
-        sources = db.query(
-            NewsArticle.source,
-            NewsArticle.source_type
-        ).group_by(
-            NewsArticle.source,
-            NewsArticle.source_type
-        ).all()
-        
-        # 进一步去重：如果同一个源有多个类型，只保留第一个
+        # 同一个源有多个类型时只保留第一个
         seen = set()
         unique_sources = []
-        for source, source_type in sources:
-            if source not in seen:
-                seen.add(source)
-                unique_sources.append({"name": source, "type": source_type})
+        for source in sources:
+            if source.name not in seen:
+                seen.add(source.name)
+                unique_sources.append({"name": source.name, "type": source.source_type})
         
         return {
             "sources": unique_sources
@@ -159,21 +277,8 @@ async def get_sources(db: Session = Depends(get_db)):
 async def get_categories(db: Session = Depends(get_db)):
     """获取所有分类列表（去重）"""
     try:
-        from src.db.models import NewsArticle
-        from sqlalchemy import distinct
-        
-        categories = db.query(
-            distinct(NewsArticle.category)
-        ).filter(
-            NewsArticle.category.isnot(None)
-        ).all()
-        
-        # 去重并过滤空值
-        unique_categories = list(set([c[0] for c in categories if c[0]]))
-        unique_categories.sort()  # 排序以便显示
-        
         return {
-            "categories": unique_categories
+            "categories": DimensionRepository(db).list_categories()
         }
     except Exception as e:
         logger.error(f"获取分类列表失败: {e}")
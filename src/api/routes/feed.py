@@ -0,0 +1,77 @@
+"""
+实时推送路由（Server-Sent Events）
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from src.api.dependencies import get_live_feed
+from src.api.feed import EVENT_TYPES, FeedCursor, LiveFeed
+
+router = APIRouter(prefix="/api/feed", tags=["feed"])
+
+# 断线后浏览器重连的等待时间（毫秒）
+RETRY_MS = 3000
+
+
+@router.get("")
+async def live_feed(
+    request: Request,
+    source: Optional[str] = Query(None, description="只推送该来源"),
+    category: Optional[str] = Query(None, description="只推送该分类"),
+    types: Optional[str] = Query(None, description="事件类型，逗号分隔：article,analysis"),
+    since_id: Optional[int] = Query(None, ge=0, description="从该文章 ID 之后开始补发"),
+    since_analysis_id: Optional[int] = Query(None, ge=0, description="从该分析结果 ID 之后开始补发"),
+    last_event_id: Optional[str] = Header(None),
+    feed: LiveFeed = Depends(get_live_feed)
+):
+    """
+    新文章和分析完成的实时推送
+
+    事件：article（新入库的文章）、analysis（分析完成）、reset（积压过多，客户端应重新加载列表）。
+    事件 ID 为 "文章ID-分析ID"，浏览器断线重连时通过 Last-Event-ID 自动续传；
+    也可以用 since_id / since_analysis_id 指定起始位置。
+    """
+    if types:
+        selected = tuple(t.strip() for t in types.split(',') if t.strip())
+        unknown = set(selected) - set(EVENT_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"不支持的事件类型: {', '.join(sorted(unknown))}")
+    else:
+        selected = EVENT_TYPES
+
+    resume = FeedCursor.parse(last_event_id)
+    if resume is not None:
+        since_id, since_analysis_id = resume.article_id, resume.analysis_id
+
+    subscription, backlog = await feed.subscribe(
+        source=source,
+        category=category,
+        types=selected,
+        since_article_id=since_id,
+        since_analysis_id=since_analysis_id
+    )
+
+    async def stream():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            for event_type, payload in backlog:
+                yield subscription.format(event_type, payload)
+            while not await request.is_disconnected():
+                event = await subscription.next_event(feed.heartbeat_interval)
+                if event is None:
+                    yield ": ping\n\n"
+                    continue
+                yield subscription.format(*event)
+        finally:
+            feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
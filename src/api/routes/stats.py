@@ -1,12 +1,20 @@
 """
 统计信息路由
 """
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from src.db import get_db
-from src.db.repositories import ArticleRepository, AnalysisRepository
+from src.analyzers.latency import latency_snapshot
+from src.analyzers.prompt_cache import prompt_cache_snapshot
+from src.db.repositories import ArticleRepository, AnalysisRepository, UsageRepository
+from src.db.repositories.usage_repository import GROUP_BY_COLUMNS
+from src.services import ServiceContainer
+from src.api.dependencies import get_services
 from src.api.schemas.common import StatsResponse
 
 router = APIRouter(prefix="/api/stats", tags=["stats"])
@@ -31,3 +39,85 @@ async def get_stats(db: Session = Depends(get_db)):
     except Exception as e:
         logger.error(f"获取统计信息失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/llm-cache")
+async def get_llm_cache_stats(services: ServiceContainer = Depends(get_services)):
+    """获取 LLM 结果缓存统计（命中率、节省字节数）"""
+    try:
+        cache = services.analyzer.cache
+        if cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **cache.stats()}
+    except Exception as e:
+        logger.error(f"获取 LLM 缓存统计失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/ai-latency")
+async def get_ai_latency_stats():
+    """获取当前进程内各 AI 接口的延迟分位数（用于对冲阈值）"""
+    return latency_snapshot()
+
+
+@router.get("/prompt-cache")
+async def get_prompt_cache_stats():
+    """获取当前进程内各 AI 接口的提示词前缀缓存命中情况（输入 token 中命中缓存的比例）"""
+    return prompt_cache_snapshot()
+
+
+@router.get("/sentiment")
+async def get_sentiment_stats(
+    hours: Optional[int] = Query(None, ge=1, le=24 * 90, description="只统计最近若干小时抓取的文章"),
+    db: Session = Depends(get_db)
+):
+    """获取文章情感分布（含词典临时结果与 AI 结果的占比）"""
+    try:
+        since = datetime.utcnow() - timedelta(hours=hours) if hours else None
+        rows = ArticleRepository(db).get_sentiment_distribution(since)
+        
+        distribution = {}
+        sources = {}
+        for row in rows:
+            label = row['sentiment'] or 'unknown'
+            source = row['source'] or 'none'
+            distribution[label] = distribution.get(label, 0) + row['count']
+            sources[source] = sources.get(source, 0) + row['count']
+        
+        return {
+            "total": sum(distribution.values()),
+            "distribution": distribution,
+            "sources": sources,
+            "details": rows
+        }
+    except Exception as e:
+        logger.error(f"获取情感统计失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/usage")
+async def get_usage_stats(
+    days: int = Query(7, ge=1, le=365, description="统计最近若干天的调用"),
+    group_by: str = Query("day", description=f"汇总维度: {'/'.join(GROUP_BY_COLUMNS)}"),
+    db: Session = Depends(get_db)
+):
+    """获取 LLM 调用用量和估算费用（按运行、来源、日期等维度汇总）"""
+    if group_by not in GROUP_BY_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"不支持的汇总维度: {group_by}")
+    try:
+        since = datetime.utcnow() - timedelta(days=days)
+        rows = UsageRepository(db).summarize(since, group_by)
+        costs = [row['estimated_cost'] for row in rows if row['estimated_cost'] is not None]
+        return {
+            "days": days,
+            "group_by": group_by,
+            "total_calls": sum(row['calls'] for row in rows),
+            "total_prompt_tokens": sum(row['prompt_tokens'] for row in rows),
+            "total_completion_tokens": sum(row['completion_tokens'] for row in rows),
+            "total_cached_tokens": sum(row['cached_tokens'] for row in rows),
+            "total_estimated_cost": round(sum(costs), 6) if costs else None,
+            "groups": rows
+        }
+    except Exception as e:
+        logger.error(f"获取用量统计失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,106 +1,74 @@
 """
 任务相关路由（抓取、分析等）
 """
-import asyncio
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from loguru import logger
 
-from src.db import get_db_manager
-from src.config import get_settings
-from src.services import CrawlerService, AnalysisService
-from src.crawlers import RSSCrawler, PlatformCrawler
-from src.analyzers import AIAnalyzer
-from src.api.schemas.common import TaskResponse
+from src.services import ServiceContainer
+from src.api.dependencies import get_services
+from src.api.schemas.common import TaskResponse, JobResponse
+from src.tasks.jobs import get_job_manager
 
 router = APIRouter(prefix="/api", tags=["tasks"])
 
 
-def get_crawler_service():
-    """获取抓取服务（依赖注入）"""
-    config = get_settings()
-    db_manager = get_db_manager()
-    rss_crawler = RSSCrawler(config)
-    platform_crawler = PlatformCrawler(config)
+def _job_response(job: dict, created: bool, description: str) -> TaskResponse:
+    """作业提交结果（新建或合并到已有的同类作业）"""
+    message = f"{description}任务已提交" if created else f"{description}任务正在进行中，未重复提交"
+    return TaskResponse(success=True, message=message, task_id=job['id'], data=job)
+
+
+@router.post("/fetch", response_model=TaskResponse, status_code=202)
+async def fetch_news(services: ServiceContainer = Depends(get_services)):
+    """手动触发新闻抓取（后台执行，通过 /api/jobs/{job_id} 查询进度）"""
+    def do_fetch(progress):
+        saved_count = services.crawler_service.fetch_all_sources(progress=progress)
+        logger.info(f"Web API: 成功保存 {saved_count} 篇新文章")
+        return {"saved_count": saved_count}
     
-    return CrawlerService(
-        db_manager=db_manager,
-        rss_crawler=rss_crawler,
-        platform_crawler=platform_crawler,
-        config=config
-    )
+    job, created = get_job_manager().submit('fetch', do_fetch)
+    return _job_response(job, created, "抓取")
 
 
-def get_analysis_service():
-    """获取分析服务（依赖注入）"""
-    config = get_settings()
-    db_manager = get_db_manager()
-    analyzer = AIAnalyzer(config)
+@router.post("/analyze", response_model=TaskResponse, status_code=202)
+async def analyze_news(services: ServiceContainer = Depends(get_services)):
+    """手动触发 AI 分析（后台执行，通过 /api/jobs/{job_id} 查询进度）"""
+    def do_analyze(progress):
+        analyzed_count = services.analysis_service.analyze_unanalyzed_articles(progress=progress)
+        logger.info(f"Web API: 成功分析 {analyzed_count} 篇文章")
+        return {"analyzed_count": analyzed_count}
     
-    return AnalysisService(
-        db_manager=db_manager,
-        analyzer=analyzer,
-        config=config
-    )
+    job, created = get_job_manager().submit('analyze', do_analyze)
+    return _job_response(job, created, "分析")
+
 
+@router.get("/jobs", response_model=List[JobResponse])
+async def list_jobs(limit: int = Query(20, ge=1, le=100)):
+    """最近的后台作业"""
+    return get_job_manager().list(limit=limit)
 
-@router.post("/fetch", response_model=TaskResponse)
-async def fetch_news():
-    """手动触发新闻抓取"""
-    try:
-        logger.info("Web API: 开始抓取新闻")
-        
-        crawler_service = get_crawler_service()
-        
-        # 在后台执行抓取任务
-        def do_fetch():
-            try:
-                saved_count = crawler_service.fetch_all_sources()
-                logger.info(f"Web API: 成功保存 {saved_count} 篇新文章")
-                return saved_count
-            except Exception as e:
-                logger.error(f"Web API: 抓取失败: {e}")
-                raise e
-        
-        # 使用 asyncio 在后台执行
-        loop = asyncio.get_event_loop()
-        saved_count = await loop.run_in_executor(None, do_fetch)
-        
-        return TaskResponse(
-            success=True,
-            message=f"成功抓取并保存 {saved_count} 篇新文章",
-            data={"saved_count": saved_count}
-        )
-    except Exception as e:
-        logger.error(f"抓取新闻失败: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """查询后台作业的状态、进度和结果"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="作业不存在")
+    return job
 
-@router.post("/analyze", response_model=TaskResponse)
-async def analyze_news():
-    """手动触发 AI 分析"""
-    try:
-        logger.info("Web API: 开始分析新闻")
-        
-        analysis_service = get_analysis_service()
-        
-        def do_analyze():
-            try:
-                analyzed_count = analysis_service.analyze_unanalyzed_articles()
-                logger.info(f"Web API: 成功分析 {analyzed_count} 篇文章")
-                return analyzed_count
-            except Exception as e:
-                logger.error(f"Web API: 分析失败: {e}")
-                raise e
-        
-        loop = asyncio.get_event_loop()
-        analyzed_count = await loop.run_in_executor(None, do_analyze)
-        
-        return TaskResponse(
-            success=True,
-            message=f"成功分析 {analyzed_count} 篇文章",
-            data={"analyzed_count": analyzed_count}
-        )
-    except Exception as e:
-        logger.error(f"分析新闻失败: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/export", response_model=TaskResponse, status_code=202)
+async def export_data(
+    tables: Optional[List[str]] = Query(None),
+    full: bool = False,
+    services: ServiceContainer = Depends(get_services)
+):
+    """手动触发数据导出（Parquet / Arrow，后台执行，通过 /api/jobs/{job_id} 查询进度）"""
+    def do_export(progress):
+        results = services.export_service.export_all(tables=tables, full=full, progress=progress)
+        logger.info(f"Web API: 导出完成 {results}")
+        return {"exported": results}
+    
+    job, created = get_job_manager().submit('export', do_export)
+    return _job_response(job, created, "导出")
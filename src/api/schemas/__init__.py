@@ -1,14 +1,16 @@
 """API Schemas (Pydantic 模型)"""
 
 from src.api.schemas.article import ArticleResponse, ArticleListResponse
-from src.api.schemas.analysis import AnalysisResponse, AnalysisListResponse
-from src.api.schemas.common import TaskResponse, StatsResponse
+from src.api.schemas.analysis import AnalysisResponse, AnalysisListResponse, SummaryResponse
+from src.api.schemas.common import TaskResponse, JobResponse, StatsResponse
 
 __all__ = [
     'ArticleResponse',
     'ArticleListResponse',
     'AnalysisResponse',
     'AnalysisListResponse',
+    'SummaryResponse',
     'TaskResponse',
+    'JobResponse',
     'StatsResponse',
 ]
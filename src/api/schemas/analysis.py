@@ -28,3 +28,18 @@ class AnalysisListResponse(BaseModel):
     offset: int
     limit: int
     analyses: List[AnalysisResponse]
+
+
+class SummaryResponse(BaseModel):
+    """摘要响应模型"""
+    id: int
+    summary_date: datetime
+    summary_type: str
+    summary_content: str
+    article_count: int
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
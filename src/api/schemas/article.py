@@ -21,6 +21,9 @@ class ArticleResponse(BaseModel):
     category: Optional[str] = None
     tags: Optional[str] = None
     is_analyzed: bool = False
+    title_translated: Optional[str] = None
+    summary_translated: Optional[str] = None
+    translation_language: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -1,7 +1,8 @@
 """
 通用响应模型
 """
-from typing import Optional, Dict
+from datetime import datetime
+from typing import Any, Optional, Dict
 from pydantic import BaseModel
 
 
@@ -13,6 +14,19 @@ class TaskResponse(BaseModel):
     data: Optional[Dict] = None
 
 
+class JobResponse(BaseModel):
+    """后台作业响应模型"""
+    id: str
+    type: str
+    status: str
+    progress: Dict[str, int] = {}
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class StatsResponse(BaseModel):
     """统计信息响应模型"""
     total_articles: int
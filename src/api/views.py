@@ -220,47 +220,39 @@ def get_home_page() -> HTMLResponse:
                 }
             }
 
-            async function fetchNews() {
-                const statusDiv = document.getElementById('fetch-status');
+            // 提交后台作业并轮询进度，结束后由 onDone 给出结果文字
+            async function runJob(url, statusDiv, label, onDone) {
                 statusDiv.className = 'status info';
                 statusDiv.style.display = 'block';
-                statusDiv.innerHTML = '<span class="loading"></span> 正在抓取新闻，请稍候...';
+                statusDiv.innerHTML = `<span class="loading"></span> 正在提交${label}任务...`;
                 
                 try {
-                    const response = await fetch('/api/fetch', { method: 'POST' });
+                    const response = await fetch(url, { method: 'POST' });
                     const data = await response.json();
-                    
-                    if (data.success) {
-                        statusDiv.className = 'status success';
-                        statusDiv.textContent = `✅ ${data.message} (新增 ${data.data?.saved_count || 0} 篇)`;
-                    } else {
-                        statusDiv.className = 'status error';
-                        statusDiv.textContent = `❌ ${data.message}`;
+                    if (!response.ok || !data.success) {
+                        throw new Error(data.detail || data.message || response.statusText);
                     }
                     
-                    setTimeout(loadStats, 1000);
-                } catch (error) {
-                    statusDiv.className = 'status error';
-                    statusDiv.textContent = `❌ 请求失败: ${error.message}`;
-                }
-            }
-
-            async function analyzeNews() {
-                const statusDiv = document.getElementById('analysis-status');
-                statusDiv.className = 'status info';
-                statusDiv.style.display = 'block';
-                statusDiv.innerHTML = '<span class="loading"></span> 正在分析新闻，请稍候...';
-                
-                try {
-                    const response = await fetch('/api/analyze', { method: 'POST' });
-                    const data = await response.json();
+                    let job = data.data;
+                    while (job.status === 'queued' || job.status === 'running') {
+                        const progress = job.progress || {};
+                        const counter = progress.total ? ` (${progress.done || 0}/${progress.total})` : '';
+                        const state = job.status === 'queued' ? '排队中' : '进行中';
+                        statusDiv.innerHTML = `<span class="loading"></span> ${label}${state}${counter}，请稍候...`;
+                        await new Promise(resolve => setTimeout(resolve, 1000));
+                        const jobResponse = await fetch(`/api/jobs/${job.id}`);
+                        if (!jobResponse.ok) {
+                            throw new Error(`查询任务状态失败 (${jobResponse.status})`);
+                        }
+                        job = await jobResponse.json();
+                    }
                     
-                    if (data.success) {
+                    if (job.status === 'succeeded') {
                         statusDiv.className = 'status success';
-                        statusDiv.textContent = `✅ ${data.message} (分析 ${data.data?.analyzed_count || 0} 篇)`;
+                        statusDiv.textContent = `✅ ${onDone(job.result || {}, job.progress || {})}`;
                     } else {
                         statusDiv.className = 'status error';
-                        statusDiv.textContent = `❌ ${data.message}`;
+                        statusDiv.textContent = `❌ ${label}失败: ${job.error || '未知错误'}`;
                     }
                     
                     setTimeout(loadStats, 1000);
@@ -270,8 +262,33 @@ def get_home_page() -> HTMLResponse:
                 }
             }
 
+            function fetchNews() {
+                return runJob('/api/fetch', document.getElementById('fetch-status'), '抓取',
+                    (result, progress) => `成功抓取并保存 ${result.saved_count || 0} 篇新文章` +
+                        (progress.failed ? `（${progress.failed} 个源失败）` : ''));
+            }
+
+            function analyzeNews() {
+                return runJob('/api/analyze', document.getElementById('analysis-status'), '分析',
+                    (result, progress) => `成功分析 ${result.analyzed_count || 0} 篇文章` +
+                        (progress.failed ? `（${progress.failed} 篇失败，稍后重试）` : ''));
+            }
+
+            // 有新文章或分析完成时刷新统计（合并 2 秒内的多个事件）；实时推送不可用时按较长间隔兜底刷新
+            let statsTimer = null;
+            function scheduleStats() {
+                if (statsTimer) return;
+                statsTimer = setTimeout(() => { statsTimer = null; loadStats(); }, 2000);
+            }
+            if (window.EventSource) {
+                const feed = new EventSource('/api/feed');
+                feed.addEventListener('article', scheduleStats);
+                feed.addEventListener('analysis', scheduleStats);
+                feed.addEventListener('reset', scheduleStats);
+            }
+
             loadStats();
-            setInterval(loadStats, 30000);
+            setInterval(loadStats, 300000);
         </script>
     </body>
     </html>
@@ -392,6 +409,19 @@ def get_news_list_page(**kwargs) -> HTMLResponse:
             .btn-secondary:hover {
                 background: #cbd5e0;
             }
+            .new-banner {
+                display: none;
+                background: #ebf4ff;
+                color: #434190;
+                padding: 12px 20px;
+                border-radius: 10px;
+                margin-bottom: 15px;
+                text-align: center;
+                cursor: pointer;
+            }
+            .new-banner:hover {
+                background: #c3dafe;
+            }
             .news-list {
                 display: flex;
                 flex-direction: column;
@@ -435,6 +465,12 @@ def get_news_list_page(**kwargs) -> HTMLResponse:
             .news-title a:hover {
                 color: #667eea;
             }
+            .news-original {
+                font-size: 13px;
+                font-weight: 400;
+                color: #a0aec0;
+                margin-top: 4px;
+            }
             .news-meta {
                 display: flex;
                 gap: 15px;
@@ -607,6 +643,8 @@ def get_news_list_page(**kwargs) -> HTMLResponse:
                 </div>
             </div>
             
+            <div class="new-banner" id="new-banner" onclick="loadNews(1)"></div>
+            
             <div id="news-container">
                 <div class="loading">加载中...</div>
             </div>
@@ -724,6 +762,7 @@ def get_news_list_page(**kwargs) -> HTMLResponse:
                 if (category) params.set('category', category);
                 if (analyzed) params.set('analyzed', analyzed);
                 window.history.pushState({}, '', '/news?' + params.toString());
+                connectFeed(source, category);
                 
                 try {
                     const url = `/api/articles?${params.toString()}`;
@@ -748,13 +787,14 @@ def get_news_list_page(**kwargs) -> HTMLResponse:
                         const analyzedClass = article.is_analyzed ? 'analyzed' : '';
                         
                         html += `
-                            <div class="news-item ${analyzedClass}" onclick="window.open('${article.url}', '_blank')">
+                            <div class="news-item ${analyzedClass}" data-id="${article.id}" onclick="window.open('${article.url}', '_blank')">
                                 <div class="news-header">
                                     <div style="flex: 1;">
                                         <div class="news-title">
                                             <a href="${article.url}" target="_blank" onclick="event.stopPropagation()">
-                                                ${escapeHtml(article.title)}
+                                                ${escapeHtml(article.title_translated || article.title)}
                                             </a>
+                                            ${article.title_translated ? `<div class="news-original">${escapeHtml(article.title)}</div>` : ''}
                                         </div>
                                         <div class="news-meta">
                                             <span>📅 ${publishedDate}</span>
@@ -763,7 +803,7 @@ def get_news_list_page(**kwargs) -> HTMLResponse:
                                         </div>
                                     </div>
                                 </div>
-                                ${article.summary ? `<div class="news-summary">${escapeHtml(article.summary)}</div>` : ''}
+                                ${article.summary ? `<div class="news-summary">${escapeHtml(article.summary_translated || article.summary)}</div>` : ''}
                             </div>
                         `;
                     });
@@ -779,6 +819,42 @@ def get_news_list_page(**kwargs) -> HTMLResponse:
                 }
             }
             
+            // 实时推送：按当前来源 / 分类订阅，新文章提示刷新，分析完成时更新页面上对应文章的状态
+            let feed = null;
+            let feedKey = null;
+            let newCount = 0;
+            
+            function connectFeed(source, category) {
+                setNewCount(0);
+                const key = `${source}|${category}`;
+                if (!window.EventSource || (feed && feedKey === key)) return;
+                if (feed) feed.close();
+                
+                const params = new URLSearchParams();
+                if (source) params.set('source', source);
+                if (category) params.set('category', category);
+                feedKey = key;
+                feed = new EventSource('/api/feed?' + params.toString());
+                feed.addEventListener('article', () => setNewCount(newCount + 1));
+                feed.addEventListener('analysis', event => markAnalyzed(JSON.parse(event.data).article_id));
+                feed.addEventListener('reset', () => setNewCount(Math.max(newCount, 1)));
+            }
+            
+            function setNewCount(count) {
+                newCount = count;
+                const banner = document.getElementById('new-banner');
+                banner.textContent = `有 ${count} 条新文章，点击刷新`;
+                banner.style.display = count > 0 ? 'block' : 'none';
+            }
+            
+            function markAnalyzed(articleId) {
+                const item = document.querySelector(`.news-item[data-id="${articleId}"]`);
+                if (!item || item.classList.contains('analyzed')) return;
+                item.classList.add('analyzed');
+                item.querySelector('.news-meta').insertAdjacentHTML(
+                    'beforeend', '<span class="badge badge-analyzed">✓ 已分析</span>');
+            }
+            
             // 渲染分页
             function renderPagination(totalPages, current, total) {
                 if (totalPages <= 1) return '';
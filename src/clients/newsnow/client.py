@@ -54,6 +54,15 @@ class NewsNowClient:
         self.max_retries = max_retries
         self.min_retry_wait = min_retry_wait
         self.max_retry_wait = max_retry_wait
+        # 复用连接（同一主机的多次请求共享 keep-alive 连接）
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        if proxy_url:
+            self.session.proxies.update({"http": proxy_url, "https": proxy_url})
+
+    def close(self):
+        """关闭 HTTP 会话"""
+        self.session.close()
 
     def _build_url(self, platform_id: str, use_latest: bool = True) -> str:
         """构建请求 URL"""
@@ -73,19 +82,10 @@ class NewsNowClient:
             NewsNowRequestError: 请求失败
             NewsNowResponseError: 响应状态异常
         """
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
-
         last_error = None
         for attempt in range(self.max_retries + 1):
             try:
-                response = requests.get(
-                    url,
-                    proxies=proxies,
-                    headers=self.headers,
-                    timeout=self.timeout,
-                )
+                response = self.session.get(url, timeout=self.timeout)
                 response.raise_for_status()
 
                 data = json.loads(response.text)
@@ -7,9 +7,20 @@ from src.config.settings import (
     DatabaseConfig,
     CrawlerConfig,
     AIConfig,
+    AIEndpointConfig,
+    LLMCacheConfig,
+    ResponseCacheConfig,
+    LiveFeedConfig,
     AnalysisConfig,
+    PrefilterConfig,
+    BatchConfig,
+    SentimentConfig,
+    UsageConfig,
+    EmbeddingConfig,
+    TranslationConfig,
     ServiceConfig,
     WebConfig,
+    ExportConfig,
     PlatformConfig,
     NewsSource,
 )
@@ -21,9 +32,20 @@ __all__ = [
     'DatabaseConfig',
     'CrawlerConfig',
     'AIConfig',
+    'AIEndpointConfig',
+    'LLMCacheConfig',
+    'ResponseCacheConfig',
+    'LiveFeedConfig',
     'AnalysisConfig',
+    'PrefilterConfig',
+    'BatchConfig',
+    'SentimentConfig',
+    'UsageConfig',
+    'EmbeddingConfig',
+    'TranslationConfig',
     'ServiceConfig',
     'WebConfig',
+    'ExportConfig',
     'PlatformConfig',
     'NewsSource',
 ]
@@ -52,6 +52,17 @@ class CrawlerConfig:
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
 
+@dataclass
+class AIEndpointConfig:
+    """备用 AI 接口配置"""
+    provider: str
+    model: str
+    api_key: str = ""
+    base_url: str = ""
+    requests_per_minute: int = 60
+    tokens_per_minute: int = 0
+
+
 @dataclass
 class AIConfig:
     """AI 配置"""
@@ -62,6 +73,34 @@ class AIConfig:
     temperature: float = 0.7
     max_tokens: int = 2000
     timeout: int = 60
+    requests_per_minute: int = 60
+    tokens_per_minute: int = 0
+    max_retries: int = 4
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 60.0
+    fallbacks: List[AIEndpointConfig] = None
+    failover_retries: int = 1
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    hedge_min_delay: float = 1.0
+    hedge_default_delay: float = 15.0
+    prompt_cache: bool = True
+    stream: bool = False
+    
+    def __post_init__(self):
+        if self.fallbacks is None:
+            self.fallbacks = []
+
+
+@dataclass
+class LLMCacheConfig:
+    """LLM 结果缓存配置"""
+    enabled: bool = True
+    path: str = "data/llm_cache.db"
+    ttl_seconds: int = 604800
+    max_entries: int = 50000
+    max_mb: int = 200
 
 
 @dataclass
@@ -71,6 +110,113 @@ class AnalysisConfig:
     language: str = "中文"
     max_articles_per_analysis: int = 20
     analysis_interval: int = 3600
+    commit_batch_size: int = 20
+    lease_seconds: int = 900
+    max_attempts: int = 3
+    max_concurrency: int = 4
+    pack_size: int = 1
+    summary_chunk_size: int = 40
+    summary_fan_in: int = 8
+    summary_max_topics: int = 60
+    prompt_token_budget: int = 1500
+
+
+@dataclass
+class PrefilterConfig:
+    """AI 分析前的本地预筛配置"""
+    enabled: bool = True
+    keywords_file: str = "config/frequency_words.txt"
+    min_score: float = 0.2
+    duplicate_window_hours: int = 48
+    source_weights: Dict[str, float] = None
+    weights: Dict[str, float] = None
+    
+    def __post_init__(self):
+        if self.source_weights is None:
+            self.source_weights = {}
+        if self.weights is None:
+            self.weights = {}
+
+
+@dataclass
+class BatchConfig:
+    """批处理分析配置（积压文章通过提供商批处理接口以更低价格分析）"""
+    enabled: bool = False
+    job_dir: str = "data/batch_jobs"
+    max_requests: int = 10000
+    min_backlog: int = 1000
+    poll_interval: int = 600
+    lease_seconds: int = 108000
+
+
+@dataclass
+class SentimentConfig:
+    """入库时的本地词典情感打分配置"""
+    enabled: bool = True
+    lexicon_file: str = ""
+
+
+@dataclass
+class UsageConfig:
+    """LLM 调用用量记录配置（价格为每百万 token，键为模型名前缀）"""
+    enabled: bool = True
+    prices: Dict[str, Dict[str, float]] = None
+    batch_discount: float = 0.5
+    
+    def __post_init__(self):
+        if self.prices is None:
+            self.prices = {}
+
+
+@dataclass
+class EmbeddingConfig:
+    """文章向量索引配置（相关文章检索）"""
+    enabled: bool = False
+    backend: str = "hashing"
+    model: str = "text-embedding-3-small"
+    dim: int = 256
+    api_key: str = ""
+    base_url: str = ""
+    path: str = "data/embeddings"
+    batch_size: int = 256
+    ivf_min_rows: int = 50000
+    nlist: int = 0
+    nprobe: int = 16
+
+
+@dataclass
+class TranslationConfig:
+    """文章翻译配置（批量翻译 + 翻译记忆）"""
+    enabled: bool = False
+    target_language: str = "zh"
+    language_name: str = ""
+    batch_size: int = 40
+    max_batch_chars: int = 6000
+    summary_chars: int = 500
+    max_articles_per_run: int = 200
+
+
+@dataclass
+class ResponseCacheConfig:
+    """读接口响应缓存配置（ETag / 304）"""
+    enabled: bool = True
+    backend: str = "memory"
+    max_entries: int = 1000
+    path: str = "data/response_cache.db"
+    generation_path: str = "data/data_generation"
+    ttl_seconds: int = 300
+    max_age: int = 0
+
+
+@dataclass
+class LiveFeedConfig:
+    """实时推送配置（/api/feed，Server-Sent Events）"""
+    enabled: bool = True
+    poll_interval: float = 1.0
+    max_idle_interval: float = 30.0
+    heartbeat_interval: float = 15.0
+    backlog_limit: int = 500
+    queue_size: int = 1000
 
 
 @dataclass
@@ -86,6 +232,17 @@ class WebConfig:
     enabled: bool = True
     host: str = "0.0.0.0"
     port: int = 8000
+    job_workers: int = 2
+
+
+@dataclass
+class ExportConfig:
+    """数据导出配置"""
+    output_dir: str = "data/exports"
+    format: str = "parquet"  # parquet / arrow
+    batch_size: int = 5000
+    compression: str = "zstd"
+    change_lag_seconds: int = 300
 
 
 @dataclass
@@ -166,6 +323,17 @@ class Settings:
         # AI 配置
         ai_cfg = self._raw_config.get('ai', {})
         api_key = os.getenv('AI_API_KEY') or ai_cfg.get('api_key', '')
+        fallbacks = []
+        for f in ai_cfg.get('fallbacks') or []:
+            api_key_env = f.get('api_key_env')
+            fallbacks.append(AIEndpointConfig(
+                provider=f.get('provider', 'openai'),
+                model=f.get('model'),
+                api_key=(os.getenv(api_key_env) if api_key_env else None) or f.get('api_key', ''),
+                base_url=f.get('base_url', ''),
+                requests_per_minute=f.get('requests_per_minute', 60),
+                tokens_per_minute=f.get('tokens_per_minute', 0)
+            ))
         self.ai = AIConfig(
             provider=ai_cfg.get('provider', 'openai'),
             api_key=api_key,
@@ -173,7 +341,54 @@ class Settings:
             base_url=ai_cfg.get('base_url', ''),
             temperature=ai_cfg.get('temperature', 0.7),
             max_tokens=ai_cfg.get('max_tokens', 2000),
-            timeout=ai_cfg.get('timeout', 60)
+            timeout=ai_cfg.get('timeout', 60),
+            requests_per_minute=ai_cfg.get('requests_per_minute', 60),
+            tokens_per_minute=ai_cfg.get('tokens_per_minute', 0),
+            max_retries=ai_cfg.get('max_retries', 4),
+            retry_base_delay=ai_cfg.get('retry_base_delay', 1.0),
+            retry_max_delay=ai_cfg.get('retry_max_delay', 60.0),
+            fallbacks=fallbacks,
+            failover_retries=ai_cfg.get('failover_retries', 1),
+            hedge_enabled=ai_cfg.get('hedge_enabled', False),
+            hedge_percentile=ai_cfg.get('hedge_percentile', 95.0),
+            hedge_min_samples=ai_cfg.get('hedge_min_samples', 20),
+            hedge_min_delay=ai_cfg.get('hedge_min_delay', 1.0),
+            hedge_default_delay=ai_cfg.get('hedge_default_delay', 15.0),
+            prompt_cache=ai_cfg.get('prompt_cache', True),
+            stream=ai_cfg.get('stream', False)
+        )
+        
+        # LLM 结果缓存配置
+        cache_cfg = self._raw_config.get('llm_cache', {})
+        self.llm_cache = LLMCacheConfig(
+            enabled=cache_cfg.get('enabled', True),
+            path=cache_cfg.get('path', 'data/llm_cache.db'),
+            ttl_seconds=cache_cfg.get('ttl_seconds', 604800),
+            max_entries=cache_cfg.get('max_entries', 50000),
+            max_mb=cache_cfg.get('max_mb', 200)
+        )
+        
+        # 响应缓存配置
+        response_cache_cfg = self._raw_config.get('response_cache', {})
+        self.response_cache = ResponseCacheConfig(
+            enabled=response_cache_cfg.get('enabled', True),
+            backend=response_cache_cfg.get('backend', 'memory'),
+            max_entries=response_cache_cfg.get('max_entries', 1000),
+            path=response_cache_cfg.get('path', 'data/response_cache.db'),
+            generation_path=response_cache_cfg.get('generation_path', 'data/data_generation'),
+            ttl_seconds=response_cache_cfg.get('ttl_seconds', 300),
+            max_age=response_cache_cfg.get('max_age', 0)
+        )
+
+        # 实时推送配置
+        live_feed_cfg = self._raw_config.get('live_feed', {})
+        self.live_feed = LiveFeedConfig(
+            enabled=live_feed_cfg.get('enabled', True),
+            poll_interval=live_feed_cfg.get('poll_interval', 1.0),
+            max_idle_interval=live_feed_cfg.get('max_idle_interval', 30.0),
+            heartbeat_interval=live_feed_cfg.get('heartbeat_interval', 15.0),
+            backlog_limit=live_feed_cfg.get('backlog_limit', 500),
+            queue_size=live_feed_cfg.get('queue_size', 1000)
         )
         
         # 分析配置
@@ -182,7 +397,16 @@ class Settings:
             enabled=analysis_cfg.get('enabled', True),
             language=analysis_cfg.get('language', '中文'),
             max_articles_per_analysis=analysis_cfg.get('max_articles_per_analysis', 20),
-            analysis_interval=analysis_cfg.get('analysis_interval', 3600)
+            analysis_interval=analysis_cfg.get('analysis_interval', 3600),
+            commit_batch_size=analysis_cfg.get('commit_batch_size', 20),
+            lease_seconds=analysis_cfg.get('lease_seconds', 900),
+            max_attempts=analysis_cfg.get('max_attempts', 3),
+            max_concurrency=analysis_cfg.get('max_concurrency', 4),
+            pack_size=analysis_cfg.get('pack_size', 1),
+            summary_chunk_size=analysis_cfg.get('summary_chunk_size', 40),
+            summary_fan_in=analysis_cfg.get('summary_fan_in', 8),
+            summary_max_topics=analysis_cfg.get('summary_max_topics', 60),
+            prompt_token_budget=analysis_cfg.get('prompt_token_budget', 1500)
         )
         
         # 服务配置
@@ -197,7 +421,83 @@ class Settings:
         self.web = WebConfig(
             enabled=web_cfg.get('enabled', True),
             host=web_cfg.get('host', '0.0.0.0'),
-            port=web_cfg.get('port', 8000)
+            port=web_cfg.get('port', 8000),
+            job_workers=web_cfg.get('job_workers', 2)
+        )
+        
+        # 预筛配置
+        prefilter_cfg = self._raw_config.get('prefilter', {})
+        self.prefilter = PrefilterConfig(
+            enabled=prefilter_cfg.get('enabled', True),
+            keywords_file=prefilter_cfg.get('keywords_file', 'config/frequency_words.txt'),
+            min_score=prefilter_cfg.get('min_score', 0.2),
+            duplicate_window_hours=prefilter_cfg.get('duplicate_window_hours', 48),
+            source_weights=prefilter_cfg.get('source_weights') or {},
+            weights=prefilter_cfg.get('weights') or {}
+        )
+        
+        # 批处理分析配置
+        batch_cfg = self._raw_config.get('batch', {})
+        self.batch = BatchConfig(
+            enabled=batch_cfg.get('enabled', False),
+            job_dir=batch_cfg.get('job_dir', 'data/batch_jobs'),
+            max_requests=batch_cfg.get('max_requests', 10000),
+            min_backlog=batch_cfg.get('min_backlog', 1000),
+            poll_interval=batch_cfg.get('poll_interval', 600),
+            lease_seconds=batch_cfg.get('lease_seconds', 108000)
+        )
+        
+        # 本地情感分析配置
+        sentiment_cfg = self._raw_config.get('sentiment', {})
+        self.sentiment = SentimentConfig(
+            enabled=sentiment_cfg.get('enabled', True),
+            lexicon_file=sentiment_cfg.get('lexicon_file', '')
+        )
+        
+        # 向量索引配置
+        embedding_cfg = self._raw_config.get('embedding', {})
+        self.embedding = EmbeddingConfig(
+            enabled=embedding_cfg.get('enabled', False),
+            backend=embedding_cfg.get('backend', 'hashing'),
+            model=embedding_cfg.get('model', 'text-embedding-3-small'),
+            dim=embedding_cfg.get('dim', 256),
+            api_key=os.getenv('EMBEDDING_API_KEY') or embedding_cfg.get('api_key', ''),
+            base_url=embedding_cfg.get('base_url', ''),
+            path=embedding_cfg.get('path', 'data/embeddings'),
+            batch_size=embedding_cfg.get('batch_size', 256),
+            ivf_min_rows=embedding_cfg.get('ivf_min_rows', 50000),
+            nlist=embedding_cfg.get('nlist', 0),
+            nprobe=embedding_cfg.get('nprobe', 16)
+        )
+        
+        # 翻译配置
+        translation_cfg = self._raw_config.get('translation', {})
+        self.translation = TranslationConfig(
+            enabled=translation_cfg.get('enabled', False),
+            target_language=translation_cfg.get('target_language', 'zh'),
+            language_name=translation_cfg.get('language_name', ''),
+            batch_size=translation_cfg.get('batch_size', 40),
+            max_batch_chars=translation_cfg.get('max_batch_chars', 6000),
+            summary_chars=translation_cfg.get('summary_chars', 500),
+            max_articles_per_run=translation_cfg.get('max_articles_per_run', 200)
+        )
+        
+        # 用量记录配置
+        usage_cfg = self._raw_config.get('usage', {})
+        self.usage = UsageConfig(
+            enabled=usage_cfg.get('enabled', True),
+            prices=usage_cfg.get('prices') or {},
+            batch_discount=usage_cfg.get('batch_discount', 0.5)
+        )
+        
+        # 导出配置
+        export_cfg = self._raw_config.get('export', {})
+        self.export = ExportConfig(
+            output_dir=export_cfg.get('output_dir', 'data/exports'),
+            format=export_cfg.get('format', 'parquet'),
+            batch_size=export_cfg.get('batch_size', 5000),
+            compression=export_cfg.get('compression', 'zstd'),
+            change_lag_seconds=export_cfg.get('change_lag_seconds', 300)
         )
         
         # 平台配置
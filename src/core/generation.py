@@ -0,0 +1,88 @@
+"""
+数据版本号 - 抓取、分析等写入新数据后递增，用于让读接口的响应缓存失效
+
+版本号保存在一个小文件中（原子替换写入），抓取进程、定时任务和多个 Web 进程共享；
+读取方按文件 stat 判断是否变化，不访问数据库。
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+
+class DataGeneration:
+    """文件保存的数据版本号（线程安全）"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 版本号文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._stat: Optional[Tuple[int, int]] = None
+        self._value = '0'
+
+    def current(self) -> str:
+        """当前版本号（文件不存在时为 "0"）"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return '0'
+        key = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if key != self._stat:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._value = f.read().strip() or '0'
+                except FileNotFoundError:
+                    return '0'
+                self._stat = key
+            return self._value
+
+    def bump(self) -> str:
+        """
+        生成新版本号
+
+        版本号取时间戳加随机后缀而不是自增整数，多个进程同时递增也不会得到相同的值。
+        """
+        value = f"{time.time_ns():x}-{uuid.uuid4().hex[:8]}"
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(value)
+        os.replace(tmp_path, self.path)
+        return value
+
+
+_generations: Dict[str, DataGeneration] = {}
+_generations_lock = threading.Lock()
+
+
+def get_data_generation(path: str) -> DataGeneration:
+    """获取进程内共享的数据版本号（同一文件只创建一个实例）"""
+    path = os.path.abspath(path)
+    with _generations_lock:
+        if path not in _generations:
+            _generations[path] = DataGeneration(path)
+        return _generations[path]
+
+
+def notify_data_changed(config) -> None:
+    """
+    新数据已提交：递增数据版本号，使读接口的响应缓存失效
+
+    未配置或未启用响应缓存时不做任何事；写入失败只记录日志。
+    """
+    cache_config = getattr(config, 'response_cache', None)
+    if cache_config is None or not cache_config.enabled:
+        return
+    try:
+        get_data_generation(cache_config.generation_path).bump()
+    except OSError as e:
+        logger.warning(f"更新数据版本号失败: {e}")
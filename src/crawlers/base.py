@@ -39,3 +39,7 @@ class BaseCrawler(ABC):
             return article['content'][:200] + '...'
         
         return article.get('title', '无摘要')
+    
+    def close(self):
+        """释放抓取器持有的连接（默认无操作）"""
+        pass
@@ -33,6 +33,10 @@ class PlatformCrawler(BaseCrawler):
             proxy_url=proxy_url,
         )
 
+    def close(self):
+        """关闭 NewsNow 客户端的 HTTP 会话"""
+        self.client.close()
+
     def fetch_data(
         self,
         id_info: Union[str, Tuple[str, str]],
@@ -157,7 +161,7 @@ class PlatformCrawler(BaseCrawler):
             data = json.loads(response)
             now = datetime.now(self.timezone)
             
-            for item in data.get("items", []):
+            for rank, item in enumerate(data.get("items", []), 1):
                 title = item.get("title")
                 if title is None or isinstance(title, float) or not str(title).strip():
                     continue
@@ -180,6 +184,7 @@ class PlatformCrawler(BaseCrawler):
                     "language": "zh",
                     "category": "hot_platform",
                     "tags": platform_id,
+                    "hot_rank": rank,
                 }
                 
                 articles.append(article)
@@ -31,6 +31,10 @@ class RSSCrawler(BaseCrawler):
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': self.crawler_config.user_agent})
     
+    def close(self):
+        """关闭 HTTP 会话"""
+        self.session.close()
+    
     def fetch(self, source_config: Dict) -> List[Dict]:
         """
         抓取 RSS 源
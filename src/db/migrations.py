@@ -0,0 +1,219 @@
+"""
+数据库迁移
+
+create_all 只会创建缺失的表，不会修改已有表结构。这里维护一个按版本号
+顺序执行的迁移列表，已执行的版本记录在 schema_migrations 表中。
+每个迁移在独立事务中执行，并且需要是幂等的（新建数据库上 create_all
+已经创建了最新结构，迁移只需跳过已存在的部分）。
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from loguru import logger
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table,
+    func, inspect, insert, select, text, update,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from src.db.models import (
+    NewsArticle, NewsAnalysis, ArticleSource, ArticleCategory, ArticleTag, article_tags,
+)
+from src.db.repositories.dimension_repository import split_tags
+
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations',
+    _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200)),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _add_column_if_missing(conn: Connection, table: str, column: str, ddl_type: str):
+    """为已有表添加列（已存在则跳过）"""
+    columns = {c['name'] for c in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def _create_index_if_missing(conn: Connection, table: str, index: str, column: str):
+    """为已有表创建索引（已存在则跳过）"""
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})"))
+
+
+def _get_or_insert(conn: Connection, model, **values) -> int:
+    """查询维度行 ID，不存在则插入"""
+    conditions = [getattr(model, key) == value for key, value in values.items()]
+    existing = conn.execute(select(model.id).where(*conditions)).scalar()
+    if existing is not None:
+        return existing
+    return conn.execute(insert(model).values(**values)).inserted_primary_key[0]
+
+
+def _migrate_dimension_tables(conn: Connection):
+    """news_articles 增加 source_id / category_id，并从字符串字段回填维度表"""
+    _add_column_if_missing(conn, 'news_articles', 'source_id', 'INTEGER REFERENCES news_sources(id)')
+    _add_column_if_missing(conn, 'news_articles', 'category_id', 'INTEGER REFERENCES news_categories(id)')
+    _create_index_if_missing(conn, 'news_articles', 'ix_news_articles_source_id', 'source_id')
+    _create_index_if_missing(conn, 'news_articles', 'ix_news_articles_category_id', 'category_id')
+
+    # 新闻源：不同取值很少，逐个回填
+    pairs = conn.execute(
+        select(NewsArticle.source, NewsArticle.source_type)
+        .where(NewsArticle.source_id.is_(None))
+        .distinct()
+    ).all()
+    for name, source_type in pairs:
+        source_id = _get_or_insert(conn, ArticleSource, name=name, source_type=source_type)
+        conn.execute(
+            update(NewsArticle)
+            .where(NewsArticle.source == name)
+            .where(NewsArticle.source_type == source_type)
+            .where(NewsArticle.source_id.is_(None))
+            .values(source_id=source_id)
+        )
+
+    # 分类
+    categories = conn.execute(
+        select(NewsArticle.category)
+        .where(NewsArticle.category.isnot(None))
+        .where(NewsArticle.category_id.is_(None))
+        .distinct()
+    ).scalars().all()
+    for name in categories:
+        category_id = _get_or_insert(conn, ArticleCategory, name=name)
+        conn.execute(
+            update(NewsArticle)
+            .where(NewsArticle.category == name)
+            .where(NewsArticle.category_id.is_(None))
+            .values(category_id=category_id)
+        )
+
+    # 标签：按 id 分页拆分逗号分隔字符串，写入关联表
+    tag_ids: Dict[str, int] = {}
+    linked = select(article_tags.c.article_id)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(NewsArticle.id, NewsArticle.tags)
+            .where(NewsArticle.id > last_id)
+            .where(NewsArticle.tags.isnot(None))
+            .where(NewsArticle.id.not_in(linked))
+            .order_by(NewsArticle.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        links = []
+        for article_id, tags in rows:
+            for name in split_tags(tags):
+                if name not in tag_ids:
+                    tag_ids[name] = _get_or_insert(conn, ArticleTag, name=name)
+                links.append({'article_id': article_id, 'tag_id': tag_ids[name]})
+        if links:
+            conn.execute(insert(article_tags), links)
+        last_id = rows[-1][0]
+
+
+def _migrate_summary_periods(conn: Connection):
+    """news_summaries 增加增量摘要的时间范围和水位列"""
+    _add_column_if_missing(conn, 'news_summaries', 'period_start', 'TIMESTAMP')
+    _add_column_if_missing(conn, 'news_summaries', 'period_end', 'TIMESTAMP')
+    _add_column_if_missing(conn, 'news_summaries', 'last_article_id', 'INTEGER')
+    _create_index_if_missing(
+        conn, 'news_summaries', 'ix_news_summaries_last_article_id', 'last_article_id'
+    )
+
+
+def _migrate_article_importance(conn: Connection):
+    """news_articles 增加热榜排名和预筛重要度列（已有文章保持为空，按原顺序分析）"""
+    _add_column_if_missing(conn, 'news_articles', 'hot_rank', 'INTEGER')
+    _add_column_if_missing(conn, 'news_articles', 'importance', 'FLOAT')
+    _create_index_if_missing(conn, 'news_articles', 'ix_news_articles_importance', 'importance')
+
+
+def _migrate_article_sentiment(conn: Connection):
+    """news_articles 增加情感列：已分析文章取 AI 结果，其余由抓取服务按本地词典补算"""
+    _add_column_if_missing(conn, 'news_articles', 'sentiment', 'VARCHAR(20)')
+    _add_column_if_missing(conn, 'news_articles', 'sentiment_score', 'FLOAT')
+    _add_column_if_missing(conn, 'news_articles', 'sentiment_source', 'VARCHAR(20)')
+    _create_index_if_missing(conn, 'news_articles', 'ix_news_articles_sentiment', 'sentiment')
+
+    # 已有 AI 分析结果的文章（取最新一条带情感的分析）
+    latest = (
+        select(NewsAnalysis.sentiment, NewsAnalysis.sentiment_score)
+        .where(NewsAnalysis.article_id == NewsArticle.id)
+        .where(NewsAnalysis.sentiment.isnot(None))
+        .order_by(NewsAnalysis.id.desc())
+        .limit(1)
+    )
+    conn.execute(
+        update(NewsArticle)
+        .where(NewsArticle.sentiment.is_(None))
+        .where(latest.exists())
+        .values(
+            sentiment=latest.with_only_columns(NewsAnalysis.sentiment).scalar_subquery(),
+            sentiment_score=latest.with_only_columns(NewsAnalysis.sentiment_score).scalar_subquery(),
+            sentiment_source='llm'
+        )
+    )
+
+
+def _migrate_article_translation(conn: Connection):
+    """news_articles 增加标题和摘要译文列（已有文章由翻译任务按需补译）"""
+    _add_column_if_missing(conn, 'news_articles', 'title_translated', 'VARCHAR(1000)')
+    _add_column_if_missing(conn, 'news_articles', 'summary_translated', 'TEXT')
+    _add_column_if_missing(conn, 'news_articles', 'translation_language', 'VARCHAR(20)')
+    _create_index_if_missing(
+        conn, 'news_articles', 'ix_news_articles_translation_language', 'translation_language'
+    )
+
+
+def _migrate_article_updated_at(conn: Connection):
+    """news_articles 增加最后修改时间（增量导出水位），已有文章以抓取时间回填"""
+    _add_column_if_missing(conn, 'news_articles', 'updated_at', 'DATETIME')
+    _create_index_if_missing(conn, 'news_articles', 'ix_news_articles_updated_at', 'updated_at')
+    conn.execute(
+        update(NewsArticle)
+        .where(NewsArticle.updated_at.is_(None))
+        .values(updated_at=func.coalesce(NewsArticle.crawled_at, datetime.utcnow()))
+    )
+
+
+# (版本号, 说明, 迁移函数)，只能追加，不能修改已发布的版本
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, '新闻源/分类/标签维度表', _migrate_dimension_tables),
+    (2, '增量摘要时间范围和水位', _migrate_summary_periods),
+    (3, '文章热榜排名和预筛重要度', _migrate_article_importance),
+    (4, '文章情感（本地词典临时结果）', _migrate_article_sentiment),
+    (5, '文章标题和摘要译文', _migrate_article_translation),
+    (6, '文章最后修改时间', _migrate_article_updated_at),
+]
+
+
+def run_migrations(engine: Engine):
+    """执行所有未执行的迁移"""
+    _metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars().all())
+
+    for version, description, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info(f"执行数据库迁移 {version}: {description}")
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                insert(schema_migrations).values(
+                    version=version,
+                    description=description,
+                    applied_at=datetime.utcnow()
+                )
+            )
@@ -1,7 +1,16 @@
 """数据模型层"""
 from src.db.models.base import Base
+from src.db.models.article_source import ArticleSource
+from src.db.models.article_category import ArticleCategory
+from src.db.models.article_tag import ArticleTag, article_tags
 from src.db.models.news_article import NewsArticle
 from src.db.models.news_analysis import NewsAnalysis
 from src.db.models.news_summary import NewsSummary
+from src.db.models.analysis_lease import AnalysisLease
+from src.db.models.analysis_batch_job import AnalysisBatchJob
+from src.db.models.llm_usage import LLMUsage
+from src.db.models.translation_memory import TranslationMemory
+from src.db.models.summary_chunk import SummaryChunk
 
-__all__ = ["Base",'NewsArticle', 'NewsAnalysis', 'NewsSummary']
\ No newline at end of file
+__all__ = ["Base",'NewsArticle', 'NewsAnalysis', 'NewsSummary', 'AnalysisLease', 'AnalysisBatchJob', 'LLMUsage',
+           'TranslationMemory', 'SummaryChunk', 'ArticleSource', 'ArticleCategory', 'ArticleTag', 'article_tags']
\ No newline at end of file
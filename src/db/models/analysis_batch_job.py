@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+
+from src.db.models.base import Base
+
+class AnalysisBatchJob(Base):
+    """批处理分析任务（提交到 AI 提供商批处理接口的文章分析请求）"""
+    __tablename__ = 'analysis_batch_jobs'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner = Column(String(100), nullable=False)  # 任务中文章的租约持有者标识
+    provider = Column(String(50), nullable=False)  # AI 提供商
+    model = Column(String(100), nullable=False)  # 模型
+    remote_id = Column(String(200), index=True)  # 提供商侧的任务 ID
+    input_file = Column(String(500))  # 本地 JSONL 任务文件
+    article_ids = Column(Text, nullable=False)  # 任务包含的文章 ID（JSON 数组）
+    status = Column(String(20), default='submitted', index=True)  # submitted/ingested/failed
+    remote_status = Column(String(50))  # 提供商返回的原始状态
+    request_count = Column(Integer, default=0)  # 请求数
+    succeeded_count = Column(Integer, default=0)  # 成功写入的分析结果数
+    failed_count = Column(Integer, default=0)  # 失败的请求数
+    error = Column(Text)  # 任务级错误信息
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    completed_at = Column(DateTime)  # 结果写入完成时间
+    
+    def __repr__(self):
+        return f"<AnalysisBatchJob(id={self.id}, remote_id='{self.remote_id}', status='{self.status}')>"
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from src.db.models.base import Base
+
+class AnalysisLease(Base):
+    """分析任务租约（多个分析进程之间的工作队列）"""
+    __tablename__ = 'analysis_leases'
+    
+    article_id = Column(Integer, primary_key=True)  # 关联的文章ID
+    owner = Column(String(100), nullable=False)  # 持有租约的分析进程
+    expires_at = Column(DateTime, nullable=False, index=True)  # 租约过期时间，过期后可被重新领取
+    claimed_at = Column(DateTime, default=datetime.utcnow)  # 领取时间
+    attempts = Column(Integer, default=1)  # 领取次数
+    
+    def __repr__(self):
+        return f"<AnalysisLease(article_id={self.article_id}, owner='{self.owner}', expires_at={self.expires_at})>"
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+from src.db.models.base import Base
+
+class ArticleCategory(Base):
+    """分类维度表"""
+    __tablename__ = 'news_categories'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)  # 分类名称
+    
+    def __repr__(self):
+        return f"<ArticleCategory(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from src.db.models.base import Base
+
+class ArticleSource(Base):
+    """新闻源维度表"""
+    __tablename__ = 'news_sources'
+    __table_args__ = (
+        UniqueConstraint('name', 'source_type', name='uq_news_sources_name_type'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(200), nullable=False, index=True)  # 新闻源名称
+    source_type = Column(String(50))  # 来源类型：domestic/international
+    
+    def __repr__(self):
+        return f"<ArticleSource(id={self.id}, name='{self.name}', source_type='{self.source_type}')>"
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Table, ForeignKey
+from src.db.models.base import Base
+
+# 文章-标签关联表
+article_tags = Table(
+    'news_article_tags',
+    Base.metadata,
+    Column('article_id', Integer, ForeignKey('news_articles.id'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('news_tags.id'), primary_key=True, index=True),
+)
+
+
+class ArticleTag(Base):
+    """标签维度表"""
+    __tablename__ = 'news_tags'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)  # 标签名称
+    
+    def __repr__(self):
+        return f"<ArticleTag(id={self.id}, name='{self.name}')>"
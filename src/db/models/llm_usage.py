@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from datetime import datetime
+
+from src.db.models.base import Base
+
+class LLMUsage(Base):
+    """LLM 调用用量（每次调用一行）"""
+    __tablename__ = 'llm_usage'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    run_id = Column(String(100), index=True)  # 所属运行（一次分析 / 汇总 / 批处理任务）
+    operation = Column(String(50))  # analyze_single / analyze_packed / summarize_chunk 等
+    source = Column(String(100), index=True)  # 文章来源（多来源打包请求为空）
+    mode = Column(String(20))  # sync/stream/batch
+    provider = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    prompt_tokens = Column(Integer, default=0)  # 输入 token 总数（含缓存部分）
+    completion_tokens = Column(Integer, default=0)
+    cached_tokens = Column(Integer, default=0)  # 命中提示词缓存的输入 token
+    cache_write_tokens = Column(Integer, default=0)  # 写入提示词缓存的输入 token
+    latency_ms = Column(Integer)  # 调用耗时（批处理为空）
+    estimated_cost = Column(Float)  # 按配置价格估算的费用（未配置价格时为空）
+    
+    def __repr__(self):
+        return f"<LLMUsage(id={self.id}, model='{self.model}', run_id='{self.run_id}')>"
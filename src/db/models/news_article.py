@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.db.models.base import Base
+from src.db.models.article_tag import article_tags
 
 class NewsArticle(Base):
     """新闻文章模型"""
@@ -19,9 +21,33 @@ class NewsArticle(Base):
     category = Column(String(100))  # 分类
     tags = Column(String(500))  # 标签（逗号分隔）
     
+    # 维度外键（与上方字符串字段同步写入，用于去重列表和索引过滤）
+    source_id = Column(Integer, ForeignKey('news_sources.id'), index=True)
+    category_id = Column(Integer, ForeignKey('news_categories.id'), index=True)
+    
+    # 本地预筛
+    hot_rank = Column(Integer)  # 热榜最高排名（非热榜为空）
+    importance = Column(Float, index=True)  # 入库时计算的重要度，决定 AI 分析优先级
+    
+    # 情感：入库时由本地词典给出临时结果，AI 分析完成后覆盖
+    sentiment = Column(String(20), index=True)  # positive/negative/neutral
+    sentiment_score = Column(Float)  # 0-1，0.5 为中性
+    sentiment_source = Column(String(20))  # lexicon/llm
+    
+    # 翻译：外文文章的标题和摘要译文
+    title_translated = Column(String(1000))
+    summary_translated = Column(Text)
+    translation_language = Column(String(20), index=True)  # 译文语言，为空表示尚未翻译
+    
     # 状态字段
     is_analyzed = Column(Boolean, default=False, index=True)  # 是否已分析
     is_processed = Column(Boolean, default=False)  # 是否已处理
+    # 最后修改时间（增量导出按它识别变化的行），修改文章的仓库方法需同时更新
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    source_ref = relationship('ArticleSource')
+    category_ref = relationship('ArticleCategory')
+    tag_refs = relationship('ArticleTag', secondary=article_tags)
     
     def __repr__(self):
         return f"<NewsArticle(id={self.id}, title='{self.title[:50]}...', source='{self.source}')>"
\ No newline at end of file
@@ -9,9 +9,12 @@ class NewsSummary(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     summary_date = Column(DateTime, nullable=False, index=True)  # 摘要日期
-    summary_type = Column(String(50), default='daily')  # 摘要类型：daily/weekly
+    summary_type = Column(String(50), default='daily')  # 摘要类型：hourly/daily/weekly
     summary_content = Column(Text, nullable=False)  # 摘要内容
     article_count = Column(Integer, default=0)  # 包含的文章数量
+    period_start = Column(DateTime)  # 覆盖的抓取时间范围（UTC）
+    period_end = Column(DateTime)
+    last_article_id = Column(Integer, index=True)  # 增量摘要水位：已覆盖的最大文章 id
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     def __repr__(self):
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+
+from src.db.models.base import Base
+
+class SummaryChunk(Base):
+    """分块汇总结果（内容相同的文章块只汇总一次）"""
+    __tablename__ = 'summary_chunks'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chunk_hash = Column(String(64), unique=True, nullable=False)  # 块内容的 SHA-256
+    article_count = Column(Integer, nullable=False)  # 覆盖的文章数（含聚类报道数）
+    summary_content = Column(Text, nullable=False)  # 部分汇总（JSON 格式）
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f"<SummaryChunk(id={self.id}, article_count={self.article_count})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from datetime import datetime
+
+from src.db.models.base import Base
+
+class TranslationMemory(Base):
+    """翻译记忆（相同原文和目标语言只翻译一次）"""
+    __tablename__ = 'translation_memory'
+    __table_args__ = (
+        UniqueConstraint('source_hash', 'target_language', name='uq_translation_memory_source'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_hash = Column(String(64), nullable=False)  # 规范化原文的 SHA-256
+    target_language = Column(String(20), nullable=False)  # 目标语言代码
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    model = Column(String(100))  # 翻译使用的模型
+    hit_count = Column(Integer, default=0)  # 命中次数（不含首次翻译）
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<TranslationMemory(id={self.id}, target_language='{self.target_language}')>"
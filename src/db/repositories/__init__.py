@@ -2,5 +2,13 @@
 from src.db.repositories.article_repository import ArticleRepository
 from src.db.repositories.analysis_repository import AnalysisRepository
 from src.db.repositories.summary_repository import SummaryRepository
+from src.db.repositories.analysis_queue_repository import AnalysisQueueRepository
+from src.db.repositories.dimension_repository import DimensionRepository
+from src.db.repositories.batch_job_repository import BatchJobRepository
+from src.db.repositories.usage_repository import UsageRepository
+from src.db.repositories.translation_memory_repository import TranslationMemoryRepository
+from src.db.repositories.summary_chunk_repository import SummaryChunkRepository
 
-__all__ = ['ArticleRepository', 'AnalysisRepository', 'SummaryRepository']
\ No newline at end of file
+__all__ = ['ArticleRepository', 'AnalysisRepository', 'SummaryRepository', 'AnalysisQueueRepository',
+           'DimensionRepository', 'BatchJobRepository', 'UsageRepository', 'TranslationMemoryRepository',
+           'SummaryChunkRepository']
\ No newline at end of file
@@ -0,0 +1,200 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, desc, func, or_, literal
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.db.models import NewsArticle, AnalysisLease
+from src.core.exceptions import DatabaseException
+
+
+class AnalysisQueueRepository:
+    """
+    分析工作队列数据访问层
+
+    通过 analysis_leases 表为未分析文章加租约，保证多个分析进程
+    （或定时任务与手动触发重叠时）不会重复分析同一篇文章。
+    租约过期（进程崩溃、超时）后文章可被重新领取。
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def claim(
+        self,
+        owner: str,
+        limit: int,
+        lease_seconds: int = 900,
+        max_attempts: int = 3,
+        min_importance: Optional[float] = None
+    ) -> List[int]:
+        """
+        领取一批未分析的文章并提交租约
+
+        PostgreSQL 使用 SELECT ... FOR UPDATE SKIP LOCKED 锁定候选文章后写入租约；
+        SQLite 写操作串行执行，使用单条 INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+        原子地领取新文章或接管已过期的租约。
+
+        Args:
+            owner: 领取者标识
+            limit: 最多领取数量
+            lease_seconds: 租约时长（秒）
+            max_attempts: 最大领取次数，超过后不再领取（避免反复失败的文章无限重试）
+            min_importance: 只领取重要度不低于该值的文章（未打分的文章不受限制）
+
+        Returns:
+            领取到的文章 ID 列表（按重要度从高到低领取）
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=lease_seconds)
+
+        candidates = self._claimable(now, max_attempts, min_importance).order_by(
+            NewsArticle.importance.desc().nulls_last(),
+            desc(NewsArticle.published_at),
+            desc(NewsArticle.id)
+        ).limit(limit)
+
+        dialect = self.session.bind.dialect.name
+        try:
+            if dialect == 'postgresql':
+                article_ids = self.session.execute(
+                    candidates.with_for_update(skip_locked=True, of=NewsArticle)
+                ).scalars().all()
+                if not article_ids:
+                    self.session.commit()
+                    return []
+                stmt = postgresql.insert(AnalysisLease).values([
+                    {
+                        'article_id': article_id,
+                        'owner': owner,
+                        'expires_at': expires_at,
+                        'claimed_at': now,
+                        'attempts': 1
+                    }
+                    for article_id in article_ids
+                ])
+            elif dialect == 'sqlite':
+                stmt = sqlite.insert(AnalysisLease).from_select(
+                    ['article_id', 'owner', 'expires_at', 'claimed_at', 'attempts'],
+                    candidates.with_only_columns(
+                        NewsArticle.id,
+                        literal(owner),
+                        literal(expires_at),
+                        literal(now),
+                        literal(1)
+                    )
+                )
+            else:
+                raise DatabaseException(f"分析队列不支持的数据库类型: {dialect}")
+
+            # 新文章直接插入；已有租约仅在过期时接管
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AnalysisLease.article_id],
+                set_={
+                    'owner': stmt.excluded.owner,
+                    'expires_at': stmt.excluded.expires_at,
+                    'claimed_at': stmt.excluded.claimed_at,
+                    'attempts': AnalysisLease.attempts + 1
+                },
+                where=AnalysisLease.expires_at <= now
+            ).returning(AnalysisLease.article_id)
+
+            claimed = self.session.execute(stmt).scalars().all()
+            self.session.commit()
+            return list(claimed)
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    def count_claimable(self, max_attempts: int = 3, min_importance: Optional[float] = None) -> int:
+        """统计当前可领取的未分析文章数（积压量）"""
+        candidates = self._claimable(datetime.utcnow(), max_attempts, min_importance)
+        return self.session.execute(
+            select(func.count()).select_from(candidates.subquery())
+        ).scalar_one()
+
+    @staticmethod
+    def _claimable(now: datetime, max_attempts: int, min_importance: Optional[float]):
+        """可领取的未分析文章查询"""
+        # 已被有效租约占用或已达最大尝试次数的文章
+        blocked = select(AnalysisLease.article_id).where(
+            or_(
+                AnalysisLease.expires_at > now,
+                AnalysisLease.attempts >= max_attempts
+            )
+        )
+        candidates = (
+            select(NewsArticle.id)
+            .where(NewsArticle.is_analyzed == False)  # noqa: E712
+            .where(NewsArticle.id.not_in(blocked))
+        )
+        if min_importance is not None:
+            candidates = candidates.where(or_(
+                NewsArticle.importance.is_(None),
+                NewsArticle.importance >= min_importance
+            ))
+        return candidates
+
+    def take_below(self, min_importance: float, limit: int) -> List[Tuple[int, float]]:
+        """
+        取出重要度低于阈值的未分析文章并标记为已分析（不提交事务）
+
+        这些文章不会被 claim 领取，只需防止多个进程重复处理：
+        UPDATE ... WHERE is_analyzed = false RETURNING 只返回本次实际更新的行。
+
+        Returns:
+            本次标记的 (文章 ID, 重要度) 列表
+        """
+        active = select(AnalysisLease.article_id).where(
+            AnalysisLease.expires_at > datetime.utcnow()
+        )
+        candidates = (
+            select(NewsArticle.id)
+            .where(NewsArticle.is_analyzed == False)  # noqa: E712
+            .where(NewsArticle.importance < min_importance)
+            .where(NewsArticle.id.not_in(active))
+            .order_by(NewsArticle.id)
+            .limit(limit)
+        )
+        article_ids = self.session.execute(candidates).scalars().all()
+        if not article_ids:
+            return []
+        result = self.session.execute(
+            update(NewsArticle)
+            .where(NewsArticle.id.in_(article_ids))
+            .where(NewsArticle.is_analyzed == False)  # noqa: E712
+            .values(is_analyzed=True, updated_at=datetime.utcnow())
+            .returning(NewsArticle.id, NewsArticle.importance)
+        )
+        return [tuple(row) for row in result.all()]
+
+    def complete(self, article_ids: List[int]) -> int:
+        """
+        删除已完成文章的租约（不提交事务，与分析结果写入同一事务）
+
+        Returns:
+            删除的租约数量
+        """
+        if not article_ids:
+            return 0
+        result = self.session.execute(
+            delete(AnalysisLease).where(AnalysisLease.article_id.in_(article_ids))
+        )
+        return result.rowcount
+
+    def release(self, owner: str, article_ids: List[int]) -> int:
+        """
+        提前释放自己持有的租约（分析失败时），保留尝试次数（不提交事务）
+
+        Returns:
+            释放的租约数量
+        """
+        if not article_ids:
+            return 0
+        result = self.session.execute(
+            update(AnalysisLease)
+            .where(AnalysisLease.article_id.in_(article_ids))
+            .where(AnalysisLease.owner == owner)
+            .values(expires_at=datetime.utcnow())
+        )
+        return result.rowcount
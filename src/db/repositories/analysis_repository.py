@@ -1,7 +1,7 @@
-from src.db.models import NewsAnalysis
+from src.db.models import NewsAnalysis, NewsArticle
 from typing import List, Optional, Dict, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import asc, desc, func, insert
 
 
 class AnalysisRepository:
@@ -25,6 +25,62 @@ class AnalysisRepository:
             self.session.rollback()
             raise e
     
+    def add_many(self, analyses: List[Tuple[int, Dict]]) -> int:
+        """
+        批量保存分析结果（单条多行 INSERT，不提交事务）
+        
+        Args:
+            analyses: (文章 ID, 分析结果字典) 列表
+            
+        Returns:
+            插入的行数
+        """
+        if not analyses:
+            return 0
+        
+        # 多行 VALUES 以第一行的列为准，需要统一各行的键
+        keys = set()
+        for _, analysis_data in analyses:
+            keys.update(analysis_data.keys())
+        rows = [
+            {'article_id': article_id, **{key: analysis_data.get(key) for key in keys}}
+            for article_id, analysis_data in analyses
+        ]
+        self.session.execute(insert(NewsAnalysis).values(rows))
+        return len(rows)
+    
+    def get_feed(
+        self,
+        after_id: int,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 200
+    ) -> List[Dict]:
+        """
+        实时推送用：id 大于 after_id 的新分析结果及所属文章（按 id 升序）
+        
+        Returns:
+            字典列表，包含 id, article_id, sentiment, sentiment_score, created_at, title, source, category
+        """
+        query = (
+            self.session.query(
+                NewsAnalysis.id, NewsAnalysis.article_id, NewsAnalysis.sentiment,
+                NewsAnalysis.sentiment_score, NewsAnalysis.created_at,
+                NewsArticle.title, NewsArticle.source, NewsArticle.category
+            )
+            .join(NewsArticle, NewsArticle.id == NewsAnalysis.article_id)
+            .filter(NewsAnalysis.id > after_id)
+        )
+        if source:
+            query = query.filter(NewsArticle.source == source)
+        if category:
+            query = query.filter(NewsArticle.category == category)
+        return [dict(row._mapping) for row in query.order_by(asc(NewsAnalysis.id)).limit(limit)]
+    
+    def get_max_id(self) -> int:
+        """最大分析结果 ID（没有分析结果时为 0）"""
+        return self.session.query(func.max(NewsAnalysis.id)).scalar() or 0
+    
     def get_by_article_id(self, article_id: int) -> Optional[NewsAnalysis]:
         """根据文章 ID 获取分析结果"""
         return (
@@ -1,14 +1,17 @@
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Iterator, Sequence
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc, asc, func
+from sqlalchemy import or_, desc, asc, func, update, select
 from datetime import datetime, timedelta
-from src.db.models import NewsArticle
+from src.db.models import NewsArticle, ArticleCategory, ArticleTag, article_tags
+from src.db.streaming import iter_row_batches
+from src.db.repositories.dimension_repository import DimensionRepository, split_tags
 
 class ArticleRepository:
     """文章数据访问层"""
     
     def __init__(self, session: Session):
         self.session = session
+        self.dimensions = DimensionRepository(session)
     
     def add(self, article_data: Dict) -> Optional[NewsArticle]:
         """
@@ -41,18 +44,52 @@ class ArticleRepository:
             
             # 创建新文章
             article = NewsArticle(**article_data)
+            self._attach_dimensions(article)
             self.session.add(article)
             self.session.commit()
             self.session.refresh(article)
             return article
         except Exception as e:
             self.session.rollback()
+            # 回滚后缓存的维度对象可能已失效
+            self.dimensions = DimensionRepository(self.session)
             raise e
     
+    @staticmethod
+    def _category_id_subquery(category: str):
+        """分类名称 -> 分类 ID 的标量子查询"""
+        return (
+            select(ArticleCategory.id)
+            .where(ArticleCategory.name == category)
+            .scalar_subquery()
+        )
+    
+    def _attach_dimensions(self, article: NewsArticle):
+        """根据字符串字段关联新闻源、分类和标签维度"""
+        if article.source:
+            article.source_ref = self.dimensions.get_or_create_source(
+                article.source, article.source_type
+            )
+        if article.category:
+            article.category_ref = self.dimensions.get_or_create_category(article.category)
+        tag_names = split_tags(article.tags)
+        if tag_names:
+            article.tag_refs = self.dimensions.get_or_create_tags(tag_names)
+    
     def get_by_id(self, article_id: int) -> Optional[NewsArticle]:
         """根据 ID 获取文章"""
         return self.session.query(NewsArticle).filter_by(id=article_id).first()
     
+    def get_by_ids(self, article_ids: List[int]) -> List[NewsArticle]:
+        """根据 ID 列表批量获取文章"""
+        if not article_ids:
+            return []
+        return (
+            self.session.query(NewsArticle)
+            .filter(NewsArticle.id.in_(article_ids))
+            .all()
+        )
+    
     def get_unanalyzed(self, limit: int = 20) -> List[NewsArticle]:
         """获取未分析的文章"""
         return (
@@ -69,6 +106,7 @@ class ArticleRepository:
         source: Optional[str] = None,
         source_type: Optional[str] = None,
         category: Optional[str] = None,
+        tag: Optional[str] = None,
         analyzed: Optional[bool] = None,
         limit: int = 20,
         offset: int = 0,
@@ -99,8 +137,19 @@ class ArticleRepository:
         if source_type:
             query = query.filter(NewsArticle.source_type == source_type)
         
+        # 分类和标签通过维度 ID 过滤，走外键 / 关联表索引
         if category:
-            query = query.filter(NewsArticle.category == category)
+            query = query.filter(NewsArticle.category_id == self._category_id_subquery(category))
+        
+        if tag:
+            tag_id = (
+                select(ArticleTag.id)
+                .where(ArticleTag.name == tag)
+                .scalar_subquery()
+            )
+            query = query.filter(NewsArticle.id.in_(
+                select(article_tags.c.article_id).where(article_tags.c.tag_id == tag_id)
+            ))
         
         if analyzed is not None:
             query = query.filter(NewsArticle.is_analyzed == analyzed)
@@ -123,15 +172,221 @@ class ArticleRepository:
         
         return articles, total
     
+    def iter_batches_since(
+        self,
+        since: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        batch_size: int = 1000,
+        until: Optional[datetime] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        按 id 顺序流式读取文章（用于批量同步）
+        
+        Args:
+            since: 只返回抓取时间不早于该时间的文章
+            after_id: 只返回 id 大于该值的文章（断点续传）
+            fields: 需要的字段，None 表示全部
+            source: 新闻源过滤
+            category: 分类过滤
+            batch_size: 每批行数
+            until: 只返回抓取时间早于该时间的文章
+            
+        Yields:
+            每批文章字典列表
+        """
+        filters = []
+        if since is not None:
+            filters.append(NewsArticle.crawled_at >= since)
+        if until is not None:
+            filters.append(NewsArticle.crawled_at < until)
+        if source:
+            filters.append(NewsArticle.source == source)
+        if category:
+            filters.append(NewsArticle.category_id == self._category_id_subquery(category))
+        
+        return iter_row_batches(
+            self.session,
+            NewsArticle,
+            after_id=after_id,
+            columns=fields,
+            filters=filters,
+            batch_size=batch_size
+        )
+    
     def mark_as_analyzed(self, article_id: int) -> bool:
         """标记文章为已分析"""
         article = self.get_by_id(article_id)
         if article:
             article.is_analyzed = True
+            article.updated_at = datetime.utcnow()
             self.session.commit()
             return True
         return False
     
+    def mark_many_as_analyzed(self, article_ids: List[int]) -> int:
+        """
+        批量标记文章为已分析（单条 UPDATE ... WHERE id IN (...)，不提交事务）
+        
+        Returns:
+            更新的行数
+        """
+        if not article_ids:
+            return 0
+        result = self.session.execute(
+            update(NewsArticle)
+            .where(NewsArticle.id.in_(article_ids))
+            .values(is_analyzed=True, updated_at=datetime.utcnow())
+        )
+        return result.rowcount
+    
+    def get_without_sentiment(self, after_id: int = 0, limit: int = 1000) -> List[Dict]:
+        """
+        获取尚无情感结果的文章（id 大于 after_id，按 id 升序，用于分页补算）
+        
+        Returns:
+            文章字典列表，包含 id, title, summary
+        """
+        rows = (
+            self.session.query(NewsArticle.id, NewsArticle.title, NewsArticle.summary)
+            .filter(NewsArticle.id > after_id)
+            .filter(NewsArticle.sentiment.is_(None))
+            .order_by(asc(NewsArticle.id))
+            .limit(limit)
+            .all()
+        )
+        return [{'id': row.id, 'title': row.title, 'summary': row.summary} for row in rows]
+    
+    def set_sentiments(self, sentiments: List[Tuple[int, Optional[str], Optional[float]]], source: str = 'llm') -> int:
+        """
+        批量更新文章情感（按主键批量 UPDATE，不提交事务）
+        
+        Args:
+            sentiments: (文章 ID, 情感标签, 情感分数) 列表，标签为空的跳过
+            source: 情感来源（lexicon/llm）
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                'id': article_id,
+                'sentiment': label,
+                'sentiment_score': score,
+                'sentiment_source': source,
+                'updated_at': now
+            }
+            for article_id, label, score in sentiments
+            if label
+        ]
+        if rows:
+            self.session.execute(update(NewsArticle), rows)
+        return len(rows)
+    
+    def get_feed(
+        self,
+        after_id: int,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 200
+    ) -> List[Dict]:
+        """
+        实时推送用：id 大于 after_id 的新文章（按 id 升序）
+        
+        Returns:
+            文章字典列表，包含 id, title, title_translated, url, source, category,
+            published_at, crawled_at, importance, sentiment
+        """
+        query = self.session.query(
+            NewsArticle.id, NewsArticle.title, NewsArticle.title_translated, NewsArticle.url,
+            NewsArticle.source, NewsArticle.category, NewsArticle.published_at,
+            NewsArticle.crawled_at, NewsArticle.importance, NewsArticle.sentiment
+        ).filter(NewsArticle.id > after_id)
+        if source:
+            query = query.filter(NewsArticle.source == source)
+        if category:
+            query = query.filter(NewsArticle.category == category)
+        return [dict(row._mapping) for row in query.order_by(asc(NewsArticle.id)).limit(limit)]
+    
+    def get_max_id(self) -> int:
+        """最大文章 ID（没有文章时为 0）"""
+        return self.session.query(func.max(NewsArticle.id)).scalar() or 0
+    
+    def get_untranslated(self, target_language: str, limit: int = 200) -> List[Dict]:
+        """
+        获取需要翻译的文章（语言与目标语言不同且尚未翻译），新抓取的优先
+        
+        Returns:
+            文章字典列表，包含 id, title, summary
+        """
+        rows = (
+            self.session.query(NewsArticle.id, NewsArticle.title, NewsArticle.summary)
+            .filter(NewsArticle.language.isnot(None))
+            .filter(NewsArticle.language != target_language)
+            .filter(NewsArticle.translation_language.is_(None))
+            .order_by(desc(NewsArticle.id))
+            .limit(limit)
+            .all()
+        )
+        return [{'id': row.id, 'title': row.title, 'summary': row.summary} for row in rows]
+    
+    def set_translations(self, translations: List[Tuple[int, str, Optional[str]]], language: str) -> int:
+        """
+        批量写入文章译文（按主键批量 UPDATE，不提交事务）
+        
+        Args:
+            translations: (文章 ID, 标题译文, 摘要译文) 列表
+            language: 译文语言代码
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                'id': article_id,
+                'title_translated': title,
+                'summary_translated': summary,
+                'translation_language': language,
+                'updated_at': now
+            }
+            for article_id, title, summary in translations
+        ]
+        if rows:
+            self.session.execute(update(NewsArticle), rows)
+        return len(rows)
+    
+    def get_sentiment_distribution(self, since: Optional[datetime] = None) -> List[Dict]:
+        """按情感标签和来源统计文章数"""
+        query = self.session.query(
+            NewsArticle.sentiment,
+            NewsArticle.sentiment_source,
+            func.count(NewsArticle.id),
+            func.avg(NewsArticle.sentiment_score)
+        )
+        if since is not None:
+            query = query.filter(NewsArticle.crawled_at >= since)
+        rows = query.group_by(NewsArticle.sentiment, NewsArticle.sentiment_source).all()
+        return [
+            {
+                'sentiment': sentiment,
+                'source': source,
+                'count': count,
+                'avg_score': round(avg, 4) if avg is not None else None
+            }
+            for sentiment, source, count, avg in rows
+        ]
+    
+    def find_recent_titles(self, titles: List[str], since: datetime) -> set:
+        """返回给定标题中在 since 之后已入库的标题（用于识别重复转载）"""
+        if not titles:
+            return set()
+        rows = (
+            self.session.query(NewsArticle.title)
+            .filter(NewsArticle.title.in_(set(titles)))
+            .filter(NewsArticle.crawled_at >= since)
+            .distinct()
+            .all()
+        )
+        return {title for (title,) in rows}
+    
     def get_recent(self, days: int = 1, limit: int = 10) -> List[NewsArticle]:
         """获取最近 N 天的文章"""
         cutoff_date = datetime.now() - timedelta(days=days)
@@ -0,0 +1,53 @@
+from typing import List, Dict, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import desc
+from src.db.models import AnalysisBatchJob
+
+class BatchJobRepository:
+    """批处理分析任务数据访问层"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def add(self, job_data: Dict) -> AnalysisBatchJob:
+        """保存批处理任务"""
+        try:
+            job = AnalysisBatchJob(**job_data)
+            self.session.add(job)
+            self.session.commit()
+            self.session.refresh(job)
+            return job
+        except Exception as e:
+            self.session.rollback()
+            raise e
+    
+    def get_by_id(self, job_id: int) -> Optional[AnalysisBatchJob]:
+        """根据 ID 获取任务"""
+        return self.session.query(AnalysisBatchJob).filter_by(id=job_id).first()
+    
+    def list_active(self) -> List[AnalysisBatchJob]:
+        """获取已提交、尚未写入结果的任务（按提交顺序）"""
+        return (
+            self.session.query(AnalysisBatchJob)
+            .filter(AnalysisBatchJob.status == 'submitted')
+            .order_by(AnalysisBatchJob.id)
+            .all()
+        )
+    
+    def get_recent(self, limit: int = 20) -> List[AnalysisBatchJob]:
+        """获取最近的任务"""
+        return (
+            self.session.query(AnalysisBatchJob)
+            .order_by(desc(AnalysisBatchJob.id))
+            .limit(limit)
+            .all()
+        )
+    
+    def finish(self, job: AnalysisBatchJob, status: str, **fields) -> AnalysisBatchJob:
+        """更新任务的最终状态（不提交事务，与结果写入同一事务）"""
+        job.status = status
+        job.completed_at = datetime.utcnow()
+        for key, value in fields.items():
+            setattr(job, key, value)
+        return job
@@ -0,0 +1,76 @@
+from typing import List, Optional, Dict, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+
+from src.db.models import ArticleSource, ArticleCategory, ArticleTag
+
+
+def split_tags(tags: Optional[str]) -> List[str]:
+    """拆分逗号分隔的标签字符串（去空、去重、保持顺序）"""
+    if not tags:
+        return []
+    seen = []
+    for tag in tags.split(','):
+        tag = tag.strip()
+        if tag and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+class DimensionRepository:
+    """新闻源 / 分类 / 标签维度表数据访问层"""
+
+    def __init__(self, session: Session):
+        self.session = session
+        # 维度值很少且只增不删，按会话缓存以避免抓取时逐条查询
+        self._sources: Dict[Tuple[str, Optional[str]], ArticleSource] = {}
+        self._categories: Dict[str, ArticleCategory] = {}
+        self._tags: Dict[str, ArticleTag] = {}
+
+    def get_or_create_source(self, name: str, source_type: Optional[str] = None) -> ArticleSource:
+        """获取或创建新闻源"""
+        key = (name, source_type)
+        if key not in self._sources:
+            self._sources[key] = self._get_or_create(
+                ArticleSource, name=name, source_type=source_type
+            )
+        return self._sources[key]
+
+    def get_or_create_category(self, name: str) -> ArticleCategory:
+        """获取或创建分类"""
+        if name not in self._categories:
+            self._categories[name] = self._get_or_create(ArticleCategory, name=name)
+        return self._categories[name]
+
+    def get_or_create_tags(self, names: List[str]) -> List[ArticleTag]:
+        """批量获取或创建标签"""
+        result = []
+        for name in names:
+            if name not in self._tags:
+                self._tags[name] = self._get_or_create(ArticleTag, name=name)
+            result.append(self._tags[name])
+        return result
+
+    def list_sources(self) -> List[ArticleSource]:
+        """获取全部新闻源"""
+        return self.session.query(ArticleSource).order_by(ArticleSource.id).all()
+
+    def list_categories(self) -> List[str]:
+        """获取全部分类名称（排序）"""
+        return [
+            name for (name,) in
+            self.session.query(ArticleCategory.name).order_by(ArticleCategory.name).all()
+        ]
+
+    def _get_or_create(self, model, **values):
+        """查询维度行，不存在时在保存点内插入（并发插入冲突时重新查询）"""
+        instance = self.session.query(model).filter_by(**values).first()
+        if instance:
+            return instance
+        try:
+            with self.session.begin_nested():
+                instance = model(**values)
+                self.session.add(instance)
+        except IntegrityError:
+            instance = self.session.query(model).filter_by(**values).one()
+        return instance
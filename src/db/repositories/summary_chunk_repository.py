@@ -0,0 +1,61 @@
+from typing import List, Dict, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert
+from src.db.models import SummaryChunk
+
+class SummaryChunkRepository:
+    """分块汇总结果数据访问层"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def get_many(self, chunk_hashes: List[str]) -> Dict[str, Tuple[int, str]]:
+        """
+        按块哈希批量查询
+        
+        Returns:
+            {块哈希: (覆盖文章数, 部分汇总 JSON)}，未命中的不在结果中
+        """
+        result = {}
+        # 分批查询，避免 IN 参数过多
+        for start in range(0, len(chunk_hashes), 500):
+            rows = (
+                self.session.query(SummaryChunk.chunk_hash, SummaryChunk.article_count, SummaryChunk.summary_content)
+                .filter(SummaryChunk.chunk_hash.in_(chunk_hashes[start:start + 500]))
+                .all()
+            )
+            result.update({row.chunk_hash: (row.article_count, row.summary_content) for row in rows})
+        return result
+    
+    def add_many(self, entries: List[Tuple[str, int, str]]) -> int:
+        """
+        批量写入（单条多行 INSERT，不提交事务），已存在的块跳过
+        
+        Args:
+            entries: (块哈希, 覆盖文章数, 部分汇总 JSON) 列表
+            
+        Returns:
+            插入的行数
+        """
+        # 其他进程可能刚写入相同的块，插入前再过滤一次
+        existing = set(self.get_many([chunk_hash for chunk_hash, _, _ in entries]))
+        now = datetime.utcnow()
+        rows = [
+            {
+                'chunk_hash': chunk_hash,
+                'article_count': article_count,
+                'summary_content': summary_content,
+                'created_at': now,
+            }
+            for chunk_hash, article_count, summary_content in entries
+            if chunk_hash not in existing
+        ]
+        if rows:
+            self.session.execute(insert(SummaryChunk).values(rows))
+        return len(rows)
+    
+    def delete_before(self, cutoff: datetime) -> int:
+        """删除 cutoff 之前写入的块（不提交事务）"""
+        result = self.session.execute(delete(SummaryChunk).where(SummaryChunk.created_at < cutoff))
+        return result.rowcount
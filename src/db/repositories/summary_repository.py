@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from datetime import datetime
 from src.db.models import NewsSummary
 
@@ -32,3 +32,50 @@ class SummaryRepository:
             )
             .first()
         )
+    
+    def list_by_date(self, summary_date: datetime, summary_type: str = 'hourly') -> List[NewsSummary]:
+        """获取某日期的全部摘要（按生成顺序）"""
+        return (
+            self.session.query(NewsSummary)
+            .filter_by(summary_date=summary_date, summary_type=summary_type)
+            .order_by(NewsSummary.id)
+            .all()
+        )
+    
+    def get_latest(self, summary_type: str = 'daily') -> Optional[NewsSummary]:
+        """获取最新的摘要"""
+        return (
+            self.session.query(NewsSummary)
+            .filter_by(summary_type=summary_type)
+            .order_by(desc(NewsSummary.summary_date), desc(NewsSummary.id))
+            .first()
+        )
+    
+    def get_watermark(self, summary_type: str = 'hourly') -> Optional[int]:
+        """获取增量摘要水位（已覆盖的最大文章 id），没有记录时返回 None"""
+        return (
+            self.session.query(func.max(NewsSummary.last_article_id))
+            .filter(NewsSummary.summary_type == summary_type)
+            .scalar()
+        )
+    
+    def upsert(self, summary_data: Dict) -> NewsSummary:
+        """保存摘要，同一日期和类型已存在时覆盖"""
+        try:
+            summary = self.get_by_date(
+                summary_data['summary_date'],
+                summary_data.get('summary_type', 'daily')
+            )
+            if summary is None:
+                summary = NewsSummary(**summary_data)
+                self.session.add(summary)
+            else:
+                for key, value in summary_data.items():
+                    setattr(summary, key, value)
+                summary.created_at = datetime.utcnow()
+            self.session.commit()
+            self.session.refresh(summary)
+            return summary
+        except Exception as e:
+            self.session.rollback()
+            raise e
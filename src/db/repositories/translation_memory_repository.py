@@ -0,0 +1,76 @@
+from typing import List, Dict, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from src.db.models import TranslationMemory
+
+class TranslationMemoryRepository:
+    """翻译记忆数据访问层"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def get_many(self, source_hashes: List[str], target_language: str) -> Dict[str, str]:
+        """
+        按原文哈希批量查询译文
+        
+        Returns:
+            {原文哈希: 译文}，未命中的不在结果中
+        """
+        result = {}
+        # 分批查询，避免 IN 参数过多
+        for start in range(0, len(source_hashes), 500):
+            rows = (
+                self.session.query(TranslationMemory.source_hash, TranslationMemory.translated_text)
+                .filter(TranslationMemory.target_language == target_language)
+                .filter(TranslationMemory.source_hash.in_(source_hashes[start:start + 500]))
+                .all()
+            )
+            result.update({row.source_hash: row.translated_text for row in rows})
+        return result
+    
+    def touch(self, source_hashes: List[str], target_language: str) -> int:
+        """记录命中（命中次数 +1，不提交事务）"""
+        updated = 0
+        for start in range(0, len(source_hashes), 500):
+            result = self.session.execute(
+                update(TranslationMemory)
+                .where(TranslationMemory.target_language == target_language)
+                .where(TranslationMemory.source_hash.in_(source_hashes[start:start + 500]))
+                .values(hit_count=TranslationMemory.hit_count + 1, last_used_at=datetime.utcnow())
+            )
+            updated += result.rowcount
+        return updated
+    
+    def add_many(self, entries: List[Tuple[str, str, str]], target_language: str, model: str = None) -> int:
+        """
+        批量写入译文（单条多行 INSERT，不提交事务），已存在的原文跳过
+        
+        Args:
+            entries: (原文哈希, 原文, 译文) 列表
+            target_language: 目标语言代码
+            model: 翻译使用的模型
+            
+        Returns:
+            插入的行数
+        """
+        # 其他进程可能刚写入相同原文，插入前再过滤一次
+        existing = set(self.get_many([source_hash for source_hash, _, _ in entries], target_language))
+        now = datetime.utcnow()
+        rows = [
+            {
+                'source_hash': source_hash,
+                'target_language': target_language,
+                'source_text': source_text,
+                'translated_text': translated_text,
+                'model': model,
+                'hit_count': 0,
+                'created_at': now,
+                'last_used_at': now,
+            }
+            for source_hash, source_text, translated_text in entries
+            if source_hash not in existing
+        ]
+        if rows:
+            self.session.execute(insert(TranslationMemory).values(rows))
+        return len(rows)
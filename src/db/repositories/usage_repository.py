@@ -0,0 +1,77 @@
+from typing import List, Dict, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, desc
+from src.db.models import LLMUsage
+
+# 汇总维度 -> 分组表达式
+GROUP_BY_COLUMNS = {
+    'run': LLMUsage.run_id,
+    'source': LLMUsage.source,
+    'day': func.date(LLMUsage.created_at),
+    'model': LLMUsage.model,
+    'operation': LLMUsage.operation,
+    'mode': LLMUsage.mode,
+}
+
+class UsageRepository:
+    """LLM 调用用量数据访问层"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def add_many(self, records: List[Dict]) -> int:
+        """
+        批量保存用量记录（单条多行 INSERT，不提交事务）
+        
+        Args:
+            records: 用量字典列表，键与 LLMUsage 的列一致
+            
+        Returns:
+            插入的行数
+        """
+        if not records:
+            return 0
+        self.session.execute(insert(LLMUsage).values(records))
+        return len(records)
+    
+    def summarize(self, since: Optional[datetime] = None, group_by: str = 'day') -> List[Dict]:
+        """
+        按维度汇总用量
+        
+        Args:
+            since: 起始时间（UTC）
+            group_by: 汇总维度 run/source/day/model/operation/mode
+            
+        Returns:
+            汇总列表，按估算费用降序（按天汇总时按日期降序）
+        """
+        if group_by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"不支持的汇总维度: {group_by}")
+        key = GROUP_BY_COLUMNS[group_by].label('key')
+        cost = func.sum(LLMUsage.estimated_cost).label('cost')
+        query = self.session.query(
+            key,
+            func.count(LLMUsage.id),
+            func.sum(LLMUsage.prompt_tokens),
+            func.sum(LLMUsage.completion_tokens),
+            func.sum(LLMUsage.cached_tokens),
+            func.avg(LLMUsage.latency_ms),
+            cost
+        )
+        if since is not None:
+            query = query.filter(LLMUsage.created_at >= since)
+        query = query.group_by(key)
+        query = query.order_by(desc(key) if group_by == 'day' else desc(cost))
+        return [
+            {
+                'key': str(value) if value is not None else None,
+                'calls': calls,
+                'prompt_tokens': prompt or 0,
+                'completion_tokens': completion or 0,
+                'cached_tokens': cached or 0,
+                'avg_latency_ms': round(latency) if latency is not None else None,
+                'estimated_cost': round(total, 6) if total is not None else None
+            }
+            for value, calls, prompt, completion, cached, latency, total in query.all()
+        ]
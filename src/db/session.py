@@ -8,6 +8,7 @@ from contextlib import contextmanager
 from typing import Generator, Optional
 
 from src.db.models import Base
+from src.db.migrations import run_migrations
 
 
 class DatabaseManager:
@@ -26,8 +27,9 @@ class DatabaseManager:
             autocommit=False,
             autoflush=False
         )
-        # 创建表
+        # 创建表并执行未完成的迁移
         Base.metadata.create_all(self.engine)
+        run_migrations(self.engine)
     
     def get_session(self) -> Session:
         """获取数据库会话"""
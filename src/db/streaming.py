@@ -0,0 +1,72 @@
+"""
+流式读取工具（服务端游标 + yield_per）
+"""
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def iter_row_batches(
+    session: Session,
+    model,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Sequence] = None,
+    batch_size: int = 1000
+) -> Iterator[List[Dict]]:
+    """
+    按主键顺序分批流式读取一张表
+
+    使用 yield_per 开启服务端游标（PostgreSQL）/ 增量 fetch（SQLite），
+    只查询列而不构造 ORM 对象，内存占用与 batch_size 成正比，与表大小无关。
+
+    Args:
+        session: 数据库会话
+        model: ORM 模型类（需有自增 id 主键）
+        after_id: 只读取 id 大于该值的行
+        columns: 需要的列名，None 表示全部列
+        filters: 额外的过滤条件
+        batch_size: 每批行数
+
+    Yields:
+        每批行数据（字典列表）
+    """
+    table_columns = model.__table__.columns
+    if columns:
+        selected = [table_columns[name] for name in columns]
+    else:
+        selected = list(table_columns)
+
+    stmt = select(*selected).order_by(model.id)
+    if after_id is not None:
+        stmt = stmt.where(model.id > after_id)
+    for condition in filters or []:
+        stmt = stmt.where(condition)
+
+    result = session.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield [dict(row._mapping) for row in partition]
+    finally:
+        result.close()
+
+
+def iter_rows(
+    session: Session,
+    model,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Sequence] = None,
+    batch_size: int = 1000
+) -> Iterator[Dict]:
+    """逐行流式读取，参数同 iter_row_batches"""
+    for batch in iter_row_batches(
+        session,
+        model,
+        after_id=after_id,
+        columns=columns,
+        filters=filters,
+        batch_size=batch_size
+    ):
+        yield from batch
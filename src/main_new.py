@@ -2,15 +2,17 @@
 新闻抓取与分析服务主程序（重构版）
 """
 import argparse
+from datetime import datetime, timedelta
 from loguru import logger
 
 from src.config import get_settings
 from src.core.logging import setup_logging
 from src.db import init_db, get_db_manager
-from src.db.repositories import ArticleRepository, AnalysisRepository, SummaryRepository
-from src.crawlers import RSSCrawler, PlatformCrawler
+from src.db.repositories import ArticleRepository, AnalysisRepository, SummaryRepository, UsageRepository
 from src.analyzers import AIAnalyzer
-from src.services import CrawlerService, AnalysisService
+from src.services import (
+    AnalysisService, BatchAnalysisService, EmbeddingService, ServiceContainer, TranslationService
+)
 from src.tasks import TaskScheduler
 
 
@@ -40,29 +42,30 @@ class NewsService:
         init_db(database_url)
         self.db_manager = get_db_manager()
         
-        # 初始化抓取器
-        self.rss_crawler = RSSCrawler(self.config)
-        self.platform_crawler = PlatformCrawler(self.config)
-        
-        # 初始化分析器
-        self.analyzer = AIAnalyzer(self.config)
-        
-        # 初始化服务层
-        self.crawler_service = CrawlerService(
-            db_manager=self.db_manager,
-            rss_crawler=self.rss_crawler,
-            platform_crawler=self.platform_crawler,
-            config=self.config
-        )
-        
-        self.analysis_service = AnalysisService(
-            db_manager=self.db_manager,
-            analyzer=self.analyzer,
-            config=self.config
-        )
+        # 抓取器、分析器和服务只创建一次，定时任务各次运行共用其中的连接
+        self.services = ServiceContainer(self.config, self.db_manager)
+        self.crawler_service = self.services.crawler_service
+        self.embedding_service = self.services.embedding_service
+        self.export_service = self.services.export_service
         
         logger.info("新闻服务初始化完成")
     
+    @property
+    def analyzer(self) -> AIAnalyzer:
+        return self.services.analyzer
+    
+    @property
+    def analysis_service(self) -> AnalysisService:
+        return self.services.analysis_service
+    
+    @property
+    def batch_service(self) -> BatchAnalysisService:
+        return self.services.batch_service
+    
+    @property
+    def translation_service(self) -> TranslationService:
+        return self.services.translation_service
+    
     def fetch_news(self) -> int:
         """抓取新闻"""
         logger.info("开始抓取新闻...")
@@ -78,6 +81,34 @@ class NewsService:
         logger.info("生成每日摘要...")
         return self.analysis_service.generate_daily_summary()
     
+    def batch_analyze(self, limit: int = None, wait: bool = False) -> int:
+        """通过批处理接口分析积压文章"""
+        logger.info("开始批处理分析...")
+        return self.batch_service.run(limit=limit, wait=wait)
+    
+    def build_embeddings(self, limit: int = None) -> int:
+        """为尚未写入向量索引的文章计算向量"""
+        logger.info("开始构建向量索引...")
+        if self.embedding_service is None:
+            self.embedding_service = EmbeddingService(db_manager=self.db_manager, config=self.config)
+        return self.embedding_service.index_pending(limit=limit)
+    
+    def translate_news(self, limit: int = None) -> int:
+        """翻译外文文章的标题和摘要"""
+        logger.info("开始翻译文章...")
+        return self.translation_service.translate_pending(limit=limit)
+    
+    def usage_report(self, days: int = 7, group_by: str = 'day') -> list:
+        """汇总最近若干天的 LLM 调用用量"""
+        since = datetime.utcnow() - timedelta(days=days)
+        with self.db_manager.session_scope() as session:
+            return UsageRepository(session).summarize(since, group_by)
+    
+    def export_data(self, tables=None, full: bool = False) -> dict:
+        """导出数据"""
+        logger.info("开始导出数据...")
+        return self.export_service.export_all(tables=tables, full=full)
+    
     def run_once(self):
         """运行一次（抓取+分析）"""
         logger.info("=" * 50)
@@ -98,12 +129,19 @@ class NewsService:
         scheduler = TaskScheduler(
             crawler_service=self.crawler_service,
             analysis_service=self.analysis_service,
-            config=self.config
+            config=self.config,
+            batch_service=self.batch_service,
+            embedding_service=self.embedding_service,
+            translation_service=self.translation_service
         )
         
         scheduler.setup_schedules()
         scheduler.run()
     
+    def close(self):
+        """释放抓取器和分析器持有的连接"""
+        self.services.close()
+    
     def run(self):
         """运行服务"""
         # 先执行一次
@@ -119,15 +157,49 @@ def main():
     parser = argparse.ArgumentParser(description='新闻抓取与分析服务')
     parser.add_argument(
         '--mode',
-        choices=['all', 'fetch', 'analyze', 'scheduler', 'web'],
+        choices=['all', 'fetch', 'analyze', 'batch', 'scheduler', 'web', 'export', 'usage', 'embed', 'translate'],
         default='all',
-        help='运行模式: all(全部), fetch(仅抓取), analyze(仅分析), scheduler(定时任务), web(Web服务)'
+        help='运行模式: all(全部), fetch(仅抓取), analyze(仅分析), batch(批处理分析积压文章), '
+             'scheduler(定时任务), web(Web服务), export(数据导出), usage(LLM 用量报告), '
+             'embed(构建相关文章向量索引), translate(翻译外文文章)'
     )
     parser.add_argument(
         '--once',
         action='store_true',
         help='只运行一次（不启动定时任务）'
     )
+    parser.add_argument(
+        '--tables',
+        nargs='+',
+        help='导出的表（默认全部）: news_articles news_analysis news_summaries'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='全量导出（忽略上次导出位置）'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='批处理分析最多提交的文章数（默认使用配置）；embed / translate 模式最多处理的文章数'
+    )
+    parser.add_argument(
+        '--wait',
+        action='store_true',
+        help='批处理分析时等待任务结束并写入结果'
+    )
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=7,
+        help='用量报告统计最近的天数（默认: 7）'
+    )
+    parser.add_argument(
+        '--group-by',
+        choices=['day', 'run', 'source', 'model', 'operation', 'mode'],
+        default='day',
+        help='用量报告的汇总维度（默认: day）'
+    )
     parser.add_argument(
         '--config',
         default='app_config.yaml',
@@ -136,38 +208,81 @@ def main():
     
     args = parser.parse_args()
     
-    service = NewsService(config_path=args.config)
-    
     if args.mode == 'web':
-        # 启动 Web 服务
+        # 启动 Web 服务（应用启动时自行创建服务容器，这里不初始化 NewsService）
+        config = get_settings(args.config)
         logger.info("启动 Web 服务...")
         import uvicorn
         
-        web_config = service.config.web
+        web_config = config.web
         logger.info(f"Web 服务地址: http://{web_config.host}:{web_config.port}")
         uvicorn.run("src.api.app:app", host=web_config.host, port=web_config.port, reload=False)
+        return
     
-    elif args.mode == 'fetch':
-        # 仅执行新闻抓取
-        logger.info("执行新闻抓取任务...")
-        service.fetch_news()
-    
-    elif args.mode == 'analyze':
-        # 仅执行 AI 分析
-        logger.info("执行 AI 分析任务...")
-        service.analyze_news()
-    
-    elif args.mode == 'scheduler':
-        # 仅启动定时任务
-        logger.info("启动定时任务调度器...")
-        service.run_scheduler()
-    
-    elif args.mode == 'all':
-        # 全部功能
-        if args.once:
-            service.run_once()
-        else:
-            service.run()
+    service = NewsService(config_path=args.config)
+    
+    try:
+        if args.mode == 'fetch':
+            # 仅执行新闻抓取
+            logger.info("执行新闻抓取任务...")
+            service.fetch_news()
+        
+        elif args.mode == 'analyze':
+            # 仅执行 AI 分析
+            logger.info("执行 AI 分析任务...")
+            service.analyze_news()
+        
+        elif args.mode == 'batch':
+            # 批处理分析：提交积压文章并写入已结束任务的结果
+            logger.info("执行批处理分析任务...")
+            ingested = service.batch_analyze(limit=args.limit, wait=args.wait)
+            logger.info(f"写入 {ingested} 条批处理分析结果")
+        
+        elif args.mode == 'export':
+            # 数据导出
+            logger.info("执行数据导出任务...")
+            results = service.export_data(tables=args.tables, full=args.full)
+            for table, count in results.items():
+                logger.info(f"{table}: 导出 {count} 行")
+        
+        elif args.mode == 'embed':
+            # 向量化尚未写入索引的文章
+            written = service.build_embeddings(limit=args.limit)
+            logger.info(f"向量索引新增 {written} 篇文章")
+        
+        elif args.mode == 'translate':
+            # 翻译外文文章（不受 translation.enabled 限制，便于手动补翻译）
+            translated = service.translate_news(limit=args.limit)
+            logger.info(f"完成翻译 {translated} 篇文章")
+        
+        elif args.mode == 'usage':
+            # LLM 用量和估算费用报告
+            rows = service.usage_report(days=args.days, group_by=args.group_by)
+            print(f"最近 {args.days} 天 LLM 用量（按 {args.group_by} 汇总）")
+            print(f"{'分组':<36}{'调用':>8}{'输入':>12}{'输出':>12}{'缓存命中':>12}{'平均耗时ms':>12}{'估算费用':>12}")
+            for row in rows:
+                cost = f"{row['estimated_cost']:.4f}" if row['estimated_cost'] is not None else '-'
+                latency = row['avg_latency_ms'] if row['avg_latency_ms'] is not None else '-'
+                print(
+                    f"{str(row['key'] or '-'):<36}{row['calls']:>8}{row['prompt_tokens']:>12}"
+                    f"{row['completion_tokens']:>12}{row['cached_tokens']:>12}{latency:>12}{cost:>12}"
+                )
+            known = [row['estimated_cost'] for row in rows if row['estimated_cost'] is not None]
+            print(f"合计: {sum(row['calls'] for row in rows)} 次调用，估算费用 {sum(known):.4f}")
+        
+        elif args.mode == 'scheduler':
+            # 仅启动定时任务
+            logger.info("启动定时任务调度器...")
+            service.run_scheduler()
+        
+        elif args.mode == 'all':
+            # 全部功能
+            if args.once:
+                service.run_once()
+            else:
+                service.run()
+    finally:
+        service.close()
 
 
 if __name__ == '__main__':
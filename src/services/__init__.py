@@ -2,8 +2,18 @@
 
 from src.services.crawler_service import CrawlerService
 from src.services.analysis_service import AnalysisService
+from src.services.export_service import ExportService
+from src.services.batch_analysis_service import BatchAnalysisService
+from src.services.embedding_service import EmbeddingService
+from src.services.translation_service import TranslationService
+from src.services.container import ServiceContainer
 
 __all__ = [
     'CrawlerService',
     'AnalysisService',
+    'ExportService',
+    'BatchAnalysisService',
+    'EmbeddingService',
+    'TranslationService',
+    'ServiceContainer',
 ]
@@ -0,0 +1,273 @@
+"""
+批处理分析服务 - 业务逻辑层
+"""
+import os
+import json
+import time
+import uuid
+from typing import Optional
+from loguru import logger
+
+from src.db.repositories import (
+    ArticleRepository,
+    AnalysisQueueRepository,
+    BatchJobRepository,
+)
+from src.analyzers import AIAnalyzer
+from src.analyzers.batch import FINISHED_STATES, STATE_FAILED, write_job_file
+from src.analyzers.usage import MODE_BATCH
+from src.core.generation import notify_data_changed
+from src.services.analysis_service import AnalysisService
+
+# 批处理请求的 custom_id 前缀
+CUSTOM_ID_PREFIX = 'article-'
+# 写入结果时每批提交的条数
+INGEST_BATCH_SIZE = 500
+
+
+class BatchAnalysisService:
+    """
+    批处理分析服务
+
+    积压的未分析文章按重要度领取（租约时长覆盖提供商的完成时限，同步分析不会重复领取），
+    写入 JSONL 任务文件后提交到提供商批处理接口；之后定时查询状态，任务结束后
+    批量写入 news_analysis。没有结果的文章释放租约，由下次同步或批处理分析重试。
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        analyzer: AIAnalyzer,
+        config
+    ):
+        """
+        初始化批处理分析服务
+
+        Args:
+            db_manager: 数据库管理器
+            analyzer: AI 分析器（使用其主接口提交批处理任务）
+            config: 配置对象
+        """
+        self.db_manager = db_manager
+        self.analyzer = analyzer
+        self.config = config
+        self.batch_config = config.batch
+
+    def submit(self, limit: Optional[int] = None) -> Optional[int]:
+        """
+        领取积压文章并提交一个批处理任务
+
+        Args:
+            limit: 最多包含的文章数，None 则使用配置中的值
+
+        Returns:
+            本地任务 ID，没有待分析文章或提交失败时返回 None
+        """
+        limit = limit or self.batch_config.max_requests
+        owner = f"batch:{uuid.uuid4().hex}"
+        client = self.analyzer.batch_client()
+
+        with self.db_manager.session_scope() as session:
+            queue_repo = AnalysisQueueRepository(session)
+            article_ids = queue_repo.claim(
+                owner=owner,
+                limit=limit,
+                lease_seconds=self.batch_config.lease_seconds,
+                max_attempts=self.config.analysis.max_attempts,
+                min_importance=self._min_importance()
+            )
+            articles = ArticleRepository(session).get_by_ids(article_ids)
+            if not articles:
+                logger.info("没有需要批处理分析的文章")
+                return None
+
+            os.makedirs(self.batch_config.job_dir, exist_ok=True)
+            path = os.path.join(self.batch_config.job_dir, f"{owner.split(':')[1]}.jsonl")
+            request_count = write_job_file(path, (
+                client.build_request(
+                    f"{CUSTOM_ID_PREFIX}{article.id}",
+                    self.analyzer.build_single_prompt({
+                        'title': article.title,
+                        'summary': article.summary,
+                        'content': article.content,
+                        'source': article.source
+                    })
+                )
+                for article in articles
+            ))
+            article_ids = [article.id for article in articles]
+
+            try:
+                remote_id = client.submit(path, metadata={'owner': owner})
+            except Exception as e:
+                logger.error(f"提交批处理任务失败: {e}")
+                queue_repo.release(owner, article_ids)
+                session.commit()
+                return None
+
+            job = BatchJobRepository(session).add({
+                'owner': owner,
+                'provider': client.provider,
+                'model': client.model,
+                'remote_id': remote_id,
+                'input_file': path,
+                'article_ids': json.dumps(article_ids),
+                'request_count': request_count,
+            })
+            logger.info(f"已提交批处理任务 {job.id}（{remote_id}），包含 {request_count} 篇文章")
+            return job.id
+
+    def poll(self) -> int:
+        """
+        查询未完成任务的状态，写入已结束任务的结果
+
+        Returns:
+            本次写入的分析结果数
+        """
+        client = self.analyzer.batch_client()
+        ingested = 0
+        with self.db_manager.session_scope() as session:
+            for job in BatchJobRepository(session).list_active():
+                try:
+                    status = client.status(job.remote_id)
+                except Exception as e:
+                    logger.warning(f"查询批处理任务 {job.id} 状态失败: {e}")
+                    continue
+
+                job.remote_status = status.remote_status
+                if status.state not in FINISHED_STATES:
+                    session.commit()
+                    logger.info(f"批处理任务 {job.id} 进行中: {status.remote_status} {status.counts}")
+                    continue
+
+                ingested += self._ingest(session, client, job, status)
+        if ingested:
+            notify_data_changed(self.config)
+        return ingested
+
+    def pending_jobs(self) -> int:
+        """未完成的批处理任务数"""
+        with self.db_manager.session_scope() as session:
+            return len(BatchJobRepository(session).list_active())
+
+    def run_scheduled(self) -> int:
+        """
+        定时任务：写入已结束任务的结果；没有进行中的任务且积压超过阈值时提交新任务
+
+        Returns:
+            本次写入的分析结果数
+        """
+        ingested = self.poll()
+        if self.pending_jobs():
+            return ingested
+
+        with self.db_manager.session_scope() as session:
+            backlog = AnalysisQueueRepository(session).count_claimable(
+                max_attempts=self.config.analysis.max_attempts,
+                min_importance=self._min_importance()
+            )
+        if backlog >= self.batch_config.min_backlog:
+            logger.info(f"未分析文章积压 {backlog} 篇，提交批处理任务")
+            self.submit()
+        return ingested
+
+    def run(self, limit: Optional[int] = None, wait: bool = False, poll_interval: Optional[int] = None) -> int:
+        """
+        提交一个批处理任务（命令行模式），可选等待全部任务结束
+
+        Args:
+            limit: 最多包含的文章数
+            wait: 是否阻塞等待任务结束并写入结果
+            poll_interval: 等待时查询状态的间隔（秒）
+
+        Returns:
+            写入的分析结果数
+        """
+        self.submit(limit)
+        ingested = self.poll()
+        interval = poll_interval or self.batch_config.poll_interval
+        while wait and self.pending_jobs():
+            time.sleep(interval)
+            ingested += self.poll()
+        return ingested
+
+    def _ingest(self, session, client, job, status) -> int:
+        """读取已结束任务的结果并分批写入，释放没有结果的文章的租约"""
+        expected = set(json.loads(job.article_ids))
+        articles = ArticleRepository(session).get_by_ids(list(expected))
+        sources = {article.id: article.source for article in articles}
+        # 上次读取中途失败时已写入的结果不再重复写入
+        done_ids = {article.id for article in articles if article.is_analyzed}
+        pending = []
+        saved = 0
+
+        def flush():
+            nonlocal saved
+            # 用量记录与分析结果在同一事务中写入
+            AnalysisService.save_usage(session, self.analyzer.usage)
+            if AnalysisService.save_results(session, pending):
+                done_ids.update(article_id for article_id, _ in pending)
+                saved += len(pending)
+            pending.clear()
+
+        try:
+            if status.state != STATE_FAILED:
+                for result in client.results(job.remote_id):
+                    article_id = self._article_id(result.custom_id)
+                    if article_id not in expected or article_id in done_ids:
+                        continue
+                    if result.usage:
+                        prompt_tokens, cached, written, completion = result.usage
+                        self.analyzer.usage.record(
+                            client.provider,
+                            client.model,
+                            (prompt_tokens, cached, written),
+                            completion,
+                            mode=MODE_BATCH,
+                            run_id=f"batch-{job.id}",
+                            operation='analyze_single',
+                            source=sources.get(article_id)
+                        )
+                    analysis = None if result.error else self.analyzer.parse_batch_result(result.text)
+                    if analysis is None:
+                        continue
+                    pending.append((article_id, analysis))
+                    if len(pending) >= INGEST_BATCH_SIZE:
+                        flush()
+                flush()
+        except Exception as e:
+            # 读取结果中途失败：已写入的结果保留，任务保持进行中，下次继续
+            logger.error(f"读取批处理任务 {job.id} 结果失败: {e}")
+            return saved
+
+        missing = list(expected - done_ids)
+        AnalysisQueueRepository(session).release(job.owner, missing)
+        BatchJobRepository(session).finish(
+            job,
+            'failed' if status.state == STATE_FAILED else 'ingested',
+            succeeded_count=len(done_ids),
+            failed_count=len(missing),
+            error=status.error
+        )
+        session.commit()
+        logger.info(
+            f"批处理任务 {job.id} 已结束（{status.remote_status}）：写入 {len(done_ids)} 条结果，"
+            f"{len(missing)} 篇文章待重试"
+        )
+        return saved
+
+    def _min_importance(self) -> Optional[float]:
+        """与同步分析一致：开启预筛时只分析重要度达到阈值的文章"""
+        prefilter = getattr(self.config, 'prefilter', None)
+        if prefilter is not None and prefilter.enabled:
+            return prefilter.min_score
+        return None
+
+    @staticmethod
+    def _article_id(custom_id: Optional[str]) -> Optional[int]:
+        if not custom_id or not custom_id.startswith(CUSTOM_ID_PREFIX):
+            return None
+        try:
+            return int(custom_id[len(CUSTOM_ID_PREFIX):])
+        except ValueError:
+            return None
@@ -0,0 +1,109 @@
+"""
+服务容器 - 进程内共享的抓取器、分析器和服务实例
+"""
+import threading
+from typing import Dict, Optional
+
+from loguru import logger
+
+from src.crawlers import RSSCrawler, PlatformCrawler
+from src.analyzers import AIAnalyzer
+from src.services.crawler_service import CrawlerService
+from src.services.analysis_service import AnalysisService
+from src.services.export_service import ExportService
+from src.services.batch_analysis_service import BatchAnalysisService
+from src.services.embedding_service import EmbeddingService
+from src.services.translation_service import TranslationService
+
+
+class ServiceContainer:
+    """
+    服务容器
+
+    抓取器的 HTTP 会话和 AI 客户端的连接池在进程内只创建一次，
+    由 Web 请求、后台作业和定时任务共用，进程退出时调用 close() 释放。
+    分析器及依赖它的服务在首次使用时创建，未配置 API Key 时不影响抓取等功能启动。
+    """
+
+    def __init__(self, config, db_manager):
+        """
+        创建服务容器
+
+        Args:
+            config: 配置对象
+            db_manager: 数据库管理器
+        """
+        self.config = config
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._analyzer: Optional[AIAnalyzer] = None
+        self._analyzer_services: Dict[str, object] = {}
+
+        # 抓取器（持有 HTTP 会话）
+        self.rss_crawler = RSSCrawler(config)
+        self.platform_crawler = PlatformCrawler(config)
+
+        self.crawler_service = CrawlerService(
+            db_manager=db_manager,
+            rss_crawler=self.rss_crawler,
+            platform_crawler=self.platform_crawler,
+            config=config
+        )
+        self.export_service = ExportService(
+            db_manager=db_manager,
+            config=config
+        )
+        self.embedding_service = None
+        if config.embedding.enabled:
+            self.embedding_service = EmbeddingService(
+                db_manager=db_manager,
+                config=config
+            )
+
+    @property
+    def analyzer(self) -> AIAnalyzer:
+        """AI 分析器（首次使用时创建）"""
+        with self._lock:
+            if self._analyzer is None:
+                self._analyzer = AIAnalyzer(self.config)
+            return self._analyzer
+
+    @property
+    def analysis_service(self) -> AnalysisService:
+        return self._analyzer_service(AnalysisService)
+
+    @property
+    def batch_service(self) -> BatchAnalysisService:
+        return self._analyzer_service(BatchAnalysisService)
+
+    @property
+    def translation_service(self) -> TranslationService:
+        return self._analyzer_service(TranslationService)
+
+    def _analyzer_service(self, service_class):
+        """依赖分析器的服务（首次使用时创建，之后复用）"""
+        analyzer = self.analyzer
+        with self._lock:
+            service = self._analyzer_services.get(service_class.__name__)
+            if service is None:
+                service = service_class(
+                    db_manager=self.db_manager,
+                    analyzer=analyzer,
+                    config=self.config
+                )
+                self._analyzer_services[service_class.__name__] = service
+            return service
+
+    def close(self):
+        """关闭抓取器和分析器持有的连接（单个失败不影响其余）"""
+        for name, resource in (
+            ('RSS 抓取器', self.rss_crawler),
+            ('平台抓取器', self.platform_crawler),
+            ('AI 分析器', self._analyzer),
+        ):
+            if resource is None:
+                continue
+            try:
+                resource.close()
+            except Exception as e:
+                logger.warning(f"关闭{name}失败: {e}")
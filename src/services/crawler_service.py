@@ -2,12 +2,20 @@
 抓取服务 - 业务逻辑层
 """
 import time
-from typing import List, Dict
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Optional
 from loguru import logger
 
 from src.db.repositories import ArticleRepository
 from src.crawlers import RSSCrawler, PlatformCrawler
+from src.analyzers.prefilter import ArticleScorer
+from src.analyzers.sentiment import LexiconSentimentScorer
 from src.core.exceptions import CrawlerException
+from src.core.generation import notify_data_changed
+
+
+def _ignore_progress(**deltas):
+    """未提供进度回调时的空实现"""
 
 
 class CrawlerService:
@@ -33,37 +41,88 @@ class CrawlerService:
         self.rss_crawler = rss_crawler
         self.platform_crawler = platform_crawler
         self.config = config
+        # 入库时计算重要度，分析服务按重要度决定哪些文章交给 AI
+        self.scorer = ArticleScorer.from_config(config.prefilter) if config.prefilter.enabled else None
+        # 入库时用本地词典给出临时情感，AI 分析完成后覆盖
+        self.sentiment_scorer = (
+            LexiconSentimentScorer.from_config(config.sentiment) if config.sentiment.enabled else None
+        )
     
-    def fetch_all_sources(self) -> int:
+    def fetch_all_sources(self, progress: Optional[Callable[..., None]] = None) -> int:
         """
         抓取所有配置的新闻源
         
+        Args:
+            progress: 进度回调 progress(**增量)，按新闻源计数（平台热榜整体算一个）
+        
         Returns:
             成功保存的文章数量
         """
         logger.info("开始抓取所有新闻源...")
+        progress = progress or _ignore_progress
         total_saved = 0
         
         # 1. 抓取 RSS 新闻源
-        rss_saved = self._fetch_rss_sources()
+        rss_saved = self._fetch_rss_sources(progress)
         total_saved += rss_saved
         
         # 2. 抓取平台热榜（如果启用）
         if self.config.platforms.enabled:
+            progress(total=1)
             platform_saved = self._fetch_platform_sources()
             total_saved += platform_saved
+            progress(done=1, saved=platform_saved)
         else:
             logger.info("平台热榜抓取已禁用")
         
+        # 3. 补算旧文章的临时情感（迁移只回填了已有 AI 结果的文章）
+        backfilled = self.backfill_sentiment()
+        
+        if total_saved or backfilled:
+            notify_data_changed(self.config)
         logger.info(f"抓取完成，共保存 {total_saved} 篇新文章")
         return total_saved
     
-    def _fetch_rss_sources(self) -> int:
+    def backfill_sentiment(self, batch_size: int = 1000) -> int:
+        """
+        用本地词典为尚无情感结果的文章补算临时情感（按 id 分页，每页单独提交）
+        
+        Args:
+            batch_size: 每页文章数
+        
+        Returns:
+            补算的文章数量
+        """
+        if self.sentiment_scorer is None:
+            return 0
+        
+        total = 0
+        last_id = 0
+        while True:
+            with self.db_manager.session_scope() as session:
+                article_repo = ArticleRepository(session)
+                articles = article_repo.get_without_sentiment(after_id=last_id, limit=batch_size)
+                if not articles:
+                    break
+                results = self.sentiment_scorer.score_articles(articles)
+                total += article_repo.set_sentiments(
+                    [(article['id'], label, score) for article, (label, score) in zip(articles, results)],
+                    source='lexicon'
+                )
+            last_id = articles[-1]['id']
+        
+        if total:
+            logger.info(f"按本地词典补算 {total} 篇文章的情感")
+        return total
+    
+    def _fetch_rss_sources(self, progress: Callable[..., None] = None) -> int:
         """抓取 RSS 新闻源"""
+        progress = progress or _ignore_progress
         saved_count = 0
         
         # 获取所有启用的新闻源
         sources = self.config.get_enabled_news_sources()
+        progress(total=len(sources))
         
         with self.db_manager.session_scope() as session:
             article_repo = ArticleRepository(session)
@@ -82,26 +141,33 @@ class CrawlerService:
                     # 抓取文章
                     articles = self.rss_crawler.fetch(source_config)
                     
+                    # 提取摘要
+                    for article in articles:
+                        article['summary'] = self.rss_crawler.extract_summary(article)
+                    self._apply_importance(article_repo, articles)
+                    self._apply_sentiment(articles)
+                    
                     # 保存文章
+                    source_saved = 0
                     for article in articles:
                         try:
-                            # 提取摘要
-                            article['summary'] = self.rss_crawler.extract_summary(article)
-                            
                             # 保存到数据库
                             saved_article = article_repo.add(article)
                             if saved_article:
-                                saved_count += 1
+                                source_saved += 1
                         
                         except Exception as e:
                             logger.error(f"保存文章失败: {e}")
                             continue
+                    saved_count += source_saved
+                    progress(done=1, saved=source_saved)
                     
                     # 请求间隔
                     time.sleep(self.config.crawler.request_interval)
                 
                 except CrawlerException as e:
                     logger.error(f"抓取 RSS 源失败 {source.name}: {e}")
+                    progress(done=1, failed=1)
                     continue
         
         logger.info(f"RSS 源抓取完成，保存 {saved_count} 篇新文章")
@@ -138,12 +204,13 @@ class CrawlerService:
                 for platform_id, items in results.items():
                     source_name = id_to_name.get(platform_id, platform_id)
                     
+                    platform_articles = []
                     for title, info in items.items():
                         url = info.get("mobileUrl") or info.get("url") or ""
                         if not url:
                             continue
                         
-                        article_data = {
+                        platform_articles.append({
                             "title": title,
                             "summary": None,
                             "content": None,
@@ -155,8 +222,13 @@ class CrawlerService:
                             "language": "zh",
                             "category": "hot_platform",
                             "tags": platform_id,
-                        }
-                        
+                            "hot_rank": min(info.get("ranks") or [0]) or None,
+                        })
+                    
+                    self._apply_importance(article_repo, platform_articles)
+                    self._apply_sentiment(platform_articles)
+                    
+                    for article_data in platform_articles:
                         try:
                             saved_article = article_repo.add(article_data)
                             if saved_article:
@@ -174,3 +246,30 @@ class CrawlerService:
         except Exception as e:
             logger.error(f"抓取平台热榜数据失败: {e}")
             return 0
+    
+    def _apply_importance(self, article_repo: ArticleRepository, articles: List[Dict]):
+        """计算一批文章的重要度（写入 importance 字段）"""
+        if self.scorer is None or not articles:
+            return
+        
+        # 近期已入库或本批次内重复出现的标题视为重复转载
+        since = datetime.utcnow() - timedelta(hours=self.config.prefilter.duplicate_window_hours)
+        seen = article_repo.find_recent_titles([a['title'] for a in articles], since)
+        duplicates = []
+        for article in articles:
+            duplicates.append(article['title'] in seen)
+            seen.add(article['title'])
+        
+        scores = self.scorer.score_batch(articles, duplicates)
+        for article, score in zip(articles, scores):
+            article['importance'] = round(float(score), 4)
+    
+    def _apply_sentiment(self, articles: List[Dict]):
+        """用本地词典计算一批文章的临时情感"""
+        if self.sentiment_scorer is None or not articles:
+            return
+        
+        for article, (label, score) in zip(articles, self.sentiment_scorer.score_articles(articles)):
+            article['sentiment'] = label
+            article['sentiment_score'] = score
+            article['sentiment_source'] = 'lexicon'
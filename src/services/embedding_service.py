@@ -0,0 +1,118 @@
+"""
+向量索引服务 - 文章向量化与相关文章检索
+"""
+from typing import Dict, List, Optional
+from loguru import logger
+
+from src.db.repositories import ArticleRepository
+from src.analyzers.embeddings import EmbeddingBackend, article_text, create_embedder
+from src.analyzers.vector_store import get_vector_store
+
+# 向量化需要的文章字段
+EMBEDDING_FIELDS = ('id', 'title', 'summary')
+
+
+class EmbeddingService:
+    """
+    向量索引服务
+
+    定时任务按文章 ID 顺序把新文章向量化后追加到向量存储；
+    Web 服务读取同一个向量存储回答相关文章查询。
+    """
+
+    def __init__(self, db_manager, config, embedder: Optional[EmbeddingBackend] = None):
+        """
+        初始化向量索引服务
+
+        Args:
+            db_manager: 数据库管理器
+            config: 配置对象
+            embedder: 向量化后端，None 则按配置创建
+        """
+        self.db_manager = db_manager
+        self.config = config
+        self.embedding_config = config.embedding
+        self.embedder = embedder or create_embedder(config.embedding, getattr(config, 'ai', None))
+        self.store = get_vector_store(
+            self.embedding_config.path,
+            self.embedder.dim,
+            self.embedder.name,
+            ivf_min_rows=self.embedding_config.ivf_min_rows,
+            nlist=self.embedding_config.nlist,
+            nprobe=self.embedding_config.nprobe
+        )
+
+    def index_pending(self, limit: Optional[int] = None) -> int:
+        """
+        向量化尚未写入索引的文章
+
+        Args:
+            limit: 最多处理的文章数，None 表示全部
+
+        Returns:
+            写入的向量数
+        """
+        if not self.store.compatible:
+            logger.warning(
+                f"向量索引的后端或维度已变化（{self.store.meta.get('backend')}/{self.store.meta.get('dim')} → "
+                f"{self.embedder.name}/{self.embedder.dim}），清空后重建"
+            )
+            self.store.reset()
+
+        written = 0
+        with self.db_manager.session_scope() as session:
+            for batch in ArticleRepository(session).iter_batches_since(
+                after_id=self.store.last_id,
+                fields=EMBEDDING_FIELDS,
+                batch_size=self.embedding_config.batch_size
+            ):
+                if limit is not None:
+                    batch = batch[:limit - written]
+                vectors = self.embedder.embed([article_text(article) for article in batch])
+                written += self.store.add([article['id'] for article in batch], vectors)
+                if limit is not None and written >= limit:
+                    break
+
+        if written:
+            logger.info(f"向量索引新增 {written} 篇文章，共 {self.store.count} 篇")
+        return written
+
+    def related(self, article_id: int, k: int = 10) -> Optional[List[Dict]]:
+        """
+        查询相关文章
+
+        文章尚未写入索引时临时计算其向量。
+
+        Args:
+            article_id: 文章 ID
+            k: 返回数量
+
+        Returns:
+            按相似度降序的文章字典列表（含 score），文章不存在时返回 None
+        """
+        self.store.refresh()
+        with self.db_manager.session_scope() as session:
+            repo = ArticleRepository(session)
+            vector = self.store.get(article_id)
+            if vector is None:
+                article = repo.get_by_id(article_id)
+                if article is None:
+                    return None
+                vector = self.embedder.embed([
+                    article_text({'title': article.title, 'summary': article.summary})
+                ])[0]
+
+            hits = self.store.search(vector, k, exclude={article_id})
+            articles = {article.id: article for article in repo.get_by_ids([i for i, _ in hits])}
+            return [
+                {
+                    'id': related_id,
+                    'title': articles[related_id].title,
+                    'url': articles[related_id].url,
+                    'source': articles[related_id].source,
+                    'published_at': articles[related_id].published_at,
+                    'crawled_at': articles[related_id].crawled_at,
+                    'score': score,
+                }
+                for related_id, score in hits if related_id in articles
+            ]
@@ -0,0 +1,321 @@
+"""
+数据导出服务 - 将数据库表流式导出为 Parquet / Arrow IPC 文件
+"""
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from loguru import logger
+from sqlalchemy import Boolean, DateTime, Float, Integer
+
+from src.db.models import NewsArticle, NewsAnalysis, NewsSummary
+from src.db.streaming import iter_row_batches
+from src.core.exceptions import ConfigurationException, NewsServiceException
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - 可选依赖
+    pa = None
+    pq = None
+
+
+# 增量导出方式
+EXPORT_APPEND = 'append'    # 只追加的表：导出上次最大 id 之后的行
+EXPORT_CHANGES = 'changes'  # 原地更新的表：导出上次水位之后新增或修改的行（按 updated_at）
+EXPORT_FULL = 'full'        # 每次全量导出（数据量小且没有修改时间水位）
+
+# 导出表 -> (模型, 分区时间列, 增量导出方式)
+# 文章的分析状态、情感、译文会原地更新，增量导出时修改过的行作为新版本追加到所属日期分区，
+# 读取时按 id 保留 updated_at 最新的一行；摘要按日期覆盖且数据量小，总是全量导出。
+EXPORT_TABLES = {
+    'news_articles': (NewsArticle, 'crawled_at', EXPORT_CHANGES),
+    'news_analysis': (NewsAnalysis, 'created_at', EXPORT_APPEND),
+    'news_summaries': (NewsSummary, 'created_at', EXPORT_FULL),
+}
+
+STATE_FILE = '_export_state.json'
+
+
+def _ignore_progress(**deltas):
+    """未提供进度回调时的空实现"""
+
+
+def _arrow_type(column):
+    """SQLAlchemy 列类型 -> Arrow 类型"""
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp('us')
+    return pa.string()
+
+
+class _PartitionedWriter:
+    """
+    按天分区的文件写入器
+
+    同一时刻只保持一个打开的文件：行按 id 顺序到达，日期基本单调，
+    日期切换时关闭当前文件并打开下一个分区的文件。
+    文件先写入 .tmp，全部成功后才重命名，失败时删除。
+    文件名包含本次运行的唯一 ID，多次运行（即使在同一秒内）不会覆盖彼此的文件。
+    """
+
+    def __init__(self, table_dir: Path, schema, file_format: str, compression: str, run_id: str):
+        self.table_dir = table_dir
+        self.schema = schema
+        self.file_format = file_format
+        self.compression = compression
+        self.run_id = run_id
+        self._writer = None
+        self._sink = None
+        self._day = None
+        self._seq = 0
+        self._pending: List[Path] = []
+
+    def write(self, day: str, rows: List[Dict]):
+        """写入同一天的一组行"""
+        if day != self._day:
+            self._close_current()
+            self._open(day)
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def _open(self, day: str):
+        suffix = 'parquet' if self.file_format == 'parquet' else 'arrow'
+        partition_dir = self.table_dir / f"date={day}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        self._seq += 1
+        path = partition_dir / f"part-{self.run_id}-{self._seq:04d}.{suffix}.tmp"
+        if self.file_format == 'parquet':
+            self._writer = pq.ParquetWriter(str(path), self.schema, compression=self.compression)
+        else:
+            self._sink = pa.OSFile(str(path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+        self._pending.append(path)
+        self._day = day
+
+    def _close_current(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        self._day = None
+
+    def commit(self) -> List[Path]:
+        """关闭文件并将 .tmp 重命名为正式文件"""
+        self._close_current()
+        final_paths = []
+        for path in self._pending:
+            final_path = path.with_suffix('')
+            os.replace(path, final_path)
+            final_paths.append(final_path)
+        self._pending = []
+        return final_paths
+
+    def abort(self):
+        """放弃本次写入的所有文件"""
+        try:
+            self._close_current()
+        finally:
+            for path in self._pending:
+                if path.exists():
+                    path.unlink()
+            self._pending = []
+
+
+class ExportService:
+    """数据导出服务"""
+
+    def __init__(self, db_manager, config):
+        """
+        初始化导出服务
+
+        Args:
+            db_manager: 数据库管理器
+            config: 配置对象
+        """
+        self.db_manager = db_manager
+        self.config = config
+        self.export_config = config.export
+        self.output_dir = Path(self.export_config.output_dir)
+
+    def export_all(
+        self,
+        tables: Optional[List[str]] = None,
+        full: bool = False,
+        progress: Optional[Callable[..., None]] = None
+    ) -> Dict[str, int]:
+        """
+        导出多张表
+
+        Args:
+            tables: 要导出的表名列表，None 表示全部
+            full: 是否忽略上次导出位置，全量导出
+            progress: 进度回调 progress(**增量)，按表计数（total / done），rows 为已导出行数
+
+        Returns:
+            {表名: 导出行数}
+        """
+        progress = progress or _ignore_progress
+        tables = tables or list(EXPORT_TABLES.keys())
+        progress(total=len(tables))
+        results = {}
+        for table in tables:
+            results[table] = self.export_table(table, full=full, progress=progress)
+            progress(done=1)
+        return results
+
+    def export_table(
+        self,
+        table: str,
+        full: bool = False,
+        progress: Optional[Callable[..., None]] = None
+    ) -> int:
+        """
+        导出单张表
+
+        只追加的表从上次导出的最大 id 之后开始流式读取（增量），文章只读取上次水位之后
+        新增或修改的行（水位为导出时刻减去 change_lag_seconds，留给进行中的事务提交），
+        按分区时间列的日期写入 <output_dir>/<table>/date=YYYY-MM-DD/part-*.parquet。
+        全量导出（包括首次导出文章和总是全量的表）写入临时目录，成功后替换整个表目录，不会与旧文件重复。
+
+        Args:
+            table: 表名
+            full: 是否全量导出（摘要表总是全量导出）
+            progress: 进度回调，每写入一批行调用 progress(rows=行数)
+
+        Returns:
+            导出行数
+        """
+        if pa is None:
+            raise ConfigurationException("数据导出需要安装 pyarrow: pip install pyarrow")
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"不支持导出的表: {table}")
+        file_format = self.export_config.format
+        if file_format not in ('parquet', 'arrow'):
+            raise ConfigurationException(f"不支持的导出格式: {file_format}")
+
+        progress = progress or _ignore_progress
+        model, time_column, mode = EXPORT_TABLES[table]
+        state = self._load_state()
+        previous = state.get(table, {})
+        # 修改时间水位：只导出该时刻之前修改的行，晚于它的留到下次
+        watermark = datetime.utcnow() - timedelta(seconds=self.export_config.change_lag_seconds)
+        full = full or mode == EXPORT_FULL or (mode == EXPORT_CHANGES and not previous.get('updated_at'))
+        after_id = previous.get('last_id') if mode == EXPORT_APPEND and not full else None
+        filters = []
+        if mode == EXPORT_CHANGES and not full:
+            filters = [
+                model.updated_at > datetime.fromisoformat(previous['updated_at']),
+                model.updated_at <= watermark,
+            ]
+
+        schema = pa.schema([
+            pa.field(column.name, _arrow_type(column))
+            for column in model.__table__.columns
+        ])
+        run_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        table_dir = self.output_dir / table
+        target_dir = self.output_dir / f".{table}.{run_id}.staging" if full else table_dir
+        writer = _PartitionedWriter(
+            table_dir=target_dir,
+            schema=schema,
+            file_format=file_format,
+            compression=self.export_config.compression,
+            run_id=run_id
+        )
+
+        logger.info(
+            f"开始{'全量' if full else '增量'}导出 {table}"
+            f"（起始 id: {after_id or 0}，修改时间晚于: {previous.get('updated_at') if filters else '-'}）..."
+        )
+        exported = 0
+        last_id = after_id
+
+        try:
+            with self.db_manager.session_scope() as session:
+                for batch in iter_row_batches(
+                    session,
+                    model,
+                    after_id=after_id,
+                    filters=filters,
+                    batch_size=self.export_config.batch_size
+                ):
+                    for day, rows in self._group_by_day(batch, time_column):
+                        writer.write(day, rows)
+                    exported += len(batch)
+                    last_id = batch[-1]['id']
+                    progress(rows=len(batch))
+            files = writer.commit()
+            if full:
+                self._replace_dir(target_dir, table_dir, run_id)
+        except Exception as e:
+            writer.abort()
+            if full:
+                shutil.rmtree(target_dir, ignore_errors=True)
+            logger.error(f"导出 {table} 失败: {e}")
+            raise NewsServiceException(f"导出 {table} 失败: {e}") from e
+
+        if exported or full or mode == EXPORT_CHANGES:
+            state[table] = {
+                'last_id': last_id,
+                'exported_at': datetime.utcnow().isoformat()
+            }
+            if mode == EXPORT_CHANGES:
+                # 全量导出也包含水位之后修改的行，下次增量会再导出一次（读取时按 id 去重）
+                state[table]['updated_at'] = watermark.isoformat()
+            self._save_state(state)
+
+        logger.info(f"导出 {table} 完成: {exported} 行，{len(files)} 个文件")
+        return exported
+
+    @staticmethod
+    def _group_by_day(rows: List[Dict], time_column: str):
+        """将一批行按日期切分为连续的分组（保持原有顺序）"""
+        current_day = None
+        group = []
+        for row in rows:
+            value = row.get(time_column)
+            day = value.strftime('%Y-%m-%d') if value else 'unknown'
+            if day != current_day and group:
+                yield current_day, group
+                group = []
+            current_day = day
+            group.append(row)
+        if group:
+            yield current_day, group
+
+    @staticmethod
+    def _replace_dir(staging_dir: Path, table_dir: Path, run_id: str):
+        """用全量导出的临时目录替换表目录（旧目录先改名再删除，失败时不会留下半个数据集）"""
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        old_dir = table_dir.with_name(f".{table_dir.name}.{run_id}.old")
+        if table_dir.exists():
+            os.replace(table_dir, old_dir)
+        os.replace(staging_dir, table_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _load_state(self) -> Dict:
+        """读取导出位置记录"""
+        state_path = self.output_dir / STATE_FILE
+        if not state_path.exists():
+            return {}
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_state(self, state: Dict):
+        """原子写入导出位置记录"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        state_path = self.output_dir / STATE_FILE
+        tmp_path = state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, state_path)
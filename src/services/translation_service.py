@@ -0,0 +1,183 @@
+"""
+翻译服务 - 外文文章标题和摘要的批量翻译
+"""
+import hashlib
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from src.analyzers import AIAnalyzer, ConcurrentAnalysisEngine
+from src.analyzers.usage import usage_scope
+from src.core.generation import notify_data_changed
+from src.db.repositories import ArticleRepository, TranslationMemoryRepository
+from src.services.analysis_service import AnalysisService
+
+# 目标语言代码 → 写入提示词的语言名称
+LANGUAGE_NAMES = {
+    'zh': '简体中文',
+    'zh-tw': '繁體中文',
+    'en': 'English',
+    'ja': '日本語',
+    'ko': '한국어',
+    'fr': 'Français',
+    'de': 'Deutsch',
+    'es': 'Español',
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """规范化待翻译文本（合并空白），翻译记忆按规范化后的文本匹配"""
+    return _WHITESPACE.sub(' ', text or '').strip()
+
+
+def text_hash(text: str) -> str:
+    """翻译记忆的键：规范化文本的 SHA-256"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def chunk_texts(texts: List[str], batch_size: int, max_chars: int) -> Iterator[List[str]]:
+    """
+    按条数和字符数切分批次（单条超过字符上限时单独成批）
+
+    Yields:
+        文本批次
+    """
+    batch, chars = [], 0
+    for text in texts:
+        if batch and (len(batch) >= batch_size or chars + len(text) > max_chars):
+            yield batch
+            batch, chars = [], 0
+        batch.append(text)
+        chars += len(text)
+    if batch:
+        yield batch
+
+
+class TranslationService:
+    """
+    翻译服务
+
+    一次运行收集待翻译文章的标题和摘要，去重后先查翻译记忆，
+    只把未命中的文本按批打包请求模型（多个批次并发），译文写回翻译记忆和文章。
+    相同的通稿标题无论出现在多少篇文章中都只翻译一次。
+    """
+
+    def __init__(self, db_manager, analyzer: AIAnalyzer, config):
+        """
+        初始化翻译服务
+
+        Args:
+            db_manager: 数据库管理器
+            analyzer: AI 分析器
+            config: 配置对象
+        """
+        self.db_manager = db_manager
+        self.analyzer = analyzer
+        self.config = config
+        self.translation_config = config.translation
+        self.engine = ConcurrentAnalysisEngine(
+            max_in_flight=config.analysis.max_concurrency
+        )
+
+    @property
+    def language_name(self) -> str:
+        """写入提示词的目标语言名称"""
+        target = self.translation_config.target_language
+        return self.translation_config.language_name or LANGUAGE_NAMES.get(target.lower(), target)
+
+    def translate_pending(self, limit: Optional[int] = None) -> int:
+        """
+        翻译尚未翻译的外文文章
+
+        Args:
+            limit: 最多处理的文章数，None 则使用配置中的值
+
+        Returns:
+            完成翻译的文章数
+        """
+        cfg = self.translation_config
+        target = cfg.target_language
+        limit = limit or cfg.max_articles_per_run
+        run_id = f"translate-{datetime.utcnow():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+        # 第一个短事务：只读取待翻译文章和翻译记忆，请求模型期间不持有会话（SQLite 不持有写锁）
+        with self.db_manager.session_scope() as session:
+            articles = ArticleRepository(session).get_untranslated(target, limit=limit)
+            if not articles:
+                return 0
+
+            # 规范化并去重：{哈希: 文本}
+            fields = []
+            texts: Dict[str, str] = {}
+            for article in articles:
+                title = normalize_text(article['title'])
+                summary = normalize_text((article['summary'] or '')[:cfg.summary_chars])
+                fields.append((article['id'], title, summary))
+                for text in (title, summary):
+                    if text:
+                        texts.setdefault(text_hash(text), text)
+
+            translations = TranslationMemoryRepository(session).get_many(list(texts), target)
+        hits = list(translations)
+
+        misses = [text for key, text in texts.items() if key not in translations]
+        with usage_scope(run_id=run_id):
+            new_entries, requests = self._translate(misses)
+        translations.update({key: translated for key, _, translated in new_entries})
+
+        updates = []
+        for article_id, title, summary in fields:
+            title_translated = translations.get(text_hash(title)) if title else None
+            summary_translated = translations.get(text_hash(summary)) if summary else None
+            # 标题和摘要（如有）都有译文才算完成，否则留待下次运行重试
+            if title_translated is None or (summary and summary_translated is None):
+                continue
+            updates.append((article_id, title_translated, summary_translated))
+
+        # 第二个短事务：写回翻译记忆、文章译文和用量
+        with self.db_manager.session_scope() as session:
+            memory = TranslationMemoryRepository(session)
+            if hits:
+                memory.touch(hits, target)
+            memory.add_many(new_entries, target, self.analyzer.model)
+            ArticleRepository(session).set_translations(updates, target)
+            AnalysisService.save_usage(session, self.analyzer.usage)
+
+        if updates:
+            notify_data_changed(self.config)
+        logger.info(
+            f"翻译完成 {len(updates)}/{len(articles)} 篇文章："
+            f"{len(texts)} 条不同文本，翻译记忆命中 {len(hits)} 条，"
+            f"新翻译 {len(new_entries)} 条，共 {requests} 次请求"
+        )
+        return len(updates)
+
+    def _translate(self, texts: List[str]) -> Tuple[List[Tuple[str, str, str]], int]:
+        """
+        分批并发翻译
+
+        Returns:
+            ([(哈希, 原文, 译文)], 请求次数)，失败的批次只记录日志
+        """
+        cfg = self.translation_config
+        batches = list(chunk_texts(texts, max(1, cfg.batch_size), cfg.max_batch_chars))
+        language = self.language_name
+
+        entries = []
+        for batch, result, error in self.engine.imap_unordered(
+            lambda batch: self.analyzer.translate_batch(batch, language),
+            batches
+        ):
+            if error is not None:
+                logger.warning(f"翻译批次失败（{len(batch)} 条）: {error}")
+                continue
+            entries.extend(
+                (text_hash(batch[index]), batch[index], translated)
+                for index, translated in result.items()
+            )
+        return entries, len(batches)
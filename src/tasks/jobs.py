@@ -0,0 +1,174 @@
+"""
+后台作业 - 手动触发的抓取、分析等长时间任务
+
+Web 接口提交作业后立即返回作业 ID，作业在专用的有界线程池中执行，
+客户端通过作业 ID 查询状态和进度。
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# 作业状态
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+@dataclass
+class Job:
+    """一个后台作业"""
+    id: str
+    type: str
+    status: str = JOB_QUEUED
+    progress: Dict[str, int] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'type': self.type,
+            'status': self.status,
+            'progress': dict(self.progress),
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    作业管理器（线程安全）
+
+    同一类型的作业同一时间只有一个在排队或执行，重复提交返回已有的作业；
+    作业函数接收进度回调 progress(**增量)，如 progress(total=10)、progress(done=1)。
+    只保留最近 history 个已结束的作业。
+    """
+
+    def __init__(self, max_workers: int = 2, history: int = 100):
+        """
+        初始化作业管理器
+
+        Args:
+            max_workers: 同时执行的作业数
+            history: 保留的已结束作业数
+        """
+        self.max_workers = max(1, max_workers)
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._active: Dict[str, Job] = {}
+
+    def submit(self, job_type: str, func: Callable[[Callable[..., None]], Any]) -> Tuple[Dict, bool]:
+        """
+        提交作业
+
+        Args:
+            job_type: 作业类型（同类型的作业合并）
+            func: 作业函数 func(progress)，返回值作为作业结果
+
+        Returns:
+            (作业快照, 是否新建)，已有同类型作业在排队或执行时返回该作业且不新建
+        """
+        with self._lock:
+            active = self._active.get(job_type)
+            if active is not None:
+                return active.to_dict(), False
+            job = Job(id=uuid.uuid4().hex, type=job_type)
+            self._jobs[job.id] = job
+            self._active[job_type] = job
+            self._prune()
+            snapshot = job.to_dict()
+        try:
+            self._executor.submit(self._run, job, func)
+        except RuntimeError:
+            # 线程池已关闭（服务正在退出）
+            with self._lock:
+                self._jobs.pop(job.id, None)
+                self._active.pop(job_type, None)
+            raise
+        logger.info(f"作业已提交: {job_type} ({job.id})")
+        return snapshot, True
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """作业快照，不存在（或已被清理）时返回 None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def list(self, limit: int = 20) -> List[Dict]:
+        """最近提交的作业快照（新的在前）"""
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())][:limit]
+
+    def shutdown(self, wait: bool = False):
+        """停止接收作业（wait 为 True 时等待执行中的作业结束）"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, func: Callable):
+        def progress(**deltas):
+            with self._lock:
+                for key, value in deltas.items():
+                    job.progress[key] = job.progress.get(key, 0) + value
+
+        with self._lock:
+            job.status = JOB_RUNNING
+            job.started_at = datetime.utcnow()
+        result, error = None, None
+        try:
+            result = func(progress)
+        except Exception as e:
+            logger.error(f"作业失败: {job.type} ({job.id}): {e}")
+            error = str(e) or type(e).__name__
+
+        # 状态和结束时间一起更新，查询方看到结束状态时作业已不再占用类型
+        with self._lock:
+            job.status = JOB_FAILED if error is not None else JOB_SUCCEEDED
+            job.result = result
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            self._active.pop(job.type, None)
+            self._prune()
+
+    def _prune(self):
+        """清理超出 history 的已结束作业（调用方持有锁）"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ACTIVE_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager(max_workers: int = 2) -> JobManager:
+    """获取进程内共享的作业管理器（首次调用时创建）"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager(max_workers=max_workers)
+        return _job_manager
+
+
+def shutdown_job_manager():
+    """关闭共享的作业管理器（不等待执行中的作业），之后再次获取时重新创建"""
+    global _job_manager
+    with _job_manager_lock:
+        manager, _job_manager = _job_manager, None
+    if manager is not None:
+        manager.shutdown(wait=False)
@@ -2,10 +2,13 @@
 定时任务调度器
 """
 import time
+from datetime import timedelta
+from typing import Optional
+
 import schedule
 from loguru import logger
 
-from src.services import CrawlerService, AnalysisService
+from src.services import CrawlerService, AnalysisService, BatchAnalysisService, EmbeddingService, TranslationService
 
 
 class TaskScheduler:
@@ -15,7 +18,10 @@ class TaskScheduler:
         self,
         crawler_service: CrawlerService,
         analysis_service: AnalysisService,
-        config
+        config,
+        batch_service: Optional[BatchAnalysisService] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+        translation_service: Optional[TranslationService] = None
     ):
         """
         初始化任务调度器
@@ -24,10 +30,16 @@ class TaskScheduler:
             crawler_service: 抓取服务
             analysis_service: 分析服务
             config: 配置对象
+            batch_service: 批处理分析服务（可选）
+            embedding_service: 向量索引服务（可选，抓取后为新文章写入向量）
+            translation_service: 翻译服务（可选，抓取后翻译外文文章）
         """
         self.crawler_service = crawler_service
         self.analysis_service = analysis_service
         self.config = config
+        self.batch_service = batch_service
+        self.embedding_service = embedding_service
+        self.translation_service = translation_service
     
     def setup_schedules(self):
         """设置定时任务"""
@@ -46,9 +58,23 @@ class TaskScheduler:
             schedule.every(analysis_interval).seconds.do(self._analyze_task)
             logger.info(f"分析任务已设置，间隔: {analysis_interval} 秒")
         
-        # 每日摘要（每天凌晨1点）
+        # 批处理分析：查询任务状态、写入结果，积压过多时提交新任务
+        if self.batch_service is not None and self.config.batch.enabled:
+            poll_interval = self.config.batch.poll_interval
+            schedule.every(poll_interval).seconds.do(self._batch_task)
+            logger.info(f"批处理分析任务已设置，间隔: {poll_interval} 秒")
+        
+        # 增量摘要（每小时），同时刷新当天的滚动每日摘要
+        schedule.every().hour.at(":05").do(self._hourly_summary_task)
+        logger.info("增量摘要任务已设置，执行时间: 每小时第 5 分钟")
+        
+        # 每日摘要定稿（每天凌晨1点，合并前一天的增量摘要）
         schedule.every().day.at("01:00").do(self._daily_summary_task)
         logger.info("每日摘要任务已设置，执行时间: 每天 01:00")
+        
+        # 每周摘要（每周一凌晨1点半，合并上周的每日摘要）
+        schedule.every().monday.at("01:30").do(self._weekly_summary_task)
+        logger.info("每周摘要任务已设置，执行时间: 每周一 01:30")
     
     def _fetch_task(self):
         """抓取任务"""
@@ -59,6 +85,20 @@ class TaskScheduler:
             self.crawler_service.fetch_all_sources()
         except Exception as e:
             logger.error(f"定时抓取任务失败: {e}")
+        
+        # 新文章写入向量索引
+        if self.embedding_service is not None and self.config.embedding.enabled:
+            try:
+                self.embedding_service.index_pending()
+            except Exception as e:
+                logger.error(f"向量索引任务失败: {e}")
+        
+        # 翻译新抓取的外文文章
+        if self.translation_service is not None and self.config.translation.enabled:
+            try:
+                self.translation_service.translate_pending()
+            except Exception as e:
+                logger.error(f"翻译任务失败: {e}")
     
     def _analyze_task(self):
         """分析任务"""
@@ -70,16 +110,46 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"定时分析任务失败: {e}")
     
+    def _batch_task(self):
+        """批处理分析任务"""
+        try:
+            self.batch_service.run_scheduled()
+        except Exception as e:
+            logger.error(f"批处理分析任务失败: {e}")
+    
+    def _hourly_summary_task(self):
+        """增量摘要任务"""
+        try:
+            logger.info("执行增量摘要任务")
+            # 每日摘要会先补齐增量摘要，再合并出今天截至目前的每日摘要
+            self.analysis_service.generate_daily_summary()
+        except Exception as e:
+            logger.error(f"增量摘要任务失败: {e}")
+    
     def _daily_summary_task(self):
         """每日摘要任务"""
         try:
             logger.info("=" * 50)
             logger.info("执行每日摘要任务")
             logger.info("=" * 50)
-            self.analysis_service.generate_daily_summary()
+            # 按应用时区（而不是系统时区）确定昨天
+            self.analysis_service.generate_daily_summary(self.analysis_service.today() - timedelta(days=1))
         except Exception as e:
             logger.error(f"每日摘要任务失败: {e}")
     
+    def _weekly_summary_task(self):
+        """每周摘要任务"""
+        try:
+            logger.info("=" * 50)
+            logger.info("执行每周摘要任务")
+            logger.info("=" * 50)
+            today = self.analysis_service.today()
+            self.analysis_service.generate_weekly_summary(
+                today - timedelta(days=today.weekday() + 7)
+            )
+        except Exception as e:
+            logger.error(f"每周摘要任务失败: {e}")
+    
     def run(self):
         """运行调度器"""
         logger.info("启动定时任务调度器...")
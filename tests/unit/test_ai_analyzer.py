@@ -0,0 +1,251 @@
+"""
+AI 分析器单元测试（不发起网络请求）
+"""
+import json
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+
+from src.config import AIConfig, AIEndpointConfig, LLMCacheConfig
+from src.analyzers.ai_analyzer import AIAnalyzer
+from src.analyzers.latency import LatencyHistogram
+from src.analyzers.prompt_cache import cache_usage
+from src.analyzers.prompts import Prompt, anthropic_system, single_analysis_prompt
+from src.core.exceptions import AnalysisException
+
+
+@pytest.fixture
+def analyzer():
+    """创建使用假 API Key 的分析器"""
+    return AIAnalyzer(SimpleNamespace(ai=AIConfig(api_key="test-key")))
+
+
+def _item(article_id, **overrides):
+    item = {
+        "id": article_id,
+        "analysis": f"分析 {article_id}",
+        "sentiment": "neutral",
+        "sentiment_score": 0.5,
+        "key_points": ["要点"],
+        "importance_score": 5
+    }
+    item.update(overrides)
+    return item
+
+
+def test_analyze_packed_demultiplexes_and_retries(analyzer, monkeypatch):
+    """测试打包结果拆分，缺失和格式错误的条目单独重试"""
+    packed_response = "```json\n" + json.dumps([
+        _item(1),
+        _item("2"),
+        _item(3, sentiment="unknown"),
+    ]) + "\n```"
+    single_response = json.dumps(_item(0, analysis="单独重试"))
+    prompts = []
+    
+    def fake_call_api(prompt, validate=None):
+        prompts.append(prompt)
+        return packed_response if len(prompts) == 1 else single_response
+    
+    monkeypatch.setattr(analyzer, "_call_api", fake_call_api)
+    
+    results = analyzer.analyze_packed([
+        {"id": i, "title": f"标题 {i}"} for i in (1, 2, 3, 4)
+    ])
+    
+    assert set(results) == {1, 2, 3, 4}
+    assert results[1]["analysis_content"] == "分析 1"
+    assert results[2]["analysis_content"] == "分析 2"
+    assert results[3]["analysis_content"] == "单独重试"
+    assert results[4]["analysis_content"] == "单独重试"
+    assert len(prompts) == 3
+
+
+def test_invalid_single_response_raises_and_is_not_cached(monkeypatch, tmp_path):
+    """测试单篇响应无法解析时抛出异常（不编造中性情感），无法解析的响应都不写入结果缓存"""
+    analyzer = AIAnalyzer(SimpleNamespace(
+        ai=AIConfig(api_key="test-key", max_retries=0),
+        llm_cache=LLMCacheConfig(path=str(tmp_path / "cache.db"))
+    ))
+    responses = ['{"analysis": "被截断', json.dumps(_item(1, analysis="有效"))]
+    monkeypatch.setattr(analyzer, "_send", lambda endpoint, prompt: (responses.pop(0), 10, {}))
+    
+    with pytest.raises(AnalysisException):
+        analyzer.analyze_single({"title": "标题"})
+    assert analyzer.parse_batch_result('{"sentiment": "neutral"}') is None
+    assert analyzer.analyze_single({"title": "标题"})["analysis_content"] == "有效"
+    
+    # 汇总和翻译同样只缓存能解析的响应，重试时重新请求
+    responses.extend(['{"trend_analysis": "被截断', '{"trend_analysis": "趋势"}', '[]', '[{"id": 1, "text": "译文"}]'])
+    articles = [{"title": "标题", "source": "源"}]
+    assert analyzer.summarize_chunk(articles) is None
+    assert analyzer.summarize_chunk(articles) == {"trend_analysis": "趋势"}
+    assert analyzer.translate_batch(["text"], "简体中文") == {}
+    assert analyzer.translate_batch(["text"], "简体中文") == {0: "译文"}
+    assert analyzer.summarize_chunk(articles) == {"trend_analysis": "趋势"} and responses == []
+    analyzer.close()
+
+
+def _failover_analyzer(**ai_kwargs):
+    fallbacks = [AIEndpointConfig(provider="deepseek", model="backup-model", api_key="test-key")]
+    return AIAnalyzer(SimpleNamespace(ai=AIConfig(
+        api_key="test-key",
+        model="primary-model",
+        fallbacks=fallbacks,
+        max_retries=0,
+        failover_retries=0,
+        **ai_kwargs
+    )))
+
+
+def test_failover_to_next_provider(monkeypatch):
+    """测试主接口出错时切换到备用接口"""
+    analyzer = _failover_analyzer()
+    calls = []
+    
+    def fake_send(endpoint, prompt):
+        calls.append(endpoint.model)
+        if endpoint.model == "primary-model":
+            raise ValueError("primary down")
+        return '{"ok": true}', 10, {}
+    
+    monkeypatch.setattr(analyzer, "_send", fake_send)
+    
+    assert analyzer._request(Prompt("说明", "内容")) == '{"ok": true}'
+    assert calls == ["primary-model", "backup-model"]
+
+
+def test_fallback_results_are_not_cached(monkeypatch, tmp_path):
+    """测试备用接口返回的结果不以主接口模型的名义写入缓存"""
+    fallbacks = [AIEndpointConfig(provider="deepseek", model="backup-model", api_key="test-key")]
+    analyzer = AIAnalyzer(SimpleNamespace(
+        ai=AIConfig(api_key="test-key", model="primary-model", fallbacks=fallbacks,
+                    max_retries=0, failover_retries=0),
+        llm_cache=LLMCacheConfig(path=str(tmp_path / "cache.db"))
+    ))
+    primary_down = [True]
+    
+    def fake_send(endpoint, prompt):
+        if endpoint.model == "primary-model" and primary_down[0]:
+            raise ValueError("primary down")
+        return f'{{"from": "{endpoint.model}"}}', 10, {}
+    
+    monkeypatch.setattr(analyzer, "_send", fake_send)
+    prompt = Prompt("说明", "内容")
+    
+    assert analyzer._call_api(prompt) == '{"from": "backup-model"}'
+    primary_down[0] = False
+    assert analyzer._call_api(prompt) == '{"from": "primary-model"}'
+    assert analyzer.cache.stats()["entries"] == 1
+    analyzer.close()
+
+
+def test_hedged_request_takes_first_valid_result(monkeypatch):
+    """测试主接口超过延迟阈值时发送对冲请求并采用先返回的结果"""
+    analyzer = _failover_analyzer(hedge_enabled=True, hedge_default_delay=0.05, hedge_min_delay=0.01)
+    release = threading.Event()
+    
+    def fake_send(endpoint, prompt):
+        if endpoint.model == "primary-model":
+            release.wait(2)
+            return '{"from": "primary"}', 10, {}
+        return '{"from": "backup"}', 10, {}
+    
+    monkeypatch.setattr(analyzer, "_send", fake_send)
+    
+    started = time.monotonic()
+    assert analyzer._request(Prompt("说明", "内容")) == '{"from": "backup"}'
+    assert time.monotonic() - started < 1
+    release.set()
+
+
+def test_hedge_clock_starts_when_request_is_sent(monkeypatch):
+    """测试等待限流（或排队）的时间不计入对冲阈值"""
+    analyzer = _failover_analyzer(hedge_enabled=True, hedge_default_delay=0.05, hedge_min_delay=0.01)
+    calls = []
+    
+    class SlowLimiter:
+        def acquire(self, tokens):
+            time.sleep(0.3)
+        
+        def update_from_headers(self, headers):
+            pass
+        
+        def settle(self, estimated, used):
+            pass
+    
+    def fake_send(endpoint, prompt):
+        calls.append(endpoint.model)
+        return '{"from": "primary"}', 10, {}
+    
+    monkeypatch.setattr(analyzer.endpoints[0], "rate_limiter", SlowLimiter())
+    monkeypatch.setattr(analyzer, "_send", fake_send)
+    
+    assert analyzer._request(Prompt("说明", "内容")) == '{"from": "primary"}'
+    assert calls == ["primary-model"]
+
+
+def test_latency_histogram_percentile():
+    """测试延迟直方图分位数估算"""
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.record(0.5)
+    for _ in range(10):
+        histogram.record(20.0)
+    
+    assert 0.5 <= histogram.percentile(50) < 0.6
+    assert 20.0 <= histogram.percentile(99) < 24.0
+
+
+def test_prompts_share_stable_prefix():
+    """测试不同文章的提示词共用相同的固定前缀，文章内容只出现在用户内容中"""
+    first = single_analysis_prompt({"title": "标题一", "summary": "摘要"})
+    second = single_analysis_prompt({"title": "标题二"})
+    
+    assert first.system == second.system
+    assert "标题一" not in first.system and "标题一" in first.user
+    assert anthropic_system(first)[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in anthropic_system(first, cache=False)[0]
+
+
+def test_cache_usage_reports_cached_tokens():
+    """测试从不同提供商的 usage 中提取缓存命中 token 数"""
+    anthropic_usage = SimpleNamespace(
+        input_tokens=50, output_tokens=20,
+        cache_read_input_tokens=900, cache_creation_input_tokens=0
+    )
+    openai_usage = SimpleNamespace(
+        prompt_tokens=1200, prompt_tokens_details=SimpleNamespace(cached_tokens=1024)
+    )
+    
+    assert cache_usage("anthropic", anthropic_usage) == (950, 900, 0)
+    assert cache_usage("openai", openai_usage) == (1200, 1024, 0)
+    assert cache_usage("openai", SimpleNamespace(prompt_tokens=10, prompt_tokens_details=None)) == (10, 0, 0)
+
+
+def test_streamed_packed_analysis_keeps_partial_results(monkeypatch):
+    """测试流式打包分析：对象闭合即回调，响应中断后只重试缺失的文章"""
+    analyzer = AIAnalyzer(SimpleNamespace(ai=AIConfig(api_key="test-key", stream=True)))
+    text = json.dumps([_item(1), _item(2), _item(3)], ensure_ascii=False)
+    cut = text.index('{"id": 3')
+    received = []
+    
+    def fake_stream(endpoint, prompt):
+        for start in range(0, cut + 10, 8):
+            yield text[start:min(start + 8, cut + 10)]
+        # 第 2 条结果在中断前已经回调
+        assert [article_id for article_id, _ in received] == [1, 2]
+        raise ConnectionError("连接中断")
+    
+    monkeypatch.setattr(analyzer, "_stream", fake_stream)
+    monkeypatch.setattr(analyzer, "_call_api", lambda prompt, validate=None: json.dumps(_item(0, analysis="单独重试")))
+    
+    results = analyzer.analyze_packed(
+        [{"id": i, "title": f"标题 {i}"} for i in (1, 2, 3)],
+        on_result=lambda article_id, result: received.append((article_id, result))
+    )
+    
+    assert set(results) == {1, 2, 3}
+    assert results[3]["analysis_content"] == "单独重试"
+    assert [article_id for article_id, _ in received] == [1, 2, 3]
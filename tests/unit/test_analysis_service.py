@@ -0,0 +1,202 @@
+"""
+分析服务单元测试
+"""
+import pytest
+from types import SimpleNamespace
+from datetime import datetime
+
+from src.config import AnalysisConfig, AppConfig, PrefilterConfig
+from src.db.session import DatabaseManager
+from src.analyzers.usage import UsageLedger
+from src.db.models import LLMUsage, NewsAnalysis, NewsArticle, NewsSummary
+from src.db.repositories import ArticleRepository
+from src.services.analysis_service import AnalysisService
+
+
+class FakeAnalyzer:
+    """返回固定结果的分析器（线程安全）"""
+    
+    def __init__(self, fail_titles=()):
+        self.fail_titles = set(fail_titles)
+        self.usage = UsageLedger()
+        self.chunk_titles = []
+    
+    def analyze_single(self, article):
+        self.usage.record("openai", "gpt-4o-mini", (100, 0, 0), 20, source=article['source'])
+        if article['title'] in self.fail_titles:
+            raise RuntimeError("模拟失败")
+        return {
+            'analysis_type': 'general',
+            'analysis_content': f"分析: {article['title']}",
+            'sentiment': 'neutral',
+            'sentiment_score': 0.5,
+            'key_points': '[]'
+        }
+    
+    def summarize_chunk(self, articles):
+        self.chunk_titles.extend(a['title'] for a in articles)
+        if any(a['title'] in self.fail_titles for a in articles):
+            raise RuntimeError("模拟失败")
+        return {'hot_topics': [a['title'] for a in articles]}
+    
+    def merge_summaries(self, partials, article_count):
+        return {'hot_topics': [t for p in partials for t in p['hot_topics']]}
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建测试数据库并写入文章"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    with manager.session_scope() as session:
+        repo = ArticleRepository(session)
+        for i in range(5):
+            repo.add({
+                "title": f"测试文章 {i}",
+                "url": f"https://example.com/{i}",
+                "source": "测试源",
+                "crawled_at": datetime.now()
+            })
+    return manager
+
+
+def _make_service(db_manager, analyzer, prefilter=None, **analysis_kwargs):
+    config = SimpleNamespace(
+        app=AppConfig(timezone="UTC"),
+        analysis=AnalysisConfig(**analysis_kwargs),
+        prefilter=prefilter or PrefilterConfig(enabled=False)
+    )
+    return AnalysisService(db_manager, analyzer, config)
+
+
+def test_analyze_persists_in_batches(db_manager):
+    """测试分批写入分析结果并标记文章"""
+    service = _make_service(db_manager, FakeAnalyzer(), commit_batch_size=2)
+    
+    assert service.analyze_unanalyzed_articles() == 5
+    
+    with db_manager.session_scope() as session:
+        assert session.query(NewsAnalysis).count() == 5
+        assert session.query(NewsArticle).filter_by(is_analyzed=False).count() == 0
+        # AI 情感覆盖入库时的词典情感
+        assert {a.sentiment_source for a in session.query(NewsArticle)} == {"llm"}
+        # 工作线程中的调用归属到同一次运行
+        usage = session.query(LLMUsage).all()
+        assert len(usage) == 5
+        assert len({u.run_id for u in usage}) == 1
+        assert usage[0].run_id.startswith("analyze-")
+        assert {u.source for u in usage} == {"测试源"}
+
+
+def test_failed_articles_stay_unanalyzed(db_manager):
+    """测试分析失败的文章保持未分析状态"""
+    analyzer = FakeAnalyzer(fail_titles={"测试文章 3"})
+    service = _make_service(db_manager, analyzer, commit_batch_size=10)
+    
+    assert service.analyze_unanalyzed_articles() == 4
+    
+    with db_manager.session_scope() as session:
+        remaining = session.query(NewsArticle).filter_by(is_analyzed=False).all()
+        assert [a.title for a in remaining] == ["测试文章 3"]
+
+
+def test_daily_summary_covers_all_articles(db_manager):
+    """测试每日摘要分块汇总后合并，覆盖当天全部文章"""
+    service = _make_service(db_manager, FakeAnalyzer(), summary_chunk_size=2, summary_fan_in=2)
+    
+    assert service.generate_daily_summary(datetime.now().date()) is True
+    assert service.generate_daily_summary(datetime.now().date()) is True
+    
+    with db_manager.session_scope() as session:
+        summaries = session.query(NewsSummary).filter_by(summary_type='daily').all()
+        assert len(summaries) == 1
+        assert summaries[0].article_count == 5
+        for i in range(5):
+            assert f"测试文章 {i}" in summaries[0].summary_content
+
+
+def test_incremental_summaries_merge_into_daily_and_weekly(db_manager):
+    """测试增量摘要按水位只处理新文章，每日 / 每周摘要由部分摘要合并"""
+    service = _make_service(db_manager, FakeAnalyzer(), summary_chunk_size=2, summary_fan_in=2)
+    
+    assert service.generate_hourly_summary() == 5
+    assert service.generate_hourly_summary() == 0
+    
+    with db_manager.session_scope() as session:
+        repo = ArticleRepository(session)
+        for i in range(5, 7):
+            repo.add({
+                "title": f"测试文章 {i}",
+                "url": f"https://example.com/{i}",
+                "source": "测试源",
+                "crawled_at": datetime.now()
+            })
+    
+    assert service.generate_hourly_summary() == 2
+    assert service.generate_weekly_summary() is True
+    
+    with db_manager.session_scope() as session:
+        counts = {
+            summary.summary_type: summary.article_count
+            for summary in session.query(NewsSummary).filter(NewsSummary.summary_type != 'hourly')
+        }
+        hourly = session.query(NewsSummary).filter_by(summary_type='hourly').all()
+        assert [h.article_count for h in hourly] == [5, 2]
+        assert counts == {'daily': 7, 'weekly': 7}
+
+
+def test_incremental_summary_only_sends_new_articles(db_manager):
+    """测试再次汇总时只有新文章请求模型（启用聚类时也一样），每日摘要只合并已保存的部分摘要"""
+    analyzer = FakeAnalyzer()
+    service = _make_service(db_manager, analyzer, summary_chunk_size=2, summary_max_topics=3)
+    
+    assert service.generate_hourly_summary() == 5
+    assert len(analyzer.chunk_titles) == 3
+    
+    analyzer.chunk_titles.clear()
+    with db_manager.session_scope() as session:
+        for i in range(5, 7):
+            ArticleRepository(session).add({
+                "title": f"测试文章 {i}",
+                "url": f"https://example.com/{i}",
+                "source": "测试源",
+                "crawled_at": datetime.now()
+            })
+    
+    assert service.generate_daily_summary() is True
+    assert sorted(analyzer.chunk_titles) == ["测试文章 5", "测试文章 6"]
+
+
+def test_failed_chunk_fails_summary_and_retry_reuses_saved_chunks(db_manager):
+    """测试任一分块失败时不保存摘要，重试时只重新汇总失败的分块"""
+    analyzer = FakeAnalyzer(fail_titles={"测试文章 3"})
+    service = _make_service(db_manager, analyzer, summary_chunk_size=2, summary_fan_in=2)
+    
+    assert service.generate_daily_summary() is False
+    assert len(analyzer.chunk_titles) == 5
+    with db_manager.session_scope() as session:
+        assert session.query(NewsSummary).count() == 0
+    
+    analyzer.fail_titles.clear()
+    analyzer.chunk_titles.clear()
+    assert service.generate_daily_summary() is True
+    assert analyzer.chunk_titles == ["测试文章 2", "测试文章 3"]
+    with db_manager.session_scope() as session:
+        assert session.query(NewsSummary).filter_by(summary_type='daily').one().article_count == 5
+
+
+def test_prefilter_routes_top_articles_to_llm(db_manager):
+    """测试低重要度文章只写本地标签，高重要度文章优先交给 AI"""
+    with db_manager.session_scope() as session:
+        for article_id, importance in zip(range(1, 6), [0.9, 0.1, 0.5, 0.05, 0.7]):
+            session.get(NewsArticle, article_id).importance = importance
+    
+    prefilter = PrefilterConfig(min_score=0.2)
+    service = _make_service(db_manager, FakeAnalyzer(), prefilter=prefilter)
+    
+    assert service.analyze_unanalyzed_articles(limit=2) == 2
+    
+    with db_manager.session_scope() as session:
+        analyses = {a.article_id: a.analysis_type for a in session.query(NewsAnalysis)}
+        assert analyses == {1: 'general', 5: 'general', 2: 'local', 4: 'local'}
+        remaining = session.query(NewsArticle).filter_by(is_analyzed=False).all()
+        assert [a.id for a in remaining] == [3]
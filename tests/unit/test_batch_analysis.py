@@ -0,0 +1,179 @@
+"""
+批处理分析单元测试（使用本地 HTTP 服务模拟 OpenAI Batch 接口）
+"""
+import email
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from src.config import AIConfig, AnalysisConfig, AppConfig, BatchConfig, PrefilterConfig, UsageConfig
+from src.analyzers.ai_analyzer import AIAnalyzer
+from src.db.session import DatabaseManager
+from src.db.models import AnalysisBatchJob, LLMUsage, NewsAnalysis, NewsArticle
+from src.db.repositories import AnalysisQueueRepository, ArticleRepository
+from src.services.batch_analysis_service import BatchAnalysisService
+
+
+class FakeBatchAPI(BaseHTTPRequestHandler):
+    """模拟 OpenAI Files / Batches 接口：第一次查询返回进行中，之后返回已完成"""
+
+    files = {}
+    batches = {}
+    fail_custom_ids = set()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, payload, content_type='application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers['Content-Length']))
+
+    def do_POST(self):
+        if self.path == '/v1/files':
+            message = email.message_from_bytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + self._body()
+            )
+            content = next(
+                part.get_payload(decode=True) for part in message.get_payload()
+                if part.get_param('name', header='content-disposition') == 'file'
+            )
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = content
+            self._reply({
+                'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': 0,
+                'filename': 'job.jsonl', 'purpose': 'batch', 'status': 'processed'
+            })
+        elif self.path == '/v1/batches':
+            request = json.loads(self._body())
+            batch_id = f"batch-{len(self.batches)}"
+            self.batches[batch_id] = {'request': request, 'polls': 0}
+            self._reply(self._batch(batch_id))
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        if self.path.startswith('/v1/batches/'):
+            batch_id = self.path.rsplit('/', 1)[1]
+            self.batches[batch_id]['polls'] += 1
+            self._reply(self._batch(batch_id))
+        elif self.path.endswith('/content'):
+            self._reply(self.files[self.path.split('/')[3]], 'application/octet-stream')
+        else:
+            self.send_error(404)
+
+    def _batch(self, batch_id):
+        batch = self.batches[batch_id]
+        input_file_id = batch['request']['input_file_id']
+        lines = self.files[input_file_id].decode().splitlines()
+        done = batch['polls'] >= 2
+        output_file_id = None
+        if done:
+            output_file_id = f"{batch_id}-output"
+            self.files[output_file_id] = '\n'.join(
+                json.dumps(self._result(json.loads(line))) for line in lines
+            ).encode()
+        return {
+            'id': batch_id, 'object': 'batch', 'endpoint': batch['request']['endpoint'],
+            'completion_window': '24h', 'created_at': 0, 'input_file_id': input_file_id,
+            'status': 'completed' if done else 'in_progress',
+            'output_file_id': output_file_id,
+            'request_counts': {'total': len(lines), 'completed': len(lines) if done else 0, 'failed': 0}
+        }
+
+    def _result(self, request):
+        custom_id = request['custom_id']
+        if custom_id in self.fail_custom_ids:
+            return {'custom_id': custom_id, 'response': {'status_code': 500, 'body': {}}}
+        prompt = request['body']['messages'][-1]['content']
+        title = prompt.split('标题: ', 1)[1].split('\n', 1)[0]
+        content = json.dumps({
+            'analysis': f"批处理分析: {title}",
+            'sentiment': 'negative',
+            'sentiment_score': 0.2,
+            'key_points': ['要点']
+        }, ensure_ascii=False)
+        return {
+            'custom_id': custom_id,
+            'response': {'status_code': 200, 'body': {
+                'choices': [{'message': {'content': content}}],
+                'usage': {'prompt_tokens': 1000, 'completion_tokens': 100, 'total_tokens': 1100}
+            }}
+        }
+
+
+@pytest.fixture
+def batch_api():
+    """启动本地模拟接口"""
+    FakeBatchAPI.files = {}
+    FakeBatchAPI.batches = {}
+    FakeBatchAPI.fail_custom_ids = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBatchAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+@pytest.fixture
+def service(tmp_path, batch_api):
+    """创建写入文章的数据库和批处理分析服务"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    with manager.session_scope() as session:
+        repo = ArticleRepository(session)
+        for i in range(4):
+            repo.add({
+                "title": f"测试文章 {i}",
+                "url": f"https://example.com/{i}",
+                "source": "测试源",
+                "crawled_at": datetime.now()
+            })
+    config = SimpleNamespace(
+        app=AppConfig(timezone="UTC"),
+        ai=AIConfig(provider="openai", api_key="test-key", base_url=batch_api),
+        analysis=AnalysisConfig(),
+        prefilter=PrefilterConfig(enabled=False),
+        batch=BatchConfig(job_dir=str(tmp_path / "jobs"), min_backlog=1),
+        usage=UsageConfig(prices={"gpt-4o-mini": {"input": 1.0, "output": 10.0}})
+    )
+    return BatchAnalysisService(manager, AIAnalyzer(config), config)
+
+
+def test_batch_submit_poll_and_ingest(service):
+    """测试提交任务、轮询状态并写入结果，失败的请求释放租约"""
+    FakeBatchAPI.fail_custom_ids = {"article-3"}
+
+    assert service.run_scheduled() == 0
+    assert service.pending_jobs() == 1
+    # 批处理任务中的文章不会被同步分析领取
+    with service.db_manager.session_scope() as session:
+        assert AnalysisQueueRepository(session).claim("interactive", limit=10) == []
+
+    # 第一次查询时任务进行中，第二次查询时完成
+    assert service.poll() == 0
+    assert service.poll() == 3
+    assert service.pending_jobs() == 0
+
+    with service.db_manager.session_scope() as session:
+        job = session.query(AnalysisBatchJob).one()
+        assert (job.status, job.succeeded_count, job.failed_count) == ("ingested", 3, 1)
+        assert session.query(NewsAnalysis).count() == 3
+        analyzed = session.query(NewsArticle).filter_by(is_analyzed=True).all()
+        assert {a.sentiment_source for a in analyzed} == {"llm"}
+        # 没有结果的文章可以重新领取
+        assert sorted(AnalysisQueueRepository(session).claim("retry", limit=10)) == [3]
+        # 批处理调用按折扣价记录用量
+        usage = session.query(LLMUsage).all()
+        assert len(usage) == 3
+        assert {(u.mode, u.run_id, u.source) for u in usage} == {("batch", f"batch-{job.id}", "测试源")}
+        assert usage[0].estimated_cost == pytest.approx((1000 * 1.0 + 100 * 10.0) / 1_000_000 * 0.5)
@@ -0,0 +1,41 @@
+"""
+本地话题聚类单元测试
+"""
+from src.analyzers.clustering import char_ngrams, cluster_topics, representatives
+
+
+HEADLINES = [
+    "央行宣布下调存款准备金率",
+    "央行宣布降准0.5个百分点",
+    "央行降准释放长期资金",
+    "台风登陆广东沿海地区",
+    "台风登陆广东 多地停课",
+    "广东沿海迎台风登陆",
+]
+
+
+def _articles():
+    return [{"id": i, "title": title} for i, title in enumerate(HEADLINES)]
+
+
+def test_char_ngrams_ignores_punctuation():
+    """测试 n-gram 不跨越标点和空格"""
+    grams = char_ngrams("AI，来了", ngram_range=(2, 2))
+    assert grams == ["ai", "来了"]
+
+
+def test_cluster_topics_groups_similar_headlines():
+    """测试相似标题聚为同一话题"""
+    topics = cluster_topics(_articles(), max_clusters=2)
+    
+    groups = sorted(sorted(t["article_ids"]) for t in topics)
+    assert groups == [[0, 1, 2], [3, 4, 5]]
+    assert all(t["size"] == 3 for t in topics)
+
+
+def test_representatives_carry_cluster_size():
+    """测试代表文章附带话题规模，文章数不超过上限时不聚类"""
+    assert representatives(_articles(), max_clusters=10) is None
+    
+    items = representatives(_articles(), max_clusters=2)
+    assert sum(item["cluster_size"] for item in items) == len(HEADLINES)
@@ -0,0 +1,29 @@
+"""
+服务容器单元测试（不发起网络请求）
+"""
+from src.config.settings import Settings
+from src.db.session import DatabaseManager
+from src.services import ServiceContainer
+
+
+def test_container_shares_and_closes_clients(tmp_path):
+    """测试分析器延迟创建、各服务共用同一实例，关闭时释放连接"""
+    config = Settings("app_config.yaml")
+    config.ai.api_key = "test-key"
+    config.llm_cache.enabled = False
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    
+    services = ServiceContainer(config, manager)
+    assert services._analyzer is None
+    
+    analysis_service = services.analysis_service
+    assert services.analysis_service is analysis_service
+    assert services.translation_service.analyzer is analysis_service.analyzer is services.analyzer
+    assert services.crawler_service.rss_crawler is services.rss_crawler
+    
+    closed = []
+    services.rss_crawler.session.close = lambda: closed.append("rss")
+    services.platform_crawler.client.session.close = lambda: closed.append("platform")
+    services.analyzer.client.close = lambda: closed.append("ai")
+    services.close()
+    assert closed == ["rss", "platform", "ai"]
@@ -0,0 +1,91 @@
+"""
+向量索引单元测试
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.config import EmbeddingConfig
+from src.analyzers.embeddings import HashingEmbedder, normalize_rows
+from src.analyzers.vector_store import VectorStore
+from src.db.session import DatabaseManager
+from src.db.repositories import ArticleRepository
+from src.services.embedding_service import EmbeddingService
+
+
+def test_hashing_embedder_ranks_similar_titles():
+    """测试哈希向量：相同话题的标题相似度更高，结果与批次无关"""
+    embedder = HashingEmbedder(dim=512)
+    vectors = embedder.embed(["央行宣布下调存款准备金率", "央行下调存款准备金率0.5个百分点", "男篮世界杯小组赛"])
+    
+    assert vectors.shape == (3, 512)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1, atol=1e-5)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2] + 0.3
+    assert np.array_equal(embedder.embed(["男篮世界杯小组赛"])[0], vectors[2])
+
+
+def test_vector_store_flat_and_ivf_search(tmp_path):
+    """测试向量追加、重新打开、读取方刷新，以及 IVF 与暴力检索结果一致"""
+    rng = np.random.default_rng(0)
+    # 40 个话题中心附近的向量，IVF 检索应找到与暴力检索相同的近邻
+    centers = normalize_rows(rng.standard_normal((40, 32)).astype(np.float32))
+    vectors = normalize_rows(centers[np.arange(4000) % 40] + 0.1 * rng.standard_normal((4000, 32)).astype(np.float32))
+    ids = list(range(1, 4001))
+    
+    writer = VectorStore(str(tmp_path), 32, "test", ivf_min_rows=2000, nprobe=4)
+    reader = VectorStore(str(tmp_path), 32, "test", ivf_min_rows=2000, nprobe=4)
+    assert writer.add(ids[:3000], vectors[:3000]) == 3000
+    # 已写入的 ID 和乱序的 ID 被跳过
+    assert writer.add([5, 3001, 3000, 3002], vectors[[4, 3000, 2999, 3001]]) == 2
+    assert writer.add(ids[3002:], vectors[3002:]) == 998
+    assert writer.uses_ivf and writer.meta["trained_count"] == 3000
+    
+    assert reader.count == 0
+    assert reader.refresh() and reader.count == 4000 and reader.uses_ivf
+    assert np.allclose(reader.get(42), vectors[41], atol=1e-3)
+    assert reader.get(999999) is None
+    
+    flat = VectorStore(str(tmp_path), 32, "test", ivf_min_rows=0)
+    for query_id in (1, 777, 3999):
+        expected = flat.search(vectors[query_id - 1], k=5, exclude={query_id})
+        found = reader.search(vectors[query_id - 1], k=5, exclude={query_id})
+        assert len(found) == 5 and query_id not in [i for i, _ in found]
+        assert [i for i, _ in found] == [i for i, _ in expected]
+        # 同一话题的文章 ID 模 40 相同
+        assert all((i - query_id) % 40 == 0 for i, _ in found)
+
+    # 重新训练切换到新版本的索引文件，旧版本文件被删除
+    writer.train()
+    assert writer.meta["lists_file"] == "lists-2.i32" and writer.meta["centroids_file"] == "centroids-2.npy"
+    assert sorted(p.name for p in tmp_path.glob("*-*")) == ["centroids-2.npy", "lists-2.i32"]
+    assert reader.refresh() and reader.search(vectors[776], k=5, exclude={777})[0][0] % 40 == 777 % 40
+
+
+def test_embedding_service_indexes_and_finds_related(tmp_path):
+    """测试增量写入向量索引并查询相关文章，后端变化时重建"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    titles = ["央行宣布下调存款准备金率", "男篮世界杯小组赛今晚开打", "央行下调存款准备金率0.5个百分点",
+              "新能源汽车销量创新高", "存款准备金率下调释放长期资金"]
+    with manager.session_scope() as session:
+        repo = ArticleRepository(session)
+        for i, title in enumerate(titles):
+            repo.add({"title": title, "url": f"https://example.com/{i}", "source": "测试源",
+                      "crawled_at": datetime.now()})
+    config = SimpleNamespace(embedding=EmbeddingConfig(enabled=True, dim=512, path=str(tmp_path / "vectors")))
+    service = EmbeddingService(manager, config)
+    
+    assert service.index_pending(limit=3) == 3
+    assert service.index_pending() == 2
+    assert service.index_pending() == 0
+    
+    related = service.related(1, k=2)
+    assert {a["id"] for a in related} == {3, 5}
+    assert related[0]["score"] >= related[1]["score"]
+    assert service.related(999) is None
+    
+    # 维度变化后清空并重建
+    config.embedding.dim = 256
+    rebuilt = EmbeddingService(manager, config)
+    assert rebuilt.index_pending() == 5
+    assert rebuilt.store.meta["dim"] == 256
@@ -0,0 +1,61 @@
+"""
+并发分析引擎单元测试
+"""
+import threading
+import time
+
+from src.analyzers.engine import ConcurrentAnalysisEngine, EVENT_DONE, EVENT_ERROR, EVENT_PARTIAL
+
+
+def test_in_flight_limit():
+    """测试在途请求数不超过上限"""
+    lock = threading.Lock()
+    state = {"current": 0, "peak": 0}
+    
+    def work(item):
+        with lock:
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+        time.sleep(0.02)
+        with lock:
+            state["current"] -= 1
+        return item * 2
+    
+    engine = ConcurrentAnalysisEngine(max_in_flight=3)
+    results = list(engine.imap_unordered(work, range(10)))
+    
+    assert sorted(result for _, result, _ in results) == [i * 2 for i in range(10)]
+    assert state["peak"] == 3
+
+
+def test_errors_are_yielded():
+    """测试单项失败不影响其他项"""
+    def work(item):
+        if item == 2:
+            raise ValueError("boom")
+        return item
+    
+    engine = ConcurrentAnalysisEngine(max_in_flight=2)
+    results = {item: (result, error) for item, result, error in engine.imap_unordered(work, range(4))}
+    
+    assert isinstance(results[2][1], ValueError)
+    assert results[3] == (3, None)
+
+
+def test_imap_streaming_yields_partials_before_done():
+    """测试部分结果先于完成事件产出，失败的任务保留已产出的部分结果"""
+    engine = ConcurrentAnalysisEngine(max_in_flight=2)
+    
+    def work(item, emit):
+        emit(item * 10)
+        emit(item * 10 + 1)
+        if item == 2:
+            raise RuntimeError("中断")
+        return "ok"
+    
+    events = list(engine.imap_streaming(work, range(4)))
+    
+    for item in range(4):
+        own = [(kind, value) for i, kind, value in events if i == item]
+        assert own[:2] == [(EVENT_PARTIAL, item * 10), (EVENT_PARTIAL, item * 10 + 1)]
+        assert own[2][0] == (EVENT_ERROR if item == 2 else EVENT_DONE)
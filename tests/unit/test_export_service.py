@@ -0,0 +1,104 @@
+"""
+导出服务单元测试
+"""
+import pytest
+from types import SimpleNamespace
+from datetime import datetime
+
+from src.config import ExportConfig
+from src.db.session import DatabaseManager
+from src.db.repositories import AnalysisRepository, ArticleRepository, SummaryRepository
+from src.services.export_service import ExportService
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """创建测试数据库"""
+    return DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest.fixture
+def export_service(db_manager, tmp_path):
+    """创建导出服务"""
+    config = SimpleNamespace(export=ExportConfig(output_dir=str(tmp_path / 'exports'), batch_size=2))
+    return ExportService(db_manager, config)
+
+
+def _add_articles(db_manager, days):
+    with db_manager.session_scope() as session:
+        repo = ArticleRepository(session)
+        for i, day in enumerate(days):
+            repo.add({
+                "title": f"测试文章 {i}",
+                "url": f"https://example.com/{day}/{i}",
+                "source": "测试源",
+                "crawled_at": datetime(2024, 1, day, 12, 0, 0)
+            })
+
+
+def test_export_partitions_by_day(db_manager, export_service, tmp_path):
+    """测试按天分区导出"""
+    _add_articles(db_manager, [1, 1, 1, 2, 2])
+
+    count = export_service.export_table('news_articles')
+    assert count == 5
+
+    table_dir = tmp_path / 'exports' / 'news_articles'
+    day1 = pq.read_table(table_dir / 'date=2024-01-01')
+    day2 = pq.read_table(table_dir / 'date=2024-01-02')
+    assert day1.num_rows == 3
+    assert day2.num_rows == 2
+    assert not list(table_dir.rglob('*.tmp'))
+
+
+def _add_analyses(db_manager, count):
+    with db_manager.session_scope() as session:
+        repo = AnalysisRepository(session)
+        for i in range(count):
+            repo.add(i + 1, {"analysis_content": f"分析 {i}", "created_at": datetime(2024, 1, 1, 12, 0, 0)})
+
+
+def test_export_is_incremental_and_full_replaces(db_manager, export_service, tmp_path):
+    """测试只追加的表增量导出，全量导出替换旧文件而不是重复写入"""
+    table_dir = tmp_path / 'exports' / 'news_analysis'
+    _add_analyses(db_manager, 2)
+    assert export_service.export_table('news_analysis') == 2
+    assert export_service.export_table('news_analysis') == 0
+
+    _add_analyses(db_manager, 1)
+    assert export_service.export_table('news_analysis') == 1
+    assert pq.read_table(table_dir).num_rows == 3
+
+    assert export_service.export_table('news_analysis', full=True) == 3
+    assert export_service.export_table('news_analysis', full=True) == 3
+    assert pq.read_table(table_dir).num_rows == 3
+    assert not [p for p in (tmp_path / 'exports').iterdir() if p.name.startswith('.')]
+
+
+def test_export_articles_by_change_watermark(db_manager, export_service, tmp_path):
+    """测试文章增量导出新增和修改过的行，摘要每次全量导出且不重复"""
+    export_service.export_config.change_lag_seconds = 0
+    _add_articles(db_manager, [1, 2])
+    summary = {"summary_date": datetime(2024, 1, 1), "summary_type": "daily", "summary_content": "旧摘要"}
+    with db_manager.session_scope() as session:
+        SummaryRepository(session).upsert(dict(summary))
+    assert export_service.export_table('news_summaries') == 1
+    assert export_service.export_table('news_articles') == 2
+    assert export_service.export_table('news_articles') == 0
+
+    with db_manager.session_scope() as session:
+        SummaryRepository(session).upsert(dict(summary, summary_content="新摘要"))
+        ArticleRepository(session).set_sentiments([(1, "positive", 0.8)])
+    _add_articles(db_manager, [3])
+    assert export_service.export_table('news_summaries') == 1
+    assert export_service.export_table('news_articles') == 2
+
+    summaries = pq.read_table(tmp_path / 'exports' / 'news_summaries')
+    assert summaries.column("summary_content").to_pylist() == ["新摘要"]
+    # 修改过的文章追加为新版本，按 id 保留 updated_at 最新的一行
+    rows = sorted(pq.read_table(tmp_path / 'exports' / 'news_articles').to_pylist(), key=lambda r: r["updated_at"])
+    latest = {row["id"]: row for row in rows}
+    assert len(rows) == 4 and sorted(latest) == [1, 2, 3]
+    assert latest[1]["sentiment"] == "positive"
@@ -0,0 +1,90 @@
+"""
+实时推送单元测试
+"""
+import asyncio
+from datetime import datetime
+
+from src.api.feed import EVENT_ANALYSIS, EVENT_ARTICLE, EVENT_RESET, FeedCursor, LiveFeed
+from src.db.session import DatabaseManager
+from src.db.repositories import AnalysisRepository, ArticleRepository
+
+
+def _add_article(manager, title, source="源A", category="财经"):
+    with manager.session_scope() as session:
+        article = ArticleRepository(session).add({
+            "title": title, "url": f"https://example.com/{title}", "source": source,
+            "category": category, "crawled_at": datetime.now()
+        })
+        return article.id
+
+
+def _add_analysis(manager, article_id):
+    with manager.session_scope() as session:
+        return AnalysisRepository(session).add(
+            article_id, {"analysis_content": "内容", "sentiment": "positive"}
+        ).id
+
+
+def test_feed_cursor_parse():
+    """测试 Last-Event-ID 解析"""
+    assert FeedCursor.parse("12-3") == FeedCursor(12, 3)
+    assert FeedCursor(12, 3).event_id == "12-3"
+    assert FeedCursor.parse("abc") is None
+    assert FeedCursor.parse("1-2-3") is None
+    assert FeedCursor.parse(None) is None
+
+
+def test_feed_backlog_resume_and_filters(tmp_path):
+    """测试断点续传补发过滤后的历史事件，补发超过上限时追加 reset"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    first = _add_article(manager, "a1")
+    _add_article(manager, "a2", source="源B")
+    third = _add_article(manager, "a3")
+    _add_analysis(manager, third)
+
+    async def scenario():
+        feed = LiveFeed(manager, backlog_limit=10)
+        subscription, backlog = await feed.subscribe(source="源A", since_article_id=first, since_analysis_id=0)
+        assert [(t, p["id"]) for t, p in backlog] == [(EVENT_ARTICLE, third), (EVENT_ANALYSIS, 1)]
+        assert subscription.format(*backlog[0]).startswith(f"id: {third}-0\nevent: article\n")
+        feed.unsubscribe(subscription)
+
+        feed = LiveFeed(manager, backlog_limit=1)
+        _, backlog = await feed.subscribe(types=(EVENT_ARTICLE,), since_article_id=0)
+        assert [t for t, _ in backlog] == [EVENT_ARTICLE, EVENT_RESET]
+
+    asyncio.run(scenario())
+
+
+def test_feed_delivers_new_rows_once(tmp_path):
+    """测试只推送订阅后提交的数据、按来源过滤，且每条只推送一次"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    _add_article(manager, "old")
+
+    async def scenario():
+        feed = LiveFeed(manager, poll_interval=0.01)
+        task = asyncio.create_task(feed.run())
+        try:
+            everything, _ = await feed.subscribe()
+            only_b, _ = await feed.subscribe(source="源B")
+            new_id = _add_article(manager, "new", source="源B")
+            _add_article(manager, "other")
+
+            events = [await everything.next_event(2), await everything.next_event(2)]
+            assert [p["title"] for _, p in events] == ["new", "other"]
+            event_type, payload = await only_b.next_event(2)
+            assert (event_type, payload["id"]) == (EVENT_ARTICLE, new_id)
+
+            _add_analysis(manager, new_id)
+            event_type, payload = await only_b.next_event(2)
+            assert (event_type, payload["article_id"]) == (EVENT_ANALYSIS, new_id)
+            assert await everything.next_event(2) is not None
+            assert await everything.next_event(0.1) is None
+
+            feed.unsubscribe(everything)
+            feed.unsubscribe(only_b)
+            assert feed.subscriber_count == 0
+        finally:
+            task.cancel()
+
+    asyncio.run(scenario())
@@ -0,0 +1,72 @@
+"""
+后台作业单元测试
+"""
+import threading
+import time
+
+from src.tasks.jobs import JOB_FAILED, JOB_SUCCEEDED, JobManager
+
+
+def _wait(manager, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in (JOB_SUCCEEDED, JOB_FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("作业未在限定时间内结束")
+
+
+def test_job_manager_coalesces_and_reports_progress():
+    """测试同类作业合并、进度累加，结束后可再次提交"""
+    manager = JobManager(max_workers=2)
+    release = threading.Event()
+    calls = []
+    
+    def fetch(progress):
+        calls.append(1)
+        progress(total=3)
+        progress(done=1, saved=4)
+        release.wait(5)
+        progress(done=2, saved=1)
+        return {"saved_count": 5}
+    
+    first, created = manager.submit('fetch', fetch)
+    second, created_again = manager.submit('fetch', fetch)
+    assert created and not created_again
+    assert second['id'] == first['id']
+    
+    # 其他类型的作业不受影响
+    other, _ = manager.submit('analyze', lambda progress: 1 / 0)
+    assert other['id'] != first['id']
+    
+    release.set()
+    job = _wait(manager, first['id'])
+    assert job['status'] == JOB_SUCCEEDED
+    assert job['progress'] == {"total": 3, "done": 3, "saved": 5}
+    assert job['result'] == {"saved_count": 5}
+    assert job['started_at'] <= job['finished_at']
+    assert calls == [1]
+    
+    failed = _wait(manager, other['id'])
+    assert failed['status'] == JOB_FAILED and 'division' in failed['error']
+    
+    third, created = manager.submit('fetch', fetch)
+    assert created and third['id'] != first['id']
+    _wait(manager, third['id'])
+    assert [job['id'] for job in manager.list()] == [third['id'], other['id'], first['id']]
+    manager.shutdown(wait=True)
+
+
+def test_job_manager_prunes_finished_history():
+    """测试只保留最近的已结束作业"""
+    manager = JobManager(max_workers=1, history=2)
+    ids = []
+    for i in range(4):
+        job, _ = manager.submit(f'job-{i}', lambda progress: None)
+        ids.append(job['id'])
+        _wait(manager, job['id'])
+    
+    assert manager.get(ids[0]) is None
+    assert [job['id'] for job in manager.list()] == [ids[3], ids[2]]
+    manager.shutdown(wait=True)
@@ -0,0 +1,36 @@
+"""
+流式 JSON 解析单元测试
+"""
+import json
+
+from src.analyzers.json_stream import JsonArrayItemStream
+
+
+ITEMS = [
+    {"id": i, "analysis": "含 \"引号\"、{括号]} 和 \\ 的分析", "key_points": ["要点"]}
+    for i in range(4)
+]
+
+
+def _feed_in_chunks(text, size):
+    parser = JsonArrayItemStream()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return items
+
+
+def test_items_parsed_across_chunk_boundaries():
+    """测试任意切分位置下都能按顺序取出数组元素（含代码块和外层对象）"""
+    text = "结果如下：\n```json\n" + json.dumps({"results": ITEMS}, ensure_ascii=False) + "\n```"
+    
+    for size in (1, 3, 7, 64):
+        assert _feed_in_chunks(text, size) == ITEMS
+
+
+def test_truncated_response_keeps_completed_items():
+    """测试响应被截断时返回已闭合的对象"""
+    text = json.dumps(ITEMS, ensure_ascii=False)
+    cut = text.index('{"id": 3')
+    
+    assert _feed_in_chunks(text[:cut + 20], 5) == ITEMS[:3]
@@ -0,0 +1,42 @@
+"""
+LLM 结果缓存单元测试
+"""
+from src.analyzers.cache import LLMResultCache
+
+
+def test_key_normalizes_whitespace():
+    """测试缓存键对空白和全角字符不敏感，对模型参数敏感"""
+    key = LLMResultCache.make_key("标题：测试  新闻\n", "gpt-4o-mini", "openai", "1", 0.7)
+    assert key == LLMResultCache.make_key("标题:测试 新闻", "gpt-4o-mini", "openai", "1", 0.7)
+    assert key != LLMResultCache.make_key("标题:测试 新闻", "gpt-4o", "openai", "1", 0.7)
+    assert key != LLMResultCache.make_key("标题:测试 新闻", "gpt-4o-mini", "openai", "2", 0.7)
+
+
+def test_hit_miss_and_metrics(tmp_path):
+    """测试命中统计（延迟写入）"""
+    cache = LLMResultCache(str(tmp_path / "cache.db"))
+    assert cache.get("k") is None
+    cache.put("k", "结果")
+    assert cache.get("k") == "结果"
+    # 读取不写数据库，统计先记在内存中，其他进程暂时看不到
+    assert LLMResultCache(str(tmp_path / "cache.db")).stats()["hits"] == 0
+    
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["bytes_saved"] == len("结果".encode("utf-8"))
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    """测试过期和按容量淘汰"""
+    expired = LLMResultCache(str(tmp_path / "ttl.db"), ttl_seconds=-1)
+    expired.put("k", "v")
+    assert expired.get("k") is None
+    
+    cache = LLMResultCache(str(tmp_path / "lru.db"), max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
@@ -0,0 +1,98 @@
+"""
+数据库迁移单元测试
+"""
+from sqlalchemy import create_engine, text
+
+from src.db.session import DatabaseManager
+from src.db.models import NewsArticle, ArticleSource, ArticleCategory
+from src.db.repositories import ArticleRepository
+from src.config.settings import Settings
+from src.services.crawler_service import CrawlerService
+
+
+# 维度表引入之前的 news_articles 表结构
+LEGACY_SCHEMA = """
+CREATE TABLE news_articles (
+    id INTEGER NOT NULL PRIMARY KEY,
+    title VARCHAR(500) NOT NULL,
+    summary TEXT,
+    content TEXT,
+    url VARCHAR(1000) NOT NULL UNIQUE,
+    source VARCHAR(200) NOT NULL,
+    source_type VARCHAR(50),
+    published_at DATETIME,
+    crawled_at DATETIME,
+    language VARCHAR(20),
+    category VARCHAR(100),
+    tags VARCHAR(500),
+    is_analyzed BOOLEAN,
+    is_processed BOOLEAN
+)
+"""
+
+
+def test_dimension_backfill(tmp_path):
+    """测试旧数据库迁移后回填维度表"""
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_SCHEMA))
+        for i, (source, category, tags) in enumerate([
+            ("微博", "hot_platform", "weibo"),
+            ("微博", "hot_platform", "weibo"),
+            ("BBC News", None, None),
+            ("知乎", "hot_platform", "zhihu,tech"),
+        ]):
+            conn.execute(
+                text("INSERT INTO news_articles (title, url, source, source_type, category, tags) "
+                     "VALUES (:title, :url, :source, 'domestic', :category, :tags)"),
+                {"title": f"文章 {i}", "url": f"https://example.com/{i}",
+                 "source": source, "category": category, "tags": tags}
+            )
+    engine.dispose()
+    
+    manager = DatabaseManager(url)
+    with manager.session_scope() as session:
+        assert session.query(ArticleSource).count() == 3
+        assert session.query(ArticleCategory).count() == 1
+        assert session.query(NewsArticle).filter(NewsArticle.source_id.is_(None)).count() == 0
+        assert session.query(NewsArticle).filter(NewsArticle.updated_at.is_(None)).count() == 0
+        
+        repo = ArticleRepository(session)
+        _, weibo_total = repo.search(tag="weibo")
+        _, tech_total = repo.search(tag="tech")
+        _, category_total = repo.search(category="hot_platform")
+        assert (weibo_total, tech_total, category_total) == (2, 1, 3)
+        
+        # 迁移不做本地词典打分，没有 AI 结果的旧文章保持为空
+        assert session.query(NewsArticle).filter(NewsArticle.sentiment.is_(None)).count() == 4
+    
+    # 由抓取服务按本地词典补算
+    config = Settings("app_config.yaml")
+    config.sentiment.enabled = True
+    crawler_service = CrawlerService(manager, None, None, config)
+    assert crawler_service.backfill_sentiment(batch_size=3) == 4
+    assert crawler_service.backfill_sentiment() == 0
+    with manager.session_scope() as session:
+        assert {a.sentiment_source for a in session.query(NewsArticle)} == {"lexicon"}
+    
+    # 再次初始化不会重复执行迁移
+    DatabaseManager(url)
+
+
+def test_add_article_links_dimensions(tmp_path):
+    """测试新文章写入时关联维度"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    with manager.session_scope() as session:
+        repo = ArticleRepository(session)
+        article = repo.add({
+            "title": "测试文章",
+            "url": "https://example.com/dim",
+            "source": "微博",
+            "source_type": "domestic",
+            "category": "hot_platform",
+            "tags": "weibo, hot"
+        })
+        assert article.source_ref.name == "微博"
+        assert article.category_ref.name == "hot_platform"
+        assert sorted(t.name for t in article.tag_refs) == ["hot", "weibo"]
@@ -0,0 +1,38 @@
+"""
+本地预筛打分单元测试
+"""
+from src.analyzers.prefilter import ArticleScorer, load_keyword_file
+
+
+def test_load_keyword_file(tmp_path):
+    """测试解析 frequency_words 格式的关键词文件"""
+    path = tmp_path / "frequency_words.txt"
+    path.write_text("人工智能@2\nAI\n+发布\n\n降准\n!广告\n", encoding="utf-8")
+    
+    groups, filters = load_keyword_file(str(path))
+    
+    assert [g.words for g in groups] == [["人工智能", "ai"], ["降准"]]
+    assert groups[0].required == ["发布"] and groups[0].weight == 2.0
+    assert groups[1].weight == 1.0
+    assert filters == ["广告"]
+
+
+def test_score_batch_features(tmp_path):
+    """测试关键词、热榜排名、重复标题和过滤词对重要度的影响"""
+    path = tmp_path / "frequency_words.txt"
+    path.write_text("降准\n\n!广告\n", encoding="utf-8")
+    scorer = ArticleScorer(*load_keyword_file(str(path)))
+    
+    articles = [
+        {"title": "普通新闻"},
+        {"title": "央行宣布降准"},
+        {"title": "普通新闻", "hot_rank": 1},
+        {"title": "普通新闻"},
+        {"title": "广告：央行降准"},
+    ]
+    scores = scorer.score_batch(articles, duplicates=[False, False, False, True, False])
+    
+    assert scores[1] > scores[0]
+    assert scores[2] > scores[0]
+    assert scores[3] < scores[0]
+    assert scores[4] == 0
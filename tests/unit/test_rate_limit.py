@@ -0,0 +1,77 @@
+"""
+限流与重试单元测试
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.analyzers import rate_limit
+from src.analyzers.rate_limit import RateLimiter, call_with_retry, parse_reset
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """记录 sleep 调用而不实际等待"""
+    recorded = []
+    monkeypatch.setattr(rate_limit.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_parse_reset():
+    """测试解析各提供商的重置时间格式"""
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("6m0s") == 360
+    assert parse_reset("1.5") == 1.5
+    assert parse_reset("soon") is None
+
+
+def test_exhausted_quota_blocks_until_reset(monkeypatch):
+    """测试响应头显示配额耗尽时暂停到重置时间"""
+    limiter = RateLimiter(requests_per_minute=100)
+    limiter.update_from_headers({
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+    })
+
+    waits = []
+
+    def fake_sleep(seconds):
+        waits.append(seconds)
+        limiter._blocked_until = 0.0
+
+    monkeypatch.setattr(rate_limit.time, "sleep", fake_sleep)
+    limiter.acquire()
+
+    assert waits and 1.5 < waits[0] <= 2.0
+
+
+def test_retry_transient_then_succeed(sleeps):
+    """测试临时错误重试并遵守 retry-after"""
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) < 3:
+            raise FakeAPIError(429, {"retry-after": "3"})
+        return "ok"
+
+    assert call_with_retry(func, max_retries=4, base_delay=0.1) == "ok"
+    assert len(calls) == 3
+    assert all(delay >= 3 for delay in sleeps)
+
+
+def test_non_transient_error_not_retried(sleeps):
+    """测试 4xx 等非临时错误直接抛出"""
+    def func():
+        raise FakeAPIError(400)
+
+    with pytest.raises(FakeAPIError):
+        call_with_retry(func, max_retries=4)
+    assert sleeps == []
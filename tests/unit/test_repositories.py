@@ -6,8 +6,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 
-from src.db.models import Base, NewsArticle
-from src.db.repositories import ArticleRepository
+from src.db.models import Base, NewsArticle, AnalysisLease
+from src.db.repositories import ArticleRepository, AnalysisQueueRepository
 
 
 @pytest.fixture
@@ -98,3 +98,65 @@ def test_search_articles(article_repo):
     articles, total = article_repo.search(keyword="Python", limit=10)
     assert total >= 1
     assert any("Python" in a.title for a in articles)
+
+
+def test_iter_batches_since(article_repo):
+    """测试按 id 流式读取文章"""
+    for i in range(5):
+        article_repo.add({
+            "title": f"测试文章 {i}",
+            "url": f"https://example.com/stream{i}",
+            "source": "测试源",
+            "crawled_at": datetime(2024, 1, i + 1)
+        })
+    
+    batches = list(article_repo.iter_batches_since(
+        since=datetime(2024, 1, 2),
+        fields=['id', 'title'],
+        batch_size=2
+    ))
+    assert [len(b) for b in batches] == [2, 2]
+    assert set(batches[0][0].keys()) == {'id', 'title'}
+    
+    rows = [row for batch in article_repo.iter_batches_since(after_id=4) for row in batch]
+    assert [row['id'] for row in rows] == [5]
+
+
+def test_claim_does_not_overlap(article_repo, db_session):
+    """测试多个分析进程领取的文章不重复"""
+    for i in range(5):
+        article_repo.add({
+            "title": f"测试文章 {i}",
+            "url": f"https://example.com/queue{i}",
+            "source": "测试源",
+            "crawled_at": datetime.now()
+        })
+    
+    queue_repo = AnalysisQueueRepository(db_session)
+    first = queue_repo.claim(owner="worker-a", limit=3)
+    second = queue_repo.claim(owner="worker-b", limit=3)
+    
+    assert len(first) == 3
+    assert len(second) == 2
+    assert not set(first) & set(second)
+    assert queue_repo.claim(owner="worker-c", limit=3) == []
+
+
+def test_expired_lease_is_reclaimed(article_repo, db_session):
+    """测试过期租约可被重新领取"""
+    article_repo.add({
+        "title": "测试文章",
+        "url": "https://example.com/lease",
+        "source": "测试源",
+        "crawled_at": datetime.now()
+    })
+    
+    queue_repo = AnalysisQueueRepository(db_session)
+    claimed = queue_repo.claim(owner="worker-a", limit=1, lease_seconds=0)
+    assert len(claimed) == 1
+    
+    reclaimed = queue_repo.claim(owner="worker-b", limit=1)
+    assert reclaimed == claimed
+    lease = db_session.query(AnalysisLease).filter_by(article_id=claimed[0]).one()
+    assert lease.owner == "worker-b"
+    assert lease.attempts == 2
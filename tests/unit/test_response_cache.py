@@ -0,0 +1,80 @@
+"""
+读接口响应缓存单元测试
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.cache import (
+    MemoryResponseBackend,
+    ResponseCache,
+    ResponseCacheMiddleware,
+    SQLiteResponseBackend,
+)
+from src.core.generation import DataGeneration
+
+
+def _client(tmp_path, backend):
+    calls = []
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+    
+    @app.get("/api/articles")
+    def articles(source: str = None, limit: int = 20):
+        calls.append((source, limit))
+        return {"count": len(calls), "source": source, "limit": limit}
+    
+    @app.get("/api/articles/topics")
+    def topics():
+        calls.append("topics")
+        return {"count": len(calls)}
+    
+    generation = DataGeneration(str(tmp_path / "generation"))
+    app.state.response_cache = ResponseCache(backend, generation)
+    return TestClient(app), calls, generation
+
+
+def test_response_cache_etag_and_invalidation(tmp_path):
+    """测试缓存命中、304、查询参数规范化、数据版本号变化后失效，以及未缓存路由透传"""
+    client, calls, generation = _client(tmp_path, MemoryResponseBackend(max_entries=10))
+    
+    first = client.get("/api/articles?source=a&limit=5")
+    etag = first.headers["etag"]
+    assert first.headers["x-cache"] == "MISS" and etag.startswith('"')
+    assert "must-revalidate" in first.headers["cache-control"]
+    
+    # 参数顺序不同、空参数被忽略：命中同一条目，不执行路由
+    second = client.get("/api/articles?limit=5&source=a&search=")
+    assert second.headers["x-cache"] == "HIT" and second.json() == first.json()
+    not_modified = client.get("/api/articles?source=a&limit=5", headers={"If-None-Match": f'W/"x", {etag}'})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert len(calls) == 1
+    
+    # 新数据写入后版本号变化，重新计算
+    generation.bump()
+    third = client.get("/api/articles?source=a&limit=5", headers={"If-None-Match": etag})
+    assert third.status_code == 200 and third.headers["x-cache"] == "MISS"
+    assert third.headers["etag"] != etag and len(calls) == 2
+    
+    # 不在缓存列表中的路由和校验失败的响应不缓存
+    client.get("/api/articles/topics")
+    client.get("/api/articles/topics")
+    assert client.get("/api/articles?limit=abc").status_code == 422
+    assert client.get("/api/articles?limit=abc").status_code == 422
+    assert calls.count("topics") == 2 and "etag" not in client.get("/api/articles/topics").headers
+
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    """测试 SQLite 后端：另一个实例（如另一个 Web 进程）可直接命中"""
+    path = str(tmp_path / "responses.db")
+    client, calls, _ = _client(tmp_path, SQLiteResponseBackend(path))
+    etag = client.get("/api/articles").headers["etag"]
+    
+    other, other_calls, _ = _client(tmp_path, SQLiteResponseBackend(path))
+    response = other.get("/api/articles", headers={"If-None-Match": etag})
+    assert response.status_code == 304 and other_calls == []
+    # 命中只读取，不写命中统计
+    assert other.app.state.response_cache.backend._store.stats()["hits"] == 0
+    
+    # 版本号由文件共享：其他进程递增后两边都失效
+    DataGeneration(str(tmp_path / "generation")).bump()
+    assert client.get("/api/articles").headers["x-cache"] == "MISS"
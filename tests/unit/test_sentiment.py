@@ -0,0 +1,47 @@
+"""
+词典情感打分单元测试
+"""
+from src.analyzers.sentiment import LexiconSentimentScorer, load_lexicon_file
+
+
+def test_score_batch_labels():
+    """测试中英文积极 / 消极 / 中性文本的标签"""
+    scorer = LexiconSentimentScorer()
+    
+    results = scorer.score_batch([
+        "股市大涨 创新高",
+        "工厂爆炸造成多人死亡",
+        "Team wins the final after a strong rally",
+        "Window software released",
+        "",
+    ])
+    
+    labels = [label for label, _ in results]
+    assert labels == ["positive", "negative", "positive", "neutral", "neutral"]
+    assert results[0][1] > 0.6 and results[1][1] < 0.4
+    assert results[4][1] == 0.5
+
+
+def test_negation_flips_polarity():
+    """测试紧邻否定词反转情感极性"""
+    scorer = LexiconSentimentScorer()
+    
+    (positive, _), (negated, _), (english, _) = scorer.score_batch([
+        "谈判成功", "谈判不成功", "The launch did not fail",
+    ])
+    
+    assert positive == "positive"
+    assert negated == "negative"
+    assert english == "positive"
+
+
+def test_extra_lexicon(tmp_path):
+    """测试自定义词典追加 / 覆盖内置词"""
+    path = tmp_path / "lexicon.txt"
+    path.write_text("# 自定义词典\n躺平\t-1.5\nbad line\n", encoding="utf-8")
+    
+    lexicon = load_lexicon_file(str(path))
+    scorer = LexiconSentimentScorer(lexicon)
+    
+    assert lexicon == {"躺平": -1.5}
+    assert scorer.score_batch(["年轻人选择躺平"])[0][0] == "negative"
@@ -0,0 +1,107 @@
+"""
+文章翻译单元测试（不发起网络请求）
+"""
+import json
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+from src.config import AIConfig, AnalysisConfig, TranslationConfig
+from src.analyzers.ai_analyzer import AIAnalyzer
+from src.analyzers.usage import UsageLedger
+from src.db.session import DatabaseManager
+from src.db.models import NewsArticle, TranslationMemory
+from src.db.repositories import ArticleRepository
+from src.services.translation_service import TranslationService, chunk_texts
+
+
+class FakeAnalyzer:
+    """记录每次请求的文本，译文为 "译:" + 原文"""
+
+    model = "fake-model"
+
+    def __init__(self):
+        self.usage = UsageLedger()
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts, language):
+        with self._lock:
+            self.batches.append(list(texts))
+        return {i: f"译:{text}" for i, text in enumerate(texts)}
+
+
+def _service(tmp_path, analyzer, **overrides):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    config = SimpleNamespace(
+        analysis=AnalysisConfig(max_concurrency=2),
+        translation=TranslationConfig(enabled=True, **overrides)
+    )
+    return manager, TranslationService(manager, analyzer, config)
+
+
+def _add_articles(manager, rows):
+    with manager.session_scope() as session:
+        repo = ArticleRepository(session)
+        for title, summary, language in rows:
+            repo.add({"title": title, "summary": summary, "language": language,
+                      "url": f"https://example.com/{title}/{datetime.now().timestamp()}",
+                      "source": "测试源", "crawled_at": datetime.now()})
+
+
+def test_translation_dedupes_and_reuses_memory(tmp_path):
+    """测试相同文本只翻译一次，再次出现时命中翻译记忆且不发起请求"""
+    analyzer = FakeAnalyzer()
+    manager, service = _service(tmp_path, analyzer, batch_size=2)
+    _add_articles(manager, [
+        ("Fed raises rates", "The  Fed raised rates.", "en"),
+        ("Fed  raises rates", "The Fed raised rates.", "en"),
+        ("Markets rally", None, "en"),
+        ("央行降准", "央行宣布降准", "zh"),
+    ])
+
+    assert service.translate_pending() == 3
+    sent = [text for batch in analyzer.batches for text in batch]
+    assert sorted(sent) == ["Fed raises rates", "Markets rally", "The Fed raised rates."]
+    assert all(len(batch) <= 2 for batch in analyzer.batches)
+
+    # 新抓取的通稿与已翻译文本相同：命中翻译记忆，不再请求模型
+    analyzer.batches.clear()
+    _add_articles(manager, [("Fed raises rates", "The Fed raised rates.", "en")])
+    assert service.translate_pending() == 1
+    assert analyzer.batches == []
+    assert service.translate_pending() == 0
+
+    with manager.session_scope() as session:
+        articles = session.query(NewsArticle).order_by(NewsArticle.id).all()
+        assert articles[0].title_translated == "译:Fed raises rates"
+        assert articles[0].summary_translated == "译:The Fed raised rates."
+        assert articles[2].summary_translated is None
+        assert articles[3].translation_language is None
+        assert articles[4].translation_language == "zh"
+        memory = {row.source_text: row.hit_count for row in session.query(TranslationMemory)}
+        assert memory == {"Fed raises rates": 1, "The Fed raised rates.": 1, "Markets rally": 0}
+
+
+def test_translate_batch_parses_numbered_results(monkeypatch):
+    """测试批量翻译响应按序号对应原文，缺失和越界的条目被忽略"""
+    analyzer = AIAnalyzer(SimpleNamespace(ai=AIConfig(api_key="test-key")))
+    prompts = []
+
+    def fake_call_api(prompt, validate=None):
+        prompts.append(prompt)
+        return "```json\n" + json.dumps([
+            {"id": 2, "text": "市场上涨"},
+            {"id": "1", "text": "美联储加息"},
+            {"id": 9, "text": "越界"},
+        ], ensure_ascii=False) + "\n```"
+
+    monkeypatch.setattr(analyzer, "_call_api", fake_call_api)
+
+    result = analyzer.translate_batch(["Fed raises rates", "Markets rally", "Oil falls"], "简体中文")
+
+    assert result == {0: "美联储加息", 1: "市场上涨"}
+    assert "简体中文" in prompts[0].system and "[3] Oil falls" in prompts[0].user
+    assert list(chunk_texts(["a" * 5, "b" * 5, "c" * 20, "d"], batch_size=3, max_chars=12)) == [
+        ["a" * 5, "b" * 5], ["c" * 20], ["d"]
+    ]
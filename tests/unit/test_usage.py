@@ -0,0 +1,96 @@
+"""
+LLM 用量记录单元测试
+"""
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.analyzers.prompts import (
+    packed_analysis_prompt,
+    single_analysis_prompt,
+    translation_prompt,
+)
+from src.analyzers.tokens import estimate_tokens, truncate_to_tokens
+from src.analyzers.usage import MODE_BATCH, PriceTable, UsageLedger, usage_scope
+from src.db.session import DatabaseManager
+from src.db.repositories import UsageRepository
+
+PRICES = {
+    "gpt-4o": {"input": 2.5, "cached_input": 1.25, "output": 10.0},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.6},
+}
+
+
+def test_price_table_longest_prefix_and_discounts():
+    """测试按最长前缀匹配价格，缓存命中和批处理按折扣计费"""
+    prices = PriceTable(PRICES, batch_discount=0.5)
+    
+    assert prices.lookup("gpt-4o-mini-2024-07-18") is PRICES["gpt-4o-mini"]
+    assert prices.lookup("claude-3-5-haiku") is None
+    assert prices.cost("unknown-model", 1000, 100) is None
+    # 1M 输入（其中 0.4M 命中缓存）+ 0.1M 输出
+    assert prices.cost("gpt-4o", 1_000_000, 100_000, cached_tokens=400_000) == pytest.approx(
+        0.6 * 2.5 + 0.4 * 1.25 + 0.1 * 10.0
+    )
+    assert prices.cost("gpt-4o", 1_000_000, 0, batch=True) == pytest.approx(1.25)
+
+
+def test_ledger_records_scope_and_summarizes(tmp_path):
+    """测试用量记录继承上下文归属，并按运行和来源汇总"""
+    ledger = UsageLedger(PriceTable(PRICES))
+    with usage_scope(run_id="analyze-1", operation="analyze_single"):
+        with usage_scope(source="新华社"):
+            ledger.record("openai", "gpt-4o-mini", (1000, 200, 0), 100, latency=1.5)
+        ledger.record("openai", "gpt-4o-mini", (500, 0, 0), 50, latency=0.5, source="人民网")
+    ledger.record("openai", "gpt-4o-mini", (500, 0, 0), 50, mode=MODE_BATCH, run_id="batch-1")
+    
+    records = ledger.drain()
+    assert len(ledger) == 0
+    assert [r.source for r in records] == ["新华社", "人民网", None]
+    assert records[0].latency_ms == 1500
+    assert records[2].estimated_cost == pytest.approx(records[1].estimated_cost / 2)
+    
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    with manager.session_scope() as session:
+        UsageRepository(session).add_many([asdict(r) for r in records])
+    with manager.session_scope() as session:
+        repo = UsageRepository(session)
+        by_run = {row["key"]: row for row in repo.summarize(group_by="run")}
+        assert by_run["analyze-1"]["calls"] == 2
+        assert by_run["analyze-1"]["prompt_tokens"] == 1500
+        assert by_run["analyze-1"]["cached_tokens"] == 200
+        assert by_run["analyze-1"]["avg_latency_ms"] == 1000
+        by_day = repo.summarize(since=datetime.utcnow() - timedelta(days=1), group_by="day")
+        assert [row["calls"] for row in by_day] == [3]
+        assert repo.summarize(since=datetime.utcnow() + timedelta(days=1)) == []
+        with pytest.raises(ValueError):
+            repo.summarize(group_by="unknown")
+
+
+def test_prompts_fit_token_budget():
+    """测试文章文本按 token 预算截断，预算充足时不截断"""
+    assert truncate_to_tokens("中文abcdefgh", 3) == "中文abcd"
+    article = {"id": 1, "title": "标题", "summary": "摘要" * 2000, "content": "正文" * 5000}
+    
+    prompt = single_analysis_prompt(article, token_budget=1200)
+    assert 1000 < estimate_tokens(prompt.text) <= 1200
+    assert "正文" in prompt.user and "摘要" in prompt.user
+    
+    packed = packed_analysis_prompt([dict(article, id=i) for i in range(5)], token_budget=1200)
+    assert estimate_tokens(packed.text) <= 1200
+    
+    short = {"title": "标题", "content": "短正文"}
+    assert single_analysis_prompt(short, token_budget=1200).user.endswith("内容: 短正文\n")
+
+
+def test_prompt_prefixes_are_stable():
+    """测试固定前缀不随文章内容变化，文章文本只出现在用户内容中"""
+    first = {"id": 1, "title": "第一篇", "summary": "摘要一", "content": "正文一"}
+    second = {"id": 2, "title": "第二篇", "summary": "摘要二" * 500}
+    
+    for build in (single_analysis_prompt, lambda a: packed_analysis_prompt([a, dict(a, id=9)])):
+        one, two = build(first), build(second)
+        assert one.system == two.system and one.user != two.user
+        assert "第一篇" not in one.system and "第一篇" in one.user
+    assert translation_prompt(["a"], "简体中文").system == translation_prompt(["b", "c"], "简体中文").system